@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import secrets
+import time
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
+
+from pipes.config.settings import settings
+from pipes.common.exceptions import (
+    APIKeyAuthError,
+    DocumentAlreadyExists,
+    DocumentDoesNotExist,
+    UserPermissionDenied,
+)
+from pipes.db.manager import AbstractObjectManager
+from pipes.apikeys.schemas import APIKeyCreate, APIKeyDocument, APIKeyScope
+from pipes.users.cache import ExpiringLRUCache
+from pipes.users.schemas import UserDocument
+
+logger = logging.getLogger(__name__)
+
+API_KEY_PREFIX = "pipes_"
+
+
+class APIKeyPrincipal(NamedTuple):
+    """Verified API key with the user it is bound to"""
+
+    user: UserDocument
+    scopes: frozenset[str]
+
+
+def as_utc(value: datetime) -> datetime:
+    """Timezone aware UTC datetime, naive datetimes are UTC as stored in DocumentDB"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class APIKeyCache(ExpiringLRUCache):
+    """Bounded LRU cache of verified API keys keyed by key digest.
+
+    The cache is local to each worker. A revoked or rotated key, or a key of
+    a deactivated user, is rejected at once by the worker handling the change,
+    and by the other workers once their entry expires, `ttl` seconds at most.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 300) -> None:
+        super().__init__(maxsize=maxsize)
+        self.ttl = ttl
+        self._digests: dict[PydanticObjectId, set[str]] = {}
+
+    def get(self, digest: str) -> APIKeyPrincipal | None:
+        return self._get(digest)
+
+    def put(self, k_doc: APIKeyDocument, user: UserDocument) -> APIKeyPrincipal:
+        expires_at = time.time() + self.ttl
+        if k_doc.expires_at:
+            expires_at = min(expires_at, as_utc(k_doc.expires_at).timestamp())
+
+        principal = APIKeyPrincipal(
+            user=user,
+            scopes=frozenset(scope.value for scope in k_doc.scopes),
+        )
+        self._put(k_doc.digest, principal, expires_at)
+
+        # Index the digests by user, leaving out the entries evicted meanwhile
+        digests = {
+            digest
+            for digest in self._digests.get(k_doc.user, set())
+            if digest in self._entries
+        }
+        digests.add(k_doc.digest)
+        self._digests[k_doc.user] = digests
+        return principal
+
+    def invalidate(self, digest: str) -> None:
+        self._pop(digest)
+
+    def invalidate_user(self, user_id: PydanticObjectId) -> None:
+        """Remove the cached keys of the user, whose document got updated"""
+        for digest in self._digests.pop(user_id, set()):
+            self._pop(digest)
+
+    def clear(self) -> None:
+        super().clear()
+        self._digests.clear()
+
+
+apikey_cache = APIKeyCache(
+    maxsize=settings.PIPES_API_KEY_CACHE_SIZE,
+    ttl=settings.PIPES_API_KEY_CACHE_TTL,
+)
+
+
+def is_api_key(credentials: str) -> bool:
+    """Check if the bearer credentials is an API key instead of a JWT"""
+    return credentials.startswith(API_KEY_PREFIX)
+
+
+def generate_api_key() -> tuple[str, str]:
+    """Generate a new API key, return the public prefix and the plaintext key"""
+    prefix = secrets.token_hex(4)
+    key = f"{API_KEY_PREFIX}{prefix}_{secrets.token_urlsafe(32)}"
+    return prefix, key
+
+
+def digest_api_key(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class APIKeyManager(AbstractObjectManager):
+    """Manager class for service account API keys"""
+
+    async def create_key(
+        self,
+        k_create: APIKeyCreate,
+        user: UserDocument,
+    ) -> tuple[APIKeyDocument, str]:
+        """Create a new API key bound to the user, return it with plaintext key"""
+        exists = await self.d.exists(
+            collection=APIKeyDocument,
+            query={"user": user.id, "name": k_create.name},
+        )
+        if exists:
+            raise DocumentAlreadyExists(f"API key '{k_create.name}' already exists.")
+
+        prefix, key = generate_api_key()
+        k_doc = APIKeyDocument(
+            name=k_create.name,
+            scopes=k_create.scopes,
+            expires_at=k_create.expires_at,
+            prefix=prefix,
+            is_active=True,
+            created_at=datetime.now(),
+            user=user.id,
+            digest=digest_api_key(key),
+        )
+
+        try:
+            await self.d.insert(k_doc)
+        except DuplicateKeyError:
+            raise DocumentAlreadyExists(f"API key '{k_create.name}' already exists.")
+
+        logger.info("New API key '%s' created for user '%s'", k_doc.name, user.email)
+        return k_doc, key
+
+    async def get_keys(self, user: UserDocument) -> list[APIKeyDocument]:
+        """Get all API keys of the user"""
+        k_docs = await self.d.find_all(
+            collection=APIKeyDocument,
+            query={"user": user.id},
+        )
+        return k_docs
+
+    async def get_key(self, name: str, user: UserDocument) -> APIKeyDocument:
+        """Get API key of the user by name"""
+        k_doc = await self.d.find_one(
+            collection=APIKeyDocument,
+            query={"user": user.id, "name": name},
+        )
+        if not k_doc:
+            raise DocumentDoesNotExist(f"API key '{name}' not found.")
+        return k_doc
+
+    async def revoke_key(self, name: str, user: UserDocument) -> APIKeyDocument:
+        """Revoke API key of the user by name"""
+        k_doc = await self.get_key(name, user)
+        k_doc.is_active = False
+        await k_doc.save()
+        apikey_cache.invalidate(k_doc.digest)
+
+        logger.info("API key '%s' of user '%s' revoked", name, user.email)
+        return k_doc
+
+    async def rotate_key(
+        self,
+        name: str,
+        user: UserDocument,
+    ) -> tuple[APIKeyDocument, str]:
+        """Replace the secret of the API key, the old key stops working immediately"""
+        k_doc = await self.get_key(name, user)
+        if not k_doc.is_active:
+            raise DocumentDoesNotExist(f"API key '{name}' has been revoked.")
+
+        old_digest = k_doc.digest
+        prefix, key = generate_api_key()
+        k_doc.prefix = prefix
+        k_doc.digest = digest_api_key(key)
+        k_doc.rotated_at = datetime.now()
+        await k_doc.save()
+        apikey_cache.invalidate(old_digest)
+
+        logger.info("API key '%s' of user '%s' rotated", name, user.email)
+        return k_doc, key
+
+    async def authenticate(self, key: str, scope: APIKeyScope) -> UserDocument:
+        """Verify the API key and its scope, return the user it is bound to"""
+        digest = digest_api_key(key)
+
+        principal = apikey_cache.get(digest)
+        if principal is None:
+            principal = await self._load_principal(digest)
+
+        if not principal.user.is_active:
+            raise APIKeyAuthError("Not authenticated. Inactive user.")
+
+        if scope.value not in principal.scopes:
+            raise UserPermissionDenied(
+                f"API key is not allowed to access '{scope.value}'."
+            )
+
+        return principal.user
+
+    async def _load_principal(self, digest: str) -> APIKeyPrincipal:
+        k_doc = await self.d.find_one(
+            collection=APIKeyDocument,
+            query={"digest": digest},
+        )
+        if (not k_doc) or (not k_doc.is_active):
+            raise APIKeyAuthError("Not authenticated. Invalid API key.")
+
+        if k_doc.expires_at and as_utc(k_doc.expires_at) <= datetime.now(timezone.utc):
+            raise APIKeyAuthError("Not authenticated. API key expired.")
+
+        u_doc = await self.d.get(collection=UserDocument, id=k_doc.user)
+        if not u_doc:
+            raise APIKeyAuthError("Not authenticated. Invalid API key.")
+
+        principal = apikey_cache.put(k_doc, u_doc)
+        return principal
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from pipes.apikeys.manager import APIKeyManager
+from pipes.apikeys.schemas import APIKeyCreate, APIKeyRead, APIKeySecretRead
+from pipes.common.exceptions import DocumentAlreadyExists, DocumentDoesNotExist
+from pipes.users.auth import auth_required
+from pipes.users.schemas import UserDocument
+
+router = APIRouter()
+
+
+@router.post("/apikeys", response_model=APIKeySecretRead, status_code=201)
+async def create_apikey(
+    data: APIKeyCreate,
+    user: UserDocument = Depends(auth_required),
+):
+    """Create a new API key bound to current user, the key is only returned once"""
+    try:
+        manager = APIKeyManager()
+        k_doc, key = await manager.create_key(data, user)
+    except DocumentAlreadyExists as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    k_data = k_doc.model_dump()
+    k_data["key"] = key
+    return APIKeySecretRead.model_validate(k_data)
+
+
+@router.get("/apikeys", response_model=list[APIKeyRead])
+async def get_apikeys(user: UserDocument = Depends(auth_required)):
+    """Get all API keys of current user"""
+    manager = APIKeyManager()
+    k_docs = await manager.get_keys(user)
+    return k_docs
+
+
+@router.post("/apikeys/rotate", response_model=APIKeySecretRead)
+async def rotate_apikey(
+    name: str,
+    user: UserDocument = Depends(auth_required),
+):
+    """Rotate the API key of current user, the old key stops working"""
+    try:
+        manager = APIKeyManager()
+        k_doc, key = await manager.rotate_key(name, user)
+    except DocumentDoesNotExist as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+
+    k_data = k_doc.model_dump()
+    k_data["key"] = key
+    return APIKeySecretRead.model_validate(k_data)
+
+
+@router.delete("/apikeys", status_code=204)
+async def revoke_apikey(
+    name: str,
+    user: UserDocument = Depends(auth_required),
+):
+    """Revoke the API key of current user"""
+    try:
+        manager = APIKeyManager()
+        await manager.revoke_key(name, user)
+    except DocumentDoesNotExist as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
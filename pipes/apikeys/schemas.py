@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+
+import pymongo
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field, field_validator
+from pymongo import IndexModel
+
+from pipes.common.utilities import parse_datetime
+
+
+class APIKeyScope(str, Enum):
+    modelruns = "modelruns"
+    datasets = "datasets"
+    tasks = "tasks"
+
+
+class APIKeyCreate(BaseModel):
+    """API key creation schema.
+
+    Attributes:
+        name: API key name, unique per user.
+        scopes: Resources the API key is allowed to access.
+        expires_at: API key expiration datetime, never expires if None.
+    """
+
+    name: str = Field(
+        title="name",
+        min_length=1,
+        description="API key name, unique per user",
+    )
+    scopes: list[APIKeyScope] = Field(
+        title="scopes",
+        min_length=1,
+        description="Resources the API key is allowed to access",
+    )
+    expires_at: datetime | None = Field(
+        title="expires_at",
+        default=None,
+        description="API key expiration datetime, never expires if None",
+    )
+
+    @field_validator("expires_at", mode="before")
+    @classmethod
+    def validate_expires_at(cls, value):
+        if value is None:
+            return value
+        try:
+            value = parse_datetime(value)
+        except Exception as e:
+            raise ValueError(f"Invalid expires_at value: {value}; Error: {e}")
+        return value
+
+
+class APIKeyRead(APIKeyCreate):
+    """API key read schema.
+
+    Attributes:
+        name: API key name, unique per user.
+        scopes: Resources the API key is allowed to access.
+        expires_at: API key expiration datetime, never expires if None.
+        prefix: Public prefix of the API key, for identification.
+        is_active: Active or revoked API key.
+        created_at: API key creation datetime.
+        rotated_at: Last rotation datetime.
+    """
+
+    prefix: str = Field(
+        title="prefix",
+        description="Public prefix of the API key, for identification",
+    )
+    is_active: bool = Field(
+        title="is_active",
+        default=True,
+        description="Active or revoked API key",
+    )
+    created_at: datetime = Field(
+        title="created_at",
+        description="API key creation datetime",
+    )
+    rotated_at: datetime | None = Field(
+        title="rotated_at",
+        default=None,
+        description="Last rotation datetime",
+    )
+
+
+class APIKeySecretRead(APIKeyRead):
+    """API key read schema with the plaintext key, returned once on create/rotate.
+
+    Attributes:
+        name: API key name, unique per user.
+        scopes: Resources the API key is allowed to access.
+        expires_at: API key expiration datetime, never expires if None.
+        prefix: Public prefix of the API key, for identification.
+        is_active: Active or revoked API key.
+        created_at: API key creation datetime.
+        rotated_at: Last rotation datetime.
+        key: The plaintext API key, not retrievable later.
+    """
+
+    key: str = Field(
+        title="key",
+        description="The plaintext API key, not retrievable later",
+    )
+
+
+class APIKeyDocument(APIKeyRead, Document):
+    """API key document, only the SHA-256 digest of the key is stored.
+
+    Attributes:
+        name: API key name, unique per user.
+        scopes: Resources the API key is allowed to access.
+        expires_at: API key expiration datetime, never expires if None.
+        prefix: Public prefix of the API key, for identification.
+        is_active: Active or revoked API key.
+        created_at: API key creation datetime.
+        rotated_at: Last rotation datetime.
+        user: The user the API key is bound to.
+        digest: SHA-256 hex digest of the API key.
+    """
+
+    user: PydanticObjectId = Field(
+        title="user",
+        description="The user the API key is bound to",
+    )
+    digest: str = Field(
+        title="digest",
+        description="SHA-256 hex digest of the API key",
+    )
+
+    class Settings:
+        name = "apikeys"
+        indexes = [
+            IndexModel(
+                [("digest", pymongo.ASCENDING)],
+                unique=True,
+            ),
+            IndexModel(
+                [("user", pymongo.ASCENDING), ("name", pymongo.ASCENDING)],
+                unique=True,
+            ),
+        ]
@@ -1,16 +1,29 @@
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from beanie import init_beanie
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
-from motor.motor_asyncio import AsyncIOMotorClient
 
 # Settings
 from pipes.config.settings import settings
 
+# Serialization
+from pipes.common.compression import CompressionMiddleware
+from pipes.common.serialization import FastJSONResponse
+
+# DocumentDB
+from pipes.db.document import get_docdb, use_docdb
+from pipes.db.indexes import sync_indexes
+from pipes.db.loader import DocumentLoaderMiddleware
+
+# API Keys
+from pipes.apikeys.schemas import APIKeyDocument
+from pipes.apikeys.routes import router as apikeys_router
+
 # Health
 from pipes.health.routes import router as health_router
 
@@ -23,6 +36,7 @@ from pipes.catalogdatasets.schemas import CatalogDatasetDocument
 from pipes.catalogdatasets.routes import router as catalogdatasets_router
 
 # Projects
+from pipes.projects.access import ProjectAccessManager
 from pipes.projects.schemas import ProjectDocument
 from pipes.projects.routes import router as projects_router
 
@@ -50,6 +64,11 @@ from pipes.handoffs.routes import router as handoffs_router
 from pipes.tasks.schemas import TaskDocument
 from pipes.tasks.routes import router as tasks_router
 
+# Jobs
+from pipes.jobs.manager import job_runner
+from pipes.jobs.routes import router as jobs_router
+from pipes.jobs.schemas import JobDocument
+
 # Teams
 from pipes.teams.routes import router as teams_router
 from pipes.teams.schemas import TeamDocument
@@ -64,21 +83,8 @@ from pipes.version import __version__
 async def lifespan(app: FastAPI):
     """FastAPI application life span"""
     # Init beanie
-    if settings.PIPES_ENV in ["dev", "stage", "prod"]:
-        docdb_uri = "mongodb://{}:{}@{}:{}/{}".format(
-            settings.PIPES_DOCDB_USER,
-            settings.PIPES_DOCDB_PASS,
-            settings.PIPES_DOCDB_HOST,
-            settings.PIPES_DOCDB_PORT,
-            settings.PIPES_DOCDB_NAME,
-        )
-        docdb_uri += (
-            "?replicaSet=rs0&readPreference=secondaryPreferred&retryWrites=false"
-        )
-    else:
-        docdb_uri = f"mongodb://{settings.PIPES_DOCDB_HOST}:{settings.PIPES_DOCDB_PORT}/{settings.PIPES_DOCDB_NAME}"
-
-    motor_client = AsyncIOMotorClient(docdb_uri)
+    docdb = get_docdb()
+    motor_client = docdb.connect()
 
     await init_beanie(
         database=motor_client[settings.PIPES_DOCDB_NAME],
@@ -94,13 +100,31 @@ async def lifespan(app: FastAPI):
             UserDocument,
             CatalogModelDocument,
             CatalogDatasetDocument,
+            APIKeyDocument,
+            JobDocument,
         ],
     )
 
+    if settings.PIPES_DOCDB_SYNC_INDEXES:
+        await sync_indexes(motor_client[settings.PIPES_DOCDB_NAME])
+
+    # Backfill the access of projects created before it was maintained
+    await ProjectAccessManager().rebuild_access(missing_only=True)
+
+    # Resume the background jobs interrupted by the last shutdown, and the ones
+    # of dead workers whose lease expired, every lease interval
+    resumer = asyncio.ensure_future(job_runner.resume_periodically())
+
+    app.state.docdb = docdb
+
     yield
 
+    resumer.cancel()
+    with suppress(asyncio.CancelledError):
+        await resumer
+
     # Close motor client
-    motor_client.close()
+    docdb.close()
 
 
 app = FastAPI(
@@ -108,6 +132,8 @@ app = FastAPI(
     version=__version__,
     debug=settings.DEBUG,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+    dependencies=[Depends(use_docdb)],
 )
 
 # CORS settings - https://fastapi.tiangolo.com/tutorial/cors/
@@ -119,6 +145,17 @@ app.add_middleware(
     allow_headers=settings.ALLOW_HEADERS,
 )
 
+# Request-scoped document loader, batching document gets by id
+app.add_middleware(DocumentLoaderMiddleware)
+
+# Negotiated response compression, outermost
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.PIPES_COMPRESSION_MINIMUM_SIZE,
+    level=settings.PIPES_COMPRESSION_LEVEL,
+    encodings=settings.PIPES_COMPRESSION_ENCODINGS,
+)
+
 # Routers
 app.include_router(health_router, prefix="/api", tags=["health"])
 app.include_router(catalogmodels_router, prefix="/api", tags=["catalogmodels"])
@@ -132,6 +169,8 @@ app.include_router(handoffs_router, prefix="/api", tags=["handoffs"])
 app.include_router(tasks_router, prefix="/api", tags=["tasks"])
 app.include_router(teams_router, prefix="/api", tags=["teams"])
 app.include_router(users_router, prefix="/api", tags=["users"])
+app.include_router(apikeys_router, prefix="/api", tags=["apikeys"])
+app.include_router(jobs_router, prefix="/api", tags=["jobs"])
 
 
 @app.get("/")
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
+from typing import AsyncIterator
 
+from beanie import PydanticObjectId
 from pymongo.errors import DuplicateKeyError
 
 from pipes.common.exceptions import DocumentAlreadyExists, DocumentDoesNotExist
+from pipes.common.streaming import read_chunks
 from pipes.db.manager import AbstractObjectManager
+from pipes.db.pagination import Page, PageParams
 from pipes.catalogdatasets.schemas import (
     CatalogDatasetCreate,
     CatalogDatasetDocument,
+    CatalogDatasetProjection,
     CatalogDatasetRead,
     CatalogDatasetUpdate,
     DatasetLocation,
@@ -100,40 +106,67 @@ class CatalogDatasetManager(AbstractObjectManager):
         )
         return cd_doc
 
-    async def get_datasets(self, user: UserDocument) -> list[CatalogDatasetRead]:
+    def _get_datasets_query(self, user: UserDocument) -> dict:
+        """Query of the datasets accessible by user"""
+        return {
+            "$or": [
+                {"created_by": user.id},
+                {"access_group": {"$in": [user.id]}},
+            ],
+        }
+
+    async def get_datasets(
+        self,
+        user: UserDocument,
+        page: PageParams | None = None,
+    ) -> Page[CatalogDatasetRead]:
         """Get all datasets accessible by user"""
-        cd_docs = await self.d.find_all(
+        cd_page = await self.d.find_page(
             collection=CatalogDatasetDocument,
-            query={
-                "$or": [
-                    {"created_by": user.id},
-                    {"access_group": {"$in": [user.id]}},
-                ],
-            },
+            query=self._get_datasets_query(user),
+            page=page,
+            projection=CatalogDatasetProjection,
         )
 
-        cd_reads = []
-        for cd_doc in cd_docs:
-            cd_read = await self.read_dataset(cd_doc)
-            cd_reads.append(cd_read)
-        return cd_reads
+        # Read concurrently, so the loader batches the gets of all datasets
+        cd_reads = await asyncio.gather(
+            *[self.read_dataset(cd_doc) for cd_doc in cd_page.data],
+        )
+        return Page(data=cd_reads, next_cursor=cd_page.next_cursor)
+
+    async def iter_datasets(
+        self,
+        user: UserDocument,
+    ) -> AsyncIterator[CatalogDatasetRead]:
+        """Stream all datasets accessible by user"""
+        cd_docs = self.d.iter_all(
+            collection=CatalogDatasetDocument,
+            query=self._get_datasets_query(user),
+            projection=CatalogDatasetProjection,
+        )
+        async for cd_read in read_chunks(cd_docs, self.read_dataset, self.loader):
+            yield cd_read
 
     async def read_dataset(
         self,
-        cd_doc: CatalogDatasetDocument,
+        cd_doc: CatalogDatasetDocument | CatalogDatasetProjection,
     ) -> CatalogDatasetRead:
         """Convert dataset document to read schema"""
-        data = cd_doc.model_dump()
-        created_by_doc = await UserDocument.get(data["created_by"])
-        data["created_by"] = UserRead.model_validate(created_by_doc.model_dump())
+        cd_read = await self.assemble(
+            CatalogDatasetRead,
+            cd_doc,
+            created_by=self._read_user(cd_doc.created_by),
+            access_group=self._read_emails(cd_doc.access_group),
+        )
+        return cd_read
 
-        user_emails = []
-        for user_id in data["access_group"]:
-            user_doc = await UserDocument.get(user_id)
-            if user_doc:
-                user_emails.append(user_doc.email)
-        data["access_group"] = user_emails
-        return CatalogDatasetRead.model_validate(data)
+    async def _read_user(self, u_id: PydanticObjectId) -> UserRead:
+        u_doc = await self.loader.get(UserDocument, u_id)
+        return u_doc.read()
+
+    async def _read_emails(self, u_ids: list[PydanticObjectId]) -> list[str]:
+        u_docs = await self.loader.get_many(UserDocument, u_ids)
+        return [u_doc.email for u_doc in u_docs if u_doc]
 
     async def get_dataset(
         self,
@@ -14,6 +14,9 @@ from pipes.catalogdatasets.schemas import (
     CatalogDatasetRead,
     CatalogDatasetUpdate,
 )
+from pipes.common.serialization import json_response
+from pipes.common.streaming import ndjson_requested, ndjson_response, ndjson_responses
+from pipes.db.pagination import Page, PageParams, page_params, page_response
 from pipes.users.auth import auth_required
 from pipes.users.schemas import UserDocument
 
@@ -32,7 +35,7 @@ async def get_catalog_dataset(
 ):
     manager = CatalogDatasetManager()
     catalogdataset = await manager.get_dataset(dataset_name, user)
-    return catalogdataset
+    return json_response(catalogdataset, CatalogDatasetRead)
 
 
 @router.post(
@@ -57,20 +60,26 @@ async def create_catalog_dataset(
             detail=str(e),
         )
     cd_read = await manager.read_dataset(cd_doc)
-    return cd_read
+    return json_response(cd_read, CatalogDatasetRead, status_code=201)
 
 
 @router.get(
     "/catalogdatasets",
-    response_model=list[CatalogDatasetRead],
+    response_model=Page[CatalogDatasetRead] | list[CatalogDatasetRead],
     status_code=200,
+    responses=ndjson_responses,
 )
 async def get_catalog_datasets(
     user: UserDocument = Depends(auth_required),
+    page: PageParams = Depends(page_params),
+    ndjson: bool = Depends(ndjson_requested),
 ):
     manager = CatalogDatasetManager()
-    catalogdatasets = await manager.get_datasets(user)
-    return catalogdatasets
+    if ndjson:
+        return ndjson_response(manager.iter_datasets(user))
+
+    cd_page = await manager.get_datasets(user, page)
+    return page_response(cd_page, page)
 
 
 @router.patch(
@@ -95,7 +104,7 @@ async def update_catalog_dataset(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
-    return updated_dataset
+    return json_response(updated_dataset, CatalogDatasetRead)
 
 
 @router.delete("/catalogdataset/delete", status_code=204)
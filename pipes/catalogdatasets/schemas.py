@@ -274,6 +274,49 @@ class CatalogDatasetRead(CatalogDatasetCreate):
     )
 
 
+class CatalogDatasetProjection(CatalogDatasetCreate):
+    """Catalog dataset projection, fields of dataset read from document.
+
+    Attributes:
+        name: A short name.
+        display_name: The dataset display name.
+        description: The description of the scheduled dataset.
+        version: Dataset version.
+        previous_version: Previous version of this dataset.
+        hash_value: The hash value of this dataset used for integrity check.
+        data_format: Data format, or a list of formats separated by commas.
+        schema_info: The schema description of the dataset.
+        location: The dataset location on data system.
+        weather_years: The weather year(s) of the dataset.
+        model_years: The model year(s) of the dataset.
+        units: The units of the dataset.
+        temporal_info: The temporal metadata of the dataset.
+        spatial_info: The spatial metadata of the dataset.
+        scenarios: The list of scenario names the dataset relates to.
+        sensitivities: The sensitivities of the dataset.
+        source_code: The source code that produces the dataset.
+        relevant_links: Relevant links to this dataset.
+        resource_url: The resource URL for this dataset.
+        access_group: A group of users that has access to this model.
+        created_at: Catalog model creation time.
+        created_by: User who created the model in catalog.
+    """
+
+    created_at: datetime = Field(
+        title="created_at",
+        description="catalog model creation time",
+    )
+    created_by: PydanticObjectId = Field(
+        title="created_by",
+        description="user who created the model in catalog",
+    )
+    access_group: list[PydanticObjectId] = Field(
+        title="access_group",
+        default=[],
+        description="A group of users that has access to this model",
+    )
+
+
 class CatalogDatasetDocument(CatalogDatasetRead, Document):
     """Catalog dataset document.
 
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
+from typing import AsyncIterator
 
+from beanie import PydanticObjectId
 from pymongo.errors import DuplicateKeyError
 
 from pipes.common.exceptions import DocumentAlreadyExists, DocumentDoesNotExist
+from pipes.common.streaming import read_chunks
 from pipes.db.manager import AbstractObjectManager
+from pipes.db.pagination import Page, PageParams
 from pipes.catalogmodels.schemas import (
     CatalogModelCreate,
     CatalogModelDocument,
+    CatalogModelProjection,
     CatalogModelRead,
     CatalogModelUpdate,
 )
@@ -80,43 +86,67 @@ class CatalogModelManager(AbstractObjectManager):
         )
         return cm_doc
 
-    async def get_models(self, user: UserDocument) -> list[CatalogModelDocument]:
+    def _get_models_query(self, user: UserDocument) -> dict:
+        """Query of the models accessible by user"""
+        return {
+            "$or": [
+                {"created_by": user.id},
+                {"access_group": {"$in": [user.id]}},
+            ],
+        }
+
+    async def get_models(
+        self,
+        user: UserDocument,
+        page: PageParams | None = None,
+    ) -> Page[CatalogModelRead]:
         """Read a model from given model document"""
-        cm_docs = await self.d.find_all(
+        cm_page = await self.d.find_page(
             collection=CatalogModelDocument,
-            query={
-                "$or": [
-                    {"created_by": user.id},
-                    {"access_group": {"$in": [user.id]}},
-                ],
-            },
+            query=self._get_models_query(user),
+            page=page,
+            projection=CatalogModelProjection,
+        )
+
+        # Read concurrently, so the loader batches the gets of all models
+        cm_reads = await asyncio.gather(
+            *[self.read_model(cm_doc) for cm_doc in cm_page.data],
         )
+        return Page(data=cm_reads, next_cursor=cm_page.next_cursor)
 
-        cm_reads = []
-        for cm_doc in cm_docs:
-            cm_read = await self.read_model(cm_doc)
-            cm_reads.append(cm_read)
-        return cm_reads
+    async def iter_models(self, user: UserDocument) -> AsyncIterator[CatalogModelRead]:
+        """Stream all models accessible by user"""
+        cm_docs = self.d.iter_all(
+            collection=CatalogModelDocument,
+            query=self._get_models_query(user),
+            projection=CatalogModelProjection,
+        )
+        async for cm_read in read_chunks(cm_docs, self.read_model, self.loader):
+            yield cm_read
 
     async def read_model(
         self,
-        cm_doc: CatalogModelDocument,
+        cm_doc: CatalogModelDocument | CatalogModelProjection,
     ):
         """Retrieve a specific model from the database by name"""
         # Convert the document to a model document
         if not cm_doc:
             return None
-        data = cm_doc.model_dump()
-        created_by_doc = await UserDocument.get(data["created_by"])
-        data["created_by"] = UserRead.model_validate(created_by_doc.model_dump())
-
-        user_emails = []
-        for user_id in data["access_group"]:
-            user_doc = await UserDocument.get(user_id)
-            if user_doc:
-                user_emails.append(user_doc.email)
-        data["access_group"] = user_emails
-        return CatalogModelRead.model_validate(data)
+        cm_read = await self.assemble(
+            CatalogModelRead,
+            cm_doc,
+            created_by=self._read_user(cm_doc.created_by),
+            access_group=self._read_emails(cm_doc.access_group),
+        )
+        return cm_read
+
+    async def _read_user(self, u_id: PydanticObjectId) -> UserRead:
+        u_doc = await self.loader.get(UserDocument, u_id)
+        return u_doc.read()
+
+    async def _read_emails(self, u_ids: list[PydanticObjectId]) -> list[str]:
+        u_docs = await self.loader.get_many(UserDocument, u_ids)
+        return [u_doc.email for u_doc in u_docs if u_doc]
 
     async def get_model(
         self,
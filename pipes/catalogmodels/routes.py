@@ -14,6 +14,9 @@ from pipes.catalogmodels.schemas import (
     CatalogModelRead,
     CatalogModelUpdate,
 )
+from pipes.common.serialization import json_response
+from pipes.common.streaming import ndjson_requested, ndjson_response, ndjson_responses
+from pipes.db.pagination import Page, PageParams, page_params, page_response
 from pipes.users.auth import auth_required
 from pipes.users.manager import UserManager
 from pipes.users.schemas import UserDocument
@@ -29,7 +32,7 @@ async def get_catalog_model(
 ):
     manager = CatalogModelManager()
     catalogmodel = await manager.get_model(model_name, user)
-    return catalogmodel
+    return json_response(catalogmodel, CatalogModelRead)
 
 
 @router.post("/catalogmodel/create", response_model=CatalogModelRead, status_code=201)
@@ -50,16 +53,26 @@ async def create_catalog_model(
             detail=str(e),
         )
     mr_doc = await manager.read_model(mc_doc)
-    return mr_doc
+    return json_response(mr_doc, CatalogModelRead, status_code=201)
 
 
-@router.get("/catalogmodels", response_model=list[CatalogModelRead], status_code=200)
+@router.get(
+    "/catalogmodels",
+    response_model=Page[CatalogModelRead] | list[CatalogModelRead],
+    status_code=200,
+    responses=ndjson_responses,
+)
 async def get_catalog_models(
     user: UserDocument = Depends(auth_required),
+    page: PageParams = Depends(page_params),
+    ndjson: bool = Depends(ndjson_requested),
 ):
     manager = CatalogModelManager()
-    catalogmodels = await manager.get_models(user)
-    return catalogmodels
+    if ndjson:
+        return ndjson_response(manager.iter_models(user))
+
+    cm_page = await manager.get_models(user, page)
+    return page_response(cm_page, page)
 
 
 @router.patch("/catalogmodel/update", response_model=CatalogModelRead, status_code=200)
@@ -93,7 +106,7 @@ async def update_catalog_model(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
-    return updated_model
+    return json_response(updated_model, CatalogModelRead)
 
 
 @router.delete("/catalogmodel/delete", status_code=204)
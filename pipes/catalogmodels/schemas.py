@@ -154,6 +154,39 @@ class CatalogModelRead(CatalogModelCreate):
     )
 
 
+class CatalogModelProjection(CatalogModelCreate):
+    """Catalog model projection, fields of model read from document.
+
+    Attributes:
+        name: The model name.
+        display_name: Display name for this model vertex.
+        type: Type of model to use in graphic headers (e.g, 'Capacity Expansion').
+        description: Description of the model.
+        assumptions: List of model assumptions.
+        requirements: Model specific requirements (if different from Project and Project-Run).
+        expected_scenarios: List of expected model scenarios.
+        modeling_team: Information about the modeling team.
+        other: Other metadata info about the model in dictionary.
+        access_group: A group of users that has access to this model.
+        created_at: Catalog model creation time.
+        created_by: User who created the model in catalog.
+    """
+
+    created_at: datetime = Field(
+        title="created_at",
+        description="catalog model creation time",
+    )
+    created_by: PydanticObjectId = Field(
+        title="created_by",
+        description="user who created the model in catalog",
+    )
+    access_group: list[PydanticObjectId] = Field(
+        title="access_group",
+        default=[],
+        description="A group of users that has access to this model",
+    )
+
+
 class CatalogModelDocument(CatalogModelCreate, Document):
     """Catalog model document.
 
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+class GzipEncoder:
+    """Streaming gzip encoder, level from 1 to 9"""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(
+            min(max(level, 1), 9),
+            zlib.DEFLATED,
+            16 + zlib.MAX_WBITS,
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH,
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    """Streaming brotli encoder, level from 0 to 11"""
+
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=min(max(level, 0), 11))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class ZstdEncoder:
+    """Streaming zstd encoder, level from 1 to 22"""
+
+    def __init__(self, level: int) -> None:
+        compressor = zstandard.ZstdCompressor(level=min(max(level, 1), 22))
+        self._compressor = compressor.compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        return self._compressor.compress(data) + self._compressor.flush(flush_block)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+# Content encodings available in this environment, brotli and zstd are optional
+ENCODERS: dict[str, type] = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+
+# Media types compressed already, not worth compressing again
+COMPRESSED_MEDIA_TYPES = {"application/gzip", "application/zip", "application/zstd"}
+
+
+def select_encoding(accept_encoding: str, encodings: list[str]) -> str | None:
+    """First of the server preferred encodings accepted by the client"""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        token, _, params = item.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        try:
+            if params and float(q) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(token.strip())
+
+    for encoding in encodings:
+        if encoding in ENCODERS and (encoding in accepted or "*" in accepted):
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with negotiated content encoding.
+
+    Complete responses smaller than `minimum_size` are sent as they are.
+    Streamed responses are compressed chunk by chunk, each chunk flushed, so
+    the client still receives the records as soon as they are produced.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        level: int = 6,
+        encodings: list[str] | None = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.encodings = list(ENCODERS) if encodings is None else encodings
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = select_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Compress the messages of one response"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start_message: dict | None = None
+        self._encoder = None
+        self._passthrough = False
+
+    async def send(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            self._start_message = message
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").split(";")[0].strip()
+            self._passthrough = (
+                "content-encoding" in headers or media_type in COMPRESSED_MEDIA_TYPES
+            )
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._encoder is None:
+            # Complete response under the threshold, not worth compressing
+            if not more_body and len(body) < max(self.middleware.minimum_size, 1):
+                self._passthrough = True
+                await self._send_start()
+                await self._send(message)
+                return
+
+            self._encoder = ENCODERS[self.encoding](self.middleware.level)
+            headers = MutableHeaders(raw=self._start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self._encoder.finish(body)
+                headers["Content-Length"] = str(len(body))
+                await self._send_start()
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            await self._send_start()
+
+        if more_body:
+            body = self._encoder.compress(body)
+        else:
+            body = self._encoder.finish(body)
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": more_body},
+        )
+
+    async def _send_start(self) -> None:
+        if self._start_message is not None:
+            await self._send(self._start_message)
+            self._start_message = None
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import time
+
+from beanie import Document
+from pymongo import ReturnDocument
+
+from pipes.config.settings import settings
+from pipes.db.document import DocumentDB, current_docdb
+from pipes.users.cache import ExpiringLRUCache
+
+VERSIONS_COLLECTION = "versions"
+CONTEXT_VERSION_ID = "contexts"
+
+
+class ContextCache(ExpiringLRUCache):
+    """Bounded LRU cache of resolved context documents keyed by context names.
+
+    Entries hold the documents of every context level, so the ids and the
+    permission fields (owner, leads, created_by) of a context are resolved
+    without a round trip. Hits are deep copies, callers may mutate them.
+
+    Context mutations bump a version counter stored in DocumentDB, and each
+    worker compares it with its own version at most every `version_interval`
+    seconds, dropping all its entries when another worker has bumped it.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        ttl: float = 300,
+        version_interval: float = 1.0,
+        docdb: DocumentDB | None = None,
+    ) -> None:
+        super().__init__(maxsize=maxsize)
+        self.ttl = ttl
+        self.version_interval = version_interval
+        # Last seen shared version, and local count of clears
+        self.version = 0
+        self.generation = 0
+        self._docdb = docdb
+        self._version_checked_at = 0.0
+
+    @property
+    def docdb(self) -> DocumentDB:
+        return self._docdb or current_docdb()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def clear(self) -> None:
+        super().clear()
+        self.generation += 1
+
+    def get(self, names: tuple[str, ...]) -> dict[str, Document] | None:
+        """Return copies of the cached context documents of the names"""
+        docs = self._get(names)
+        if docs is None:
+            return None
+        return {field: doc.model_copy(deep=True) for field, doc in docs.items()}
+
+    def put(
+        self,
+        names: tuple[str, ...],
+        docs: dict[str, Document | None],
+        generation: int,
+    ) -> None:
+        """Cache the resolved documents, unless cleared while resolving them"""
+        if generation != self.generation or not all(docs.values()):
+            return
+
+        docs = {field: doc.model_copy(deep=True) for field, doc in docs.items()}
+        self._put(names, docs, time.time() + self.ttl)
+
+    async def sync_version(self) -> None:
+        """Drop all entries if the shared version moved, checked once per interval"""
+        now = time.monotonic()
+        if not self.enabled or now - self._version_checked_at < self.version_interval:
+            return
+
+        self._version_checked_at = now
+        raw = await self.docdb.database[VERSIONS_COLLECTION].find_one(
+            {"_id": CONTEXT_VERSION_ID},
+        )
+        version = raw["version"] if raw else 0
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    async def invalidate(self) -> None:
+        """Drop all entries here, and bump the shared version for other workers"""
+        self.clear()
+        if not self.enabled:
+            return
+
+        raw = await self.docdb.database[VERSIONS_COLLECTION].find_one_and_update(
+            {"_id": CONTEXT_VERSION_ID},
+            {"$inc": {"version": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        self.version = raw["version"]
+
+
+context_cache = ContextCache(
+    maxsize=settings.PIPES_CONTEXT_CACHE_SIZE,
+    ttl=settings.PIPES_CONTEXT_CACHE_TTL,
+    version_interval=settings.PIPES_CONTEXT_CACHE_VERSION_INTERVAL,
+)
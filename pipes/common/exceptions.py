@@ -10,6 +10,14 @@ class DomainValidationError(Exception):
     """Raise when given domain validation failed"""
 
 
+class ImportValidationError(DomainValidationError):
+    """Raise when import validation failed, with the errors of all invalid items"""
+
+    def __init__(self, errors: list) -> None:
+        super().__init__(f"Import failed, {len(errors)} invalid items.")
+        self.errors = errors
+
+
 class UserPermissionDenied(Exception):
     """Raise when user does not have permission"""
 
@@ -20,3 +28,7 @@ class DocumentDoesNotExist(Exception):
 
 class DocumentAlreadyExists(Exception):
     """Raise when user already exists in docdb."""
+
+
+class APIKeyAuthError(Exception):
+    """Raise when API key authentication failed."""
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from bson import ObjectId
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+from pipes.config.settings import settings
+
+ReadModel = TypeVar("ReadModel", bound=BaseModel)
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    """Type adapter of the type, built once per type"""
+    return TypeAdapter(tp)
+
+
+def construct_read(
+    read_class: type[ReadModel],
+    doc: BaseModel | None = None,
+    **fields: Any,
+) -> ReadModel:
+    """Build read object from a trusted document without validating it again.
+
+    The fields of the read class are taken from the document, overridden by
+    the given field values, which must be valid for the read class already.
+    """
+    data = {}
+    if doc is not None:
+        doc_fields = type(doc).model_fields
+        data = {
+            name: getattr(doc, name)
+            for name in read_class.model_fields
+            if name in doc_fields
+        }
+    data.update(fields)
+    return read_class.model_construct(**data)
+
+
+def json_default(value: Any) -> Any:
+    """Encode values unknown to pydantic-core, like bare object ids"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    return jsonable_encoder(value)
+
+
+def dump_json(content: Any, tp: Any = None) -> bytes:
+    """Serialize content into JSON bytes, as declared type if given.
+
+    Read objects are serialized as they are, without the validation FastAPI
+    runs against the response model of the route.
+    """
+    adapter = get_type_adapter(Any if tp is None else tp)
+    if not settings.PIPES_FAST_JSON:
+        data = adapter.dump_python(
+            content,
+            mode="json",
+            by_alias=True,
+            fallback=json_default,
+        )
+        return JSONResponse(data).body
+
+    if tp is None and isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content, by_alias=True)
+    return adapter.dump_json(content, by_alias=True, fallback=json_default)
+
+
+def json_response(content: Any, tp: Any = None, status_code: int = 200) -> Response:
+    """Response of pre-serialized content, skipping response model validation"""
+    return Response(
+        content=dump_json(content, tp),
+        status_code=status_code,
+        media_type=JSON_MEDIA_TYPE,
+    )
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core.
+
+    Object ids, datetimes and pydantic models are encoded natively, without
+    the standard json encoder. Falls back to it with PIPES_FAST_JSON off.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if not settings.PIPES_FAST_JSON:
+            return super().render(content)
+        return to_json(content, by_alias=True, fallback=json_default)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from pipes.common.compression import GzipEncoder
+from pipes.common.serialization import dump_json
+from pipes.config.settings import settings
+from pipes.db.loader import DocumentLoader
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+GZIP_MEDIA_TYPE = "application/gzip"
+
+
+def ndjson_requested(request: Request) -> bool:
+    """Client accepts NDJSON stream, use it as FastAPI dependency"""
+    accept = request.headers.get("accept", "")
+    media_types = [item.split(";")[0].strip().lower() for item in accept.split(",")]
+    return NDJSON_MEDIA_TYPE in media_types
+
+
+async def read_chunks(
+    docs: AsyncIterator,
+    read: Callable[..., Awaitable[BaseModel]] | None = None,
+    loader: DocumentLoader | None = None,
+    chunk_size: int | None = None,
+) -> AsyncIterator[BaseModel]:
+    """Convert streamed documents into read objects, chunk by chunk.
+
+    The documents of a chunk are read concurrently, so their document gets
+    are batched by the loader, whose identity map is cleared after each
+    chunk to keep memory flat over the stream.
+    """
+    chunk_size = chunk_size or settings.PIPES_STREAM_CHUNK_SIZE
+
+    async def flush(chunk: list) -> list:
+        if read is None:
+            return chunk
+        items = await asyncio.gather(*[read(doc) for doc in chunk])
+        if loader is not None:
+            loader.clear()
+        return items
+
+    chunk = []
+    async for doc in docs:
+        chunk.append(doc)
+        if len(chunk) >= chunk_size:
+            for item in await flush(chunk):
+                yield item
+            chunk = []
+
+    for item in await flush(chunk):
+        yield item
+
+
+def ndjson_response(items: AsyncIterator[BaseModel]) -> StreamingResponse:
+    """Stream the items as newline delimited JSON, one record per line, by alias"""
+
+    async def lines() -> AsyncIterator[bytes]:
+        async for item in items:
+            yield item.model_dump_json(by_alias=True).encode("utf-8") + b"\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
+
+
+async def ndjson_chunks(
+    records: AsyncIterator[Any],
+    chunk_size: int | None = None,
+) -> AsyncIterator[bytes]:
+    """Serialize records into newline delimited JSON, many records per chunk"""
+    chunk_size = chunk_size or settings.PIPES_STREAM_CHUNK_SIZE
+
+    lines = []
+    async for record in records:
+        lines.append(dump_json(record))
+        if len(lines) >= chunk_size:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def ndjson_records_response(records: AsyncIterator[Any]) -> StreamingResponse:
+    """Stream the records as newline delimited JSON, records of any type"""
+    return StreamingResponse(ndjson_chunks(records), media_type=NDJSON_MEDIA_TYPE)
+
+
+def ndjson_archive_response(
+    records: AsyncIterator[Any],
+    filename: str,
+) -> StreamingResponse:
+    """Stream the records as gzip compressed NDJSON file, compressed chunk by chunk"""
+
+    async def body() -> AsyncIterator[bytes]:
+        encoder = GzipEncoder(settings.PIPES_COMPRESSION_LEVEL)
+        async for chunk in ndjson_chunks(records):
+            yield encoder.compress(chunk)
+        yield encoder.finish()
+
+    return StreamingResponse(
+        body(),
+        media_type=GZIP_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+ndjson_responses = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {}},
+        "description": f"One JSON record per line, if requested with 'Accept: {NDJSON_MEDIA_TYPE}'",
+    },
+}
@@ -1,14 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Awaitable, Callable
+
+from beanie import Document
 from pydantic import BaseModel
 
+from pipes.common.contexts import ContextCache, context_cache
 from pipes.common.exceptions import UserPermissionDenied
+from pipes.db.document import current_docdb
 from pipes.users.schemas import UserDocument
 
 
 class ContextValidator:
     """PIPES context validator class"""
 
+    # Context fields and their document collections, from the root context level
+    context_levels: list[tuple[str, type[Document]]] = []
+
+    # Cache of resolved context documents by context names
+    cache: ContextCache = context_cache
+
     def __init__(self) -> None:
         self._validated_context: BaseModel | None = None
 
@@ -34,17 +46,177 @@ class ContextValidator:
             raise UserPermissionDenied("Inactive user is not allowed.")
         return True
 
+    def get_context_pipeline(self, context: BaseModel) -> list[dict]:
+        """Aggregation pipeline resolving all context levels by name.
+
+        The root document is matched by name, then the document of each level
+        is looked up by its `context.<parent>` field and its name together, so
+        the lookup uses the `(context.<parent>, name)` index and joins at most
+        one document, whatever the number of documents under the parent.
+        """
+        root_field, _ = self.context_levels[0]
+        pipeline = [
+            {"$match": {"name": getattr(context, root_field)}},
+            {"$limit": 1},
+        ]
+
+        parent_field, local_field = root_field, "_id"
+        for field, collection in self.context_levels[1:]:
+            pipeline += [
+                {
+                    "$lookup": {
+                        "from": collection.Settings.name,
+                        "let": {"parent": f"${local_field}"},
+                        "pipeline": [
+                            {
+                                "$match": {
+                                    "name": getattr(context, field),
+                                    "$expr": {
+                                        "$eq": [f"$context.{parent_field}", "$$parent"],
+                                    },
+                                },
+                            },
+                            {"$limit": 1},
+                        ],
+                        "as": field,
+                    },
+                },
+                {"$addFields": {field: {"$arrayElemAt": [f"${field}", 0]}}},
+            ]
+            parent_field, local_field = field, f"{field}._id"
+
+        return pipeline
+
+    async def resolve_documents(self, context: BaseModel) -> dict[str, Document | None]:
+        """Resolve the documents of all context levels, cached by their names.
+
+        Returns the document of each context field, the missing ones and the
+        ones below them are None.
+        """
+        names = tuple(getattr(context, field) for field, _ in self.context_levels)
+
+        await self.cache.sync_version()
+        docs = self.cache.get(names)
+        if docs is not None:
+            return docs
+
+        generation = self.cache.generation
+        docs = await self.aggregate_documents(context)
+        self.cache.put(names, docs, generation)
+        return docs
+
+    async def aggregate_documents(
+        self,
+        context: BaseModel,
+    ) -> dict[str, Document | None]:
+        """Resolve the documents of all context levels in one round trip"""
+        root_field, root_collection = self.context_levels[0]
+        docdb = current_docdb()
+        raws = await docdb.aggregate(
+            collection=root_collection,
+            pipeline=self.get_context_pipeline(context),
+        )
+
+        raw = raws[0] if raws else {}
+        levels = {field: raw.pop(field, None) for field, _ in self.context_levels[1:]}
+        levels[root_field] = raw or None
+
+        docs: dict[str, Document | None] = {}
+        parent_field, parent_doc = None, None
+        for field, collection in self.context_levels:
+            data = levels[field]
+            if data and parent_field:
+                # Looked up by a missing parent, or not under the parent
+                parent_id = data.get("context", {}).get(parent_field)
+                if parent_doc is None or parent_id != parent_doc.id:
+                    data = None
+            docs[field] = collection.model_validate(data) if data else None
+            parent_field, parent_doc = field, docs[field]
+
+        return docs
+
+
+def get_validator_stages(cls: type[DomainValidator]) -> list[list[Callable]]:
+    """Validation methods of the class by stage, after the ones they depend on"""
+    names = sorted(
+        name
+        for name in dir(cls)
+        if name.startswith("validate_") and callable(getattr(cls, name))
+    )
+
+    stage_of: dict[str, int] = {}
+
+    def get_stage(name: str, path: tuple[str, ...]) -> int:
+        if name in stage_of:
+            return stage_of[name]
+        if name in path:
+            raise TypeError(
+                f"Circular validator dependency {' -> '.join(path + (name,))}",
+            )
+
+        stage = 0
+        for dependency in cls.validator_dependencies.get(name, []):
+            if dependency not in names:
+                raise TypeError(
+                    f"Validator '{name}' of {cls.__name__} depends on "
+                    f"missing validator '{dependency}'",
+                )
+            stage = max(stage, get_stage(dependency, path + (name,)) + 1)
+
+        stage_of[name] = stage
+        return stage
+
+    stages: list[list[Callable]] = []
+    for name in names:
+        stage = get_stage(name, ())
+        stages.extend([] for _ in range(stage + 1 - len(stages)))
+        stages[stage].append(getattr(cls, name))
+
+    return stages
+
 
 class DomainValidator:
-    """PIPES domain validator class"""
+    """PIPES domain validator class.
+
+    Validation methods, with names starting with `validate_`, are registered
+    once per class. Independent ones run concurrently, and the ones declared in
+    `validator_dependencies` run after the methods they depend on. They check
+    the instance and return it as is, a validator returning another object
+    raises TypeError, as its result could not be passed to the others.
+    """
+
+    # Validation methods, and the validation methods they need to run after
+    validator_dependencies: dict[str, list[str]] = {}
+
+    # Validation methods by stage, registered when the class is defined
+    validator_stages: list[list[Callable]] = []
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.validator_stages = get_validator_stages(cls)
+
+    def call_validator(self, method: Callable, instance: BaseModel) -> Awaitable:
+        return method(self, instance)
 
     async def validate(self, instance: BaseModel) -> BaseModel:
         """Call validation methods with names starting with validate_"""
-        for attr_name in dir(self):
-            if not attr_name.startswith("validate_"):
-                continue
+        for stage in self.validator_stages:
+            if len(stage) == 1:
+                results = [await self.call_validator(stage[0], instance)]
+            else:
+                results = await asyncio.gather(
+                    *(self.call_validator(method, instance) for method in stage),
+                    return_exceptions=True,
+                )
 
-            validate_method = getattr(self, attr_name)
-            instance = await validate_method(instance)
+            # Report the error of the first method in name order
+            for method, result in zip(stage, results):
+                if isinstance(result, BaseException):
+                    raise result
+                if result is not instance:
+                    raise TypeError(
+                        f"Validator '{method.__name__}' of {type(self).__name__} "
+                        "must return the instance it validates",
+                    )
 
         return instance
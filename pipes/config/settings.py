@@ -23,6 +23,16 @@ class CommonSettings(BaseSettings):
     PIPES_REGION: str = "us-west-2"
     PIPES_COGNITO_USER_POOL_ID: str
     PIPES_COGNITO_CLIENT_ID: str
+    PIPES_COGNITO_ENDPOINT_URL: str | None = None
+    PIPES_COGNITO_JWKS_TTL: int = 86400
+    PIPES_COGNITO_JWKS_REFRESH_AHEAD: int = 3600
+    PIPES_COGNITO_JWKS_MAX_STALE: int = 86400
+    PIPES_AUTH_TOKEN_CACHE_SIZE: int = 10000
+    PIPES_AUTH_VERIFY_BACKEND: str = "cryptography"
+    PIPES_AUTH_PRINCIPAL_CACHE_SIZE: int = 1000
+    PIPES_AUTH_PRINCIPAL_CACHE_TTL: int = 300
+    PIPES_API_KEY_CACHE_SIZE: int = 1000
+    PIPES_API_KEY_CACHE_TTL: int = 300
 
     # DocumentDB
     PIPES_DOCDB_HOST: str
@@ -30,10 +40,46 @@ class CommonSettings(BaseSettings):
     PIPES_DOCDB_NAME: str = "pipes"
     PIPES_DOCDB_USER: str | None
     PIPES_DOCDB_PASS: str | None
+    PIPES_DOCDB_MAX_POOL_SIZE: int = 100
+    PIPES_DOCDB_MIN_POOL_SIZE: int = 0
+    PIPES_DOCDB_WAIT_QUEUE_TIMEOUT_MS: int | None = None
+    PIPES_DOCDB_SERVER_SELECTION_TIMEOUT_MS: int = 30000
+    # Comma-separated wire compressors, e.g. "zstd,snappy,zlib"
+    PIPES_DOCDB_COMPRESSORS: str | None = None
+    # Create the declared query indexes missing in DocumentDB on startup
+    PIPES_DOCDB_SYNC_INDEXES: bool = True
+    # Multi-document transactions, supported by replica sets like DocumentDB
+    PIPES_DOCDB_TRANSACTIONS: bool = True
+
+    # Context cache, resolved context documents by names
+    PIPES_CONTEXT_CACHE_SIZE: int = 1000
+    PIPES_CONTEXT_CACHE_TTL: int = 300
+    # Seconds between checks of the context version shared by all workers
+    PIPES_CONTEXT_CACHE_VERSION_INTERVAL: float = 1.0
+
+    # Pagination
+    PIPES_PAGE_SIZE: int = 100
+    PIPES_PAGE_SIZE_MAX: int = 1000
+    # Number of documents read concurrently when streaming NDJSON
+    PIPES_STREAM_CHUNK_SIZE: int = 100
+
+    # Render JSON responses with pydantic-core, or the standard json encoder if off
+    PIPES_FAST_JSON: bool = True
+
+    # Response compression, encodings by preference, br and zstd if installed
+    PIPES_COMPRESSION_ENCODINGS: list[str] = ["zstd", "br", "gzip"]
+    # Minimum size in bytes of complete responses to compress
+    PIPES_COMPRESSION_MINIMUM_SIZE: int = 1024
+    PIPES_COMPRESSION_LEVEL: int = 6
+
+    # Seconds without progress after which a running background job is resumed
+    PIPES_JOB_LEASE: int = 300
 
 
 class DevelopmentSettings(CommonSettings):
     DEBUG: bool = True
+    # Standalone MongoDB of docker compose
+    PIPES_DOCDB_TRANSACTIONS: bool = False
 
 
 class TestingSettings(CommonSettings):
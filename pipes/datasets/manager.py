@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
+from typing import AsyncIterator
 
 from pymongo.errors import DuplicateKeyError
 
 from pipes.common.exceptions import DocumentAlreadyExists
 from pipes.common.constants import NodeLabel
+from pipes.common.streaming import read_chunks
 from pipes.db.manager import AbstractObjectManager
+from pipes.db.pagination import Page, PageParams
 from pipes.projects.schemas import ProjectDocument
 from pipes.projectruns.schemas import ProjectRunDocument
 from pipes.models.schemas import ModelDocument
@@ -152,7 +156,7 @@ class DatasetManager(AbstractObjectManager):
 
         d_read = await self.read_dataset(d_doc)
         return d_read
-    
+
     async def get_dataset_document(self, d_name: str) -> DatasetDocument:
         _context = ModelRunObjectContext(
             project=self.context.project.id,
@@ -172,59 +176,64 @@ class DatasetManager(AbstractObjectManager):
         )
         return d_doc
 
-    async def get_datasets(self) -> list[DatasetRead]:
-        """Get all datasets in the given context"""
+    def _get_datasets_query(self) -> dict:
+        """Query of the datasets in the given context"""
         _context = ModelRunObjectContext(
             project=self.context.project.id,
             projectrun=self.context.projectrun.id,
             model=self.context.model.id,
             modelrun=self.context.modelrun.id,
         )
-        d_docs = await self.d.find_all(
+        return {
+            "context.project": _context.project,
+            "context.projectrun": _context.projectrun,
+            "context.model": _context.model,
+            "context.modelrun": _context.modelrun,
+        }
+
+    async def get_datasets(self, page: PageParams | None = None) -> Page[DatasetRead]:
+        """Get all datasets in the given context"""
+        d_page = await self.d.find_page(
             collection=DatasetDocument,
-            query={
-                "context.project": _context.project,
-                "context.projectrun": _context.projectrun,
-                "context.model": _context.model,
-                "context.modelrun": _context.modelrun,
-            },
+            query=self._get_datasets_query(),
+            page=page,
+        )
+        # Read concurrently, so the loader batches the gets of all datasets
+        d_reads = await asyncio.gather(
+            *[self.read_dataset(d_doc) for d_doc in d_page.data],
         )
-        d_reads = []
-        for d_doc in d_docs:
-            d_read = await self.read_dataset(d_doc)
-            d_reads.append(d_read)
-        return d_reads
+        return Page(data=d_reads, next_cursor=d_page.next_cursor)
+
+    async def iter_datasets(self) -> AsyncIterator[DatasetRead]:
+        """Stream all datasets in the given context"""
+        d_docs = self.d.iter_all(
+            collection=DatasetDocument,
+            query=self._get_datasets_query(),
+        )
+        async for d_read in read_chunks(d_docs, self.read_dataset, self.loader):
+            yield d_read
 
     async def read_dataset(
         self,
         d_doc: DatasetDocument,
     ) -> DatasetRead:
         """Convert a dataset document into dataset read"""
-        # Read context
-        p_id = d_doc.context.project
-        p_doc = await self.d.get(collection=ProjectDocument, id=p_id)
-
-        pr_id = d_doc.context.projectrun
-        pr_doc = await self.d.get(collection=ProjectRunDocument, id=pr_id)
-
-        m_id = d_doc.context.model
-        m_doc = await self.d.get(collection=ModelDocument, id=m_id)
-
-        mr_id = d_doc.context.modelrun
-        mr_doc = await self.d.get(collection=ModelRunDocument, id=mr_id)
-
-        data = d_doc.model_dump()
-        data["context"] = ModelRunSimpleContext(
-            project=p_doc.name,
-            projectrun=pr_doc.name,
-            model=m_doc.name,
-            modelrun=mr_doc.name,
+        _context = d_doc.context
+        d_read = await self.assemble(
+            DatasetRead,
+            d_doc,
+            context=self.assemble(
+                ModelRunSimpleContext,
+                project=self.get_name(ProjectDocument, _context.project),
+                projectrun=self.get_name(ProjectRunDocument, _context.projectrun),
+                model=self.get_name(ModelDocument, _context.model),
+                modelrun=self.get_name(ModelRunDocument, _context.modelrun),
+            ),
+            registration_author=self._read_author(d_doc),
         )
+        return d_read
 
-        # dataset author
+    async def _read_author(self, d_doc: DatasetDocument) -> UserRead:
         author_id = d_doc.registration_author
-        author_doc = await self.d.get(collection=UserDocument, id=author_id)
-        author_read = UserRead.model_validate(author_doc.model_dump())
-        data["registration_author"] = author_read
-
-        return DatasetRead.model_validate(data)
+        author_doc = await self.loader.get(collection=UserDocument, id=author_id)
+        return author_doc.read()
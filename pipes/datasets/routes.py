@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from pipes.apikeys.schemas import APIKeyScope
 from pipes.common.exceptions import (
     ContextValidationError,
     DocumentAlreadyExists,
@@ -9,9 +10,12 @@ from pipes.common.exceptions import (
 )
 from pipes.datasets.manager import DatasetManager
 from pipes.datasets.schemas import DatasetCreate, DatasetRead
+from pipes.common.serialization import json_response
+from pipes.common.streaming import ndjson_requested, ndjson_response, ndjson_responses
+from pipes.db.pagination import Page, PageParams, page_params, page_response
 from pipes.modelruns.contexts import ModelRunSimpleContext
 from pipes.modelruns.validators import ModelRunContextValidator
-from pipes.users.auth import auth_required
+from pipes.users.auth import scoped_auth_required
 from pipes.users.schemas import UserDocument
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -26,7 +30,7 @@ async def create_dataset(
     model: str,
     modelrun: str,
     data: DatasetCreate,
-    user: UserDocument = Depends(auth_required),
+    user: UserDocument = Depends(scoped_auth_required(APIKeyScope.datasets)),
 ):
     """Create a dataset with given context"""
     context = ModelRunSimpleContext(
@@ -65,16 +69,22 @@ async def create_dataset(
 
     d_read = await manager.read_dataset(d_doc)
 
-    return d_read
+    return json_response(d_read, DatasetRead, status_code=201)
 
 
-@router.get("/datasets", response_model=list[DatasetRead])
+@router.get(
+    "/datasets",
+    response_model=Page[DatasetRead] | list[DatasetRead],
+    responses=ndjson_responses,
+)
 async def get_datasets(
     project: str,
     projectrun: str,
     model: str,
     modelrun: str,
-    user: UserDocument = Depends(auth_required),
+    user: UserDocument = Depends(scoped_auth_required(APIKeyScope.datasets)),
+    page: PageParams = Depends(page_params),
+    ndjson: bool = Depends(ndjson_requested),
 ):
     """Get all datasets under given context"""
     context = ModelRunSimpleContext(
@@ -99,6 +109,9 @@ async def get_datasets(
         )
 
     manager = DatasetManager(context=validated_context)
-    d_reads = await manager.get_datasets()
+    if ndjson:
+        return ndjson_response(manager.iter_datasets())
+
+    d_page = await manager.get_datasets(page)
 
-    return d_reads
+    return page_response(d_page, page)
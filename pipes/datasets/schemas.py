@@ -191,12 +191,12 @@ class DatasetCreate(BaseModel):
     )
     temporal_info: TemporalInfo = Field(
         title="temporal_info",
-        default={},
+        default_factory=TemporalInfo,
         description="The temportal metadata of the dataset",
     )
     spatial_info: SpatialInfo = Field(
         title="spatial_info",
-        default={},
+        default_factory=SpatialInfo,
         description="The spatial metadata of the dataset",
     )
     scenarios: list[str] = Field(
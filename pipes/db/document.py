@@ -1,18 +1,110 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator
+
 from beanie import Document
+from beanie.odm.utils.projection import get_projection
+from fastapi import Depends
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorClientSession,
+    AsyncIOMotorDatabase,
+)
+from pydantic import BaseModel
+from pymongo import ASCENDING, ReadPreference, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from pymongo.results import UpdateResult
 
+from pipes.config.settings import settings
 from pipes.db.abstract import AbstractDatabase
+from pipes.db.monitoring import PoolStatsListener
+from pipes.db.pagination import Page, PageParams, encode_cursor
+
+
+def get_docdb_uri() -> str:
+    """DocumentDB connection URI regarding the environment"""
+    if settings.PIPES_ENV in ["dev", "stage", "prod"]:
+        docdb_uri = "mongodb://{}:{}@{}:{}/{}".format(
+            settings.PIPES_DOCDB_USER,
+            settings.PIPES_DOCDB_PASS,
+            settings.PIPES_DOCDB_HOST,
+            settings.PIPES_DOCDB_PORT,
+            settings.PIPES_DOCDB_NAME,
+        )
+        docdb_uri += (
+            "?replicaSet=rs0&readPreference=secondaryPreferred&retryWrites=false"
+        )
+    else:
+        docdb_uri = f"mongodb://{settings.PIPES_DOCDB_HOST}:{settings.PIPES_DOCDB_PORT}/{settings.PIPES_DOCDB_NAME}"
+
+    return docdb_uri
+
+
+def get_docdb_client_options() -> dict:
+    """Motor client connection pool options from settings"""
+    options = {
+        "maxPoolSize": settings.PIPES_DOCDB_MAX_POOL_SIZE,
+        "minPoolSize": settings.PIPES_DOCDB_MIN_POOL_SIZE,
+        "waitQueueTimeoutMS": settings.PIPES_DOCDB_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.PIPES_DOCDB_SERVER_SELECTION_TIMEOUT_MS,
+    }
+    if settings.PIPES_DOCDB_COMPRESSORS:
+        options["compressors"] = settings.PIPES_DOCDB_COMPRESSORS
+    return options
 
 
 class DocumentDB(AbstractDatabase):
 
-    def connect(self):
-        pass
+    def __init__(self, uri: str | None = None, **client_options) -> None:
+        self.uri = uri
+        self.client_options = client_options
+        self.client: AsyncIOMotorClient | None = None
+        self.pool_listener = PoolStatsListener()
+
+    def connect(self) -> AsyncIOMotorClient:
+        """Create the Motor client, connections are pooled and shared"""
+        if self.client is None:
+            self.client = AsyncIOMotorClient(
+                self.uri,
+                event_listeners=[self.pool_listener],
+                **self.client_options,
+            )
+        return self.client
 
     def close(self):
-        pass
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+
+    @property
+    def database(self) -> AsyncIOMotorDatabase:
+        return self.connect()[settings.PIPES_DOCDB_NAME]
+
+    def pool_stats(self) -> dict:
+        """Connection pool options and statistics"""
+        return {
+            "options": self.client_options,
+            "stats": self.pool_listener.stats(),
+        }
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncIOMotorClientSession | None]:
+        """Session of a transaction committed on exit, aborted on error.
+
+        Yields None if transactions are disabled, the writes are not atomic then.
+        """
+        if not settings.PIPES_DOCDB_TRANSACTIONS:
+            yield None
+            return
+
+        async with await self.connect().start_session() as session:
+            # Transactions read from the primary, whatever the client preference
+            async with session.start_transaction(
+                read_preference=ReadPreference.PRIMARY,
+            ):
+                yield session
 
     async def get(self, collection: Document, id: str) -> Document:
         return await collection.get(id)
@@ -20,22 +112,150 @@ class DocumentDB(AbstractDatabase):
     async def insert(self, instance: Document) -> Document:
         return await instance.insert()
 
-    async def find_one(self, collection: Document, query: dict) -> Document | None:
-        return await collection.find_one(query)
+    async def insert_many(
+        self,
+        collection: Document,
+        instances: list[Document],
+        session: AsyncIOMotorClientSession | None = None,
+    ) -> list:
+        """Insert documents of one collection in one round trip"""
+        if not instances:
+            return []
+        result = await collection.insert_many(instances, session=session)
+        return result.inserted_ids
+
+    async def find_one(
+        self,
+        collection: Document,
+        query: dict,
+        projection: type[BaseModel] | None = None,
+    ) -> Document | BaseModel | None:
+        """Find one document, optionally fetch only the fields of projection model"""
+        return await collection.find_one(query, projection_model=projection)
 
     async def exists(self, collection: Document, query: dict) -> bool:
-        doc = await collection.find_one(query)
-        return True if doc else False
+        """Check document existence, fetch only _id of at most one raw document"""
+        motor_collection = collection.get_motor_collection()
+        doc = await motor_collection.find_one(query, projection={"_id": 1})
+        return doc is not None
+
+    async def exists_many(
+        self,
+        collection: Document,
+        field: str,
+        values: list,
+        query: dict | None = None,
+    ) -> set:
+        """Return the values of given field that already exist, in one query"""
+        if not values:
+            return set()
+
+        find = dict(query or {})
+        find[field] = {"$in": list(values)}
+
+        motor_collection = collection.get_motor_collection()
+        cursor = motor_collection.find(find, projection={"_id": 0, field: 1})
+
+        existing = set()
+        async for doc in cursor:
+            value = doc
+            for key in field.split("."):
+                value = value.get(key) if isinstance(value, dict) else None
+            if value is not None:
+                existing.add(value)
+        return existing
 
     async def find_all(
         self,
         collection: Document,
         query: dict | None = None,
-    ) -> list[Document]:
+        projection: type[BaseModel] | None = None,
+    ) -> list[Document | BaseModel]:
+        """Find all documents, optionally fetch only the fields of projection model"""
         if query:
-            return await collection.find(query).to_list()
+            return await collection.find(query, projection_model=projection).to_list()
+
+        return await collection.find(projection_model=projection).to_list()
+
+    async def iter_all(
+        self,
+        collection: Document,
+        query: dict | None = None,
+        projection: type[BaseModel] | None = None,
+    ) -> AsyncIterator[Document | BaseModel]:
+        """Iterate over documents from the cursor, one batch in memory at a time"""
+        async for doc in collection.find(query or {}, projection_model=projection):
+            yield doc
+
+    async def iter_raw(
+        self,
+        collection: Document,
+        query: dict,
+        projection: dict | None = None,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[dict]:
+        """Iterate over raw documents from the cursor, without model validation"""
+        motor_collection = collection.get_motor_collection()
+        cursor = motor_collection.find(query, projection=projection)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        async for raw in cursor:
+            yield raw
+
+    async def find_page(
+        self,
+        collection: Document,
+        query: dict | None = None,
+        page: PageParams | None = None,
+        projection: type[BaseModel] | None = None,
+    ) -> Page:
+        """Find one page of documents with keyset pagination on _id.
+
+        Without page params, or with pagination opted out, all documents are
+        returned in a single page.
+        """
+        if page is None or not page.paginate:
+            docs = await self.find_all(collection, query, projection=projection)
+            return Page(data=docs)
+
+        find = dict(query or {})
+        if page.after is not None:
+            after = {"_id": {"$gt": page.after}}
+            find = {"$and": [find, after]} if find else after
+
+        motor_collection = collection.get_motor_collection()
+        cursor = motor_collection.find(
+            find,
+            projection=get_projection(projection) if projection else None,
+        )
+        cursor = cursor.sort("_id", ASCENDING).limit(page.limit + 1)
+        raws = await cursor.to_list(length=page.limit + 1)
+
+        next_cursor = None
+        if len(raws) > page.limit:
+            raws = raws[: page.limit]
+            next_cursor = encode_cursor(raws[-1]["_id"])
 
-        return await collection.find().to_list()
+        model = projection or collection
+        return Page(
+            data=[model.model_validate(raw) for raw in raws],
+            next_cursor=next_cursor,
+        )
+
+    async def aggregate(self, collection: Document, pipeline: list[dict]) -> list[dict]:
+        """Run the aggregation pipeline, return the raw result documents"""
+        motor_collection = collection.get_motor_collection()
+        return await motor_collection.aggregate(pipeline).to_list(length=None)
+
+    async def distinct(
+        self,
+        collection: Document,
+        field: str,
+        query: dict | None = None,
+    ) -> list:
+        """Distinct values of given field among the documents matching the query"""
+        motor_collection = collection.get_motor_collection()
+        return await motor_collection.distinct(field, query or {})
 
     async def update_one(
         self,
@@ -45,6 +265,45 @@ class DocumentDB(AbstractDatabase):
     ) -> UpdateResult:
         return await collection.find_one(find).update(update)
 
+    async def find_one_and_update(
+        self,
+        collection: Document,
+        find: dict,
+        update: dict,
+    ) -> Document | None:
+        """Atomically update the document matching the query, None if no match"""
+        motor_collection = collection.get_motor_collection()
+        raw = await motor_collection.find_one_and_update(
+            find,
+            update,
+            return_document=ReturnDocument.AFTER,
+        )
+        return collection.model_validate(raw) if raw else None
+
+    async def upsert_one(
+        self,
+        collection: Document,
+        find: dict,
+        update: dict,
+    ) -> Document:
+        """Atomically update the document matching the query, or insert it"""
+        motor_collection = collection.get_motor_collection()
+        try:
+            raw = await motor_collection.find_one_and_update(
+                find,
+                update,
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # Lost the insert race to a concurrent upsert, the document exists now
+            raw = await motor_collection.find_one_and_update(
+                find,
+                update,
+                return_document=ReturnDocument.AFTER,
+            )
+        return collection.model_validate(raw)
+
     async def delete_one(
         self,
         collection: Document,
@@ -53,3 +312,46 @@ class DocumentDB(AbstractDatabase):
         """Delete one document matching the query"""
         result = await collection.find_one(query).delete()
         return result.deleted_count if result else 0
+
+    async def delete_many(
+        self,
+        collection: Document,
+        query: dict,
+    ) -> int:
+        """Delete all documents matching the query"""
+        result = await collection.find(query).delete()
+        return result.deleted_count if result else 0
+
+
+_docdb: DocumentDB | None = None
+
+
+def get_docdb() -> DocumentDB:
+    """Application-scoped DocumentDB instance, use it as FastAPI dependency"""
+    global _docdb
+    if _docdb is None:
+        _docdb = DocumentDB(uri=get_docdb_uri(), **get_docdb_client_options())
+    return _docdb
+
+
+_request_docdb: ContextVar[DocumentDB | None] = ContextVar(
+    "request_docdb",
+    default=None,
+)
+
+
+async def use_docdb(docdb: DocumentDB = Depends(get_docdb)) -> DocumentDB:
+    """Inject the DocumentDB instance of the request into managers and validators.
+
+    Registered as application dependency, so overriding `get_docdb` swaps the
+    instance used by the whole request. Each request runs in its own context,
+    the instance does not leak into other requests.
+    """
+    _request_docdb.set(docdb)
+    return docdb
+
+
+def current_docdb() -> DocumentDB:
+    """DocumentDB instance of current request, the application one out of request"""
+    docdb = _request_docdb.get()
+    return docdb if docdb is not None else get_docdb()
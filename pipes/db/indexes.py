@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, NamedTuple
+
+import pymongo
+from beanie import Document
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+from pipes.apikeys.schemas import APIKeyDocument
+from pipes.catalogdatasets.schemas import CatalogDatasetDocument
+from pipes.catalogmodels.schemas import CatalogModelDocument
+from pipes.datasets.schemas import DatasetDocument
+from pipes.db.document import get_docdb
+from pipes.handoffs.schemas import HandoffDocument
+from pipes.jobs.schemas import JobDocument
+from pipes.modelruns.schemas import ModelRunDocument
+from pipes.models.schemas import ModelDocument
+from pipes.projectruns.schemas import ProjectRunDocument
+from pipes.projects.schemas import ProjectDocument
+from pipes.tasks.schemas import TaskDocument
+from pipes.teams.schemas import TeamDocument
+from pipes.users.schemas import UserDocument
+
+logger = logging.getLogger(__name__)
+
+PROJECT = "context.project"
+PROJECTRUN = "context.projectrun"
+MODEL = "context.model"
+MODELRUN = "context.modelrun"
+
+
+def compound(*keys: str) -> IndexModel:
+    """Ascending compound index on the given keys"""
+    return IndexModel([(key, pymongo.ASCENDING) for key in keys])
+
+
+# Query indexes of each collection, on top of the unique constraint indexes
+# declared in the document settings. Context lookups by name use the dotted
+# context fields, list queries are sorted by `_id` for keyset pagination, and
+# context resolution looks up the child of a parent by `context.<parent>` and name.
+QUERY_INDEXES: dict[type[Document], list[IndexModel]] = {
+    ProjectDocument: [
+        compound("access", "_id"),
+        compound("name", "_id"),
+    ],
+    ProjectRunDocument: [
+        compound(PROJECT, "name"),
+    ],
+    TeamDocument: [
+        compound(PROJECT, "name"),
+    ],
+    ModelDocument: [
+        compound(PROJECT, PROJECTRUN, "name"),
+        compound(PROJECTRUN, "name"),
+        compound(PROJECT, "_id"),
+        compound(PROJECT, PROJECTRUN, "_id"),
+    ],
+    ModelRunDocument: [
+        compound(PROJECT, PROJECTRUN, MODEL, "name"),
+        compound(MODEL, "name"),
+        compound(PROJECT, "_id"),
+        compound(PROJECT, PROJECTRUN, "_id"),
+        compound(PROJECT, PROJECTRUN, MODEL, "_id"),
+    ],
+    DatasetDocument: [
+        compound(PROJECT, PROJECTRUN, MODEL, MODELRUN, "name"),
+        compound(PROJECT, PROJECTRUN, MODEL, MODELRUN, "_id"),
+    ],
+    TaskDocument: [
+        compound(PROJECT, PROJECTRUN, MODEL, MODELRUN, "name"),
+        compound(PROJECT, PROJECTRUN, MODEL, MODELRUN, "_id"),
+    ],
+    HandoffDocument: [
+        compound(PROJECT, PROJECTRUN, "name"),
+        compound(PROJECT, "_id"),
+        compound(PROJECT, PROJECTRUN, "_id"),
+        compound(PROJECT, PROJECTRUN, "from_model", "_id"),
+    ],
+    UserDocument: [
+        compound("username"),
+    ],
+    CatalogModelDocument: [
+        compound("created_by", "_id"),
+        compound("access_group", "_id"),
+    ],
+    CatalogDatasetDocument: [
+        compound("created_by", "_id"),
+        compound("access_group", "_id"),
+    ],
+    APIKeyDocument: [],
+    JobDocument: [compound("status", "heartbeat")],
+}
+
+
+class QueryShape(NamedTuple):
+    """Fields matched by a manager query, and the field it is sorted by.
+
+    Queries with `$or` have one shape per branch, `$lookup` stages have the shape
+    of their sub-pipeline match. Lookups by `_id`, and reads of whole collections,
+    are left out.
+    """
+
+    collection: type[Document]
+    fields: tuple[str, ...]
+    sort: str | None = None
+
+
+QUERY_SHAPES: list[QueryShape] = [
+    # projects
+    QueryShape(ProjectDocument, ("name",)),
+    QueryShape(ProjectDocument, ("name",), sort="_id"),
+    QueryShape(ProjectDocument, ("access",)),
+    QueryShape(ProjectDocument, ("access",), sort="_id"),
+    # projectruns
+    QueryShape(ProjectRunDocument, (PROJECT,)),
+    QueryShape(ProjectRunDocument, (PROJECT, "name")),
+    # teams
+    QueryShape(TeamDocument, (PROJECT,)),
+    QueryShape(TeamDocument, (PROJECT, "name")),
+    # models
+    QueryShape(ModelDocument, (PROJECT,)),
+    QueryShape(ModelDocument, (PROJECT, "name")),
+    QueryShape(ModelDocument, (PROJECT, PROJECTRUN)),
+    QueryShape(ModelDocument, (PROJECT, PROJECTRUN, "name")),
+    QueryShape(ModelDocument, (PROJECTRUN, "name")),
+    QueryShape(ModelDocument, (PROJECT,), sort="_id"),
+    QueryShape(ModelDocument, (PROJECT, PROJECTRUN), sort="_id"),
+    # modelruns
+    QueryShape(ModelRunDocument, (PROJECT,)),
+    QueryShape(ModelRunDocument, (PROJECT, PROJECTRUN)),
+    QueryShape(ModelRunDocument, (PROJECT, PROJECTRUN, MODEL, "name")),
+    QueryShape(ModelRunDocument, (MODEL, "name")),
+    QueryShape(ModelRunDocument, (PROJECT,), sort="_id"),
+    QueryShape(ModelRunDocument, (PROJECT, PROJECTRUN), sort="_id"),
+    QueryShape(ModelRunDocument, (PROJECT, PROJECTRUN, MODEL), sort="_id"),
+    # datasets
+    QueryShape(DatasetDocument, (PROJECT,)),
+    QueryShape(DatasetDocument, (PROJECT, PROJECTRUN, MODEL, MODELRUN, "name")),
+    QueryShape(DatasetDocument, (PROJECT, PROJECTRUN, MODEL, MODELRUN), sort="_id"),
+    # tasks
+    QueryShape(TaskDocument, (PROJECT,)),
+    QueryShape(TaskDocument, (PROJECT, PROJECTRUN, MODEL, MODELRUN, "name")),
+    QueryShape(TaskDocument, (PROJECT, PROJECTRUN, MODEL, MODELRUN), sort="_id"),
+    # handoffs
+    QueryShape(HandoffDocument, (PROJECT,)),
+    QueryShape(HandoffDocument, (PROJECT, PROJECTRUN)),
+    QueryShape(HandoffDocument, (PROJECT, PROJECTRUN, "name")),
+    QueryShape(HandoffDocument, (PROJECT,), sort="_id"),
+    QueryShape(HandoffDocument, (PROJECT, PROJECTRUN), sort="_id"),
+    QueryShape(HandoffDocument, (PROJECT, PROJECTRUN, "from_model"), sort="_id"),
+    # users
+    QueryShape(UserDocument, ("email",)),
+    QueryShape(UserDocument, ("username",)),
+    # catalog models
+    QueryShape(CatalogModelDocument, ("name",)),
+    QueryShape(CatalogModelDocument, ("name", "created_by")),
+    QueryShape(CatalogModelDocument, ("name", "access_group")),
+    QueryShape(CatalogModelDocument, ("created_by",), sort="_id"),
+    QueryShape(CatalogModelDocument, ("access_group",), sort="_id"),
+    # catalog datasets
+    QueryShape(CatalogDatasetDocument, ("name",)),
+    QueryShape(CatalogDatasetDocument, ("name", "created_by")),
+    QueryShape(CatalogDatasetDocument, ("name", "access_group")),
+    QueryShape(CatalogDatasetDocument, ("created_by",), sort="_id"),
+    QueryShape(CatalogDatasetDocument, ("access_group",), sort="_id"),
+    # api keys
+    QueryShape(APIKeyDocument, ("digest",)),
+    QueryShape(APIKeyDocument, ("user",)),
+    QueryShape(APIKeyDocument, ("user", "name")),
+    # jobs
+    QueryShape(JobDocument, ("status",)),
+    QueryShape(JobDocument, ("status", "heartbeat")),
+]
+
+
+class Query(NamedTuple):
+    """Filter of a query sent to a collection, and the field it is sorted by"""
+
+    collection: type[Document]
+    filter: dict
+    sort: str | None = None
+
+
+def bind_variables(value: Any) -> Any:
+    """Replace the `$$` variables of a lookup sub-pipeline by sample ids"""
+    if isinstance(value, dict):
+        return {key: bind_variables(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [bind_variables(item) for item in value]
+    if isinstance(value, str) and value.startswith("$$"):
+        return ObjectId()
+    return value
+
+
+def pipeline_queries(collection: type[Document], pipeline: list[dict]) -> list[Query]:
+    """Queries of an aggregation pipeline, the leading match and sort of the
+    collection, then the sub-pipeline match of each lookup"""
+    stages = pipeline + [{}]
+    sort = stages[1].get("$sort", {})
+    queries = [
+        Query(
+            collection,
+            stages[0].get("$match", {}),
+            sort=next(iter(sort)) if len(sort) == 1 else None,
+        ),
+    ]
+
+    collections = {c.Settings.name: c for c in QUERY_INDEXES}
+    for stage in pipeline:
+        lookup = stage.get("$lookup", {})
+        if not lookup.get("pipeline"):
+            continue
+        match = lookup["pipeline"][0].get("$match", {})
+        queries.append(Query(collections[lookup["from"]], bind_variables(match)))
+    return queries
+
+
+def query_fields(query: dict) -> tuple[str, ...]:
+    """Fields matched by the query, the compared ones of `$expr` included"""
+    fields = [key for key in query if not key.startswith("$")]
+    operands = query.get("$expr", {}).get("$eq", [])
+    fields += [
+        operand[1:]
+        for operand in operands
+        if isinstance(operand, str) and operand[:1] == "$" and operand[:2] != "$$"
+    ]
+    return tuple(fields)
+
+
+def query_shapes(query: Query) -> list[QueryShape]:
+    """Shapes of a query, one per `$or` branch, lookups by `_id` and reads of
+    whole collections left out"""
+    fields = query_fields(query.filter)
+    branches = query.filter.get("$or") or [{}]
+
+    shapes = []
+    for branch in branches:
+        shape = QueryShape(
+            query.collection,
+            fields + query_fields(branch),
+            sort=query.sort,
+        )
+        if shape.fields and "_id" not in shape.fields:
+            shapes.append(shape)
+    return shapes
+
+
+def get_indexes(collection: type[Document]) -> list[IndexModel]:
+    """All declared indexes of the collection, constraints first"""
+    settings = getattr(collection, "Settings", None)
+    return list(getattr(settings, "indexes", [])) + QUERY_INDEXES.get(collection, [])
+
+
+def index_keys(index: IndexModel) -> list[str]:
+    return list(index.document["key"].keys())
+
+
+def covers(index: IndexModel, shape: QueryShape) -> bool:
+    """Whether the index serves the query shape without a collection scan.
+
+    The index must lead with fields of the query, and when the query is sorted,
+    all fields must be matched by the index prefix followed by the sort field.
+    """
+    keys = index_keys(index)
+    prefix = 0
+    while prefix < len(keys) and keys[prefix] in shape.fields:
+        prefix += 1
+
+    if prefix == 0:
+        return False
+
+    if shape.sort is None:
+        return True
+
+    return (
+        prefix == len(shape.fields)
+        and prefix < len(keys)
+        and keys[prefix] == shape.sort
+    )
+
+
+def find_covering_index(shape: QueryShape) -> IndexModel | None:
+    """The first declared index covering the query shape, None if no one does"""
+    for index in get_indexes(shape.collection):
+        if covers(index, shape):
+            return index
+    return None
+
+
+async def sync_indexes(
+    database: AsyncIOMotorDatabase | None = None,
+    drop: bool = False,
+    dry_run: bool = False,
+) -> dict[str, dict[str, list[str]]]:
+    """Create the declared indexes missing in DocumentDB.
+
+    Existing indexes not declared anymore are reported as stale, and dropped
+    only if `drop` is set. With `dry_run`, nothing gets changed.
+    """
+    if database is None:
+        database = get_docdb().database
+
+    report = {}
+    for collection in QUERY_INDEXES:
+        name = collection.Settings.name
+        motor_collection = database[name]
+
+        declared = {index.document["name"]: index for index in get_indexes(collection)}
+        existing = await motor_collection.index_information()
+        missing = [index for key, index in declared.items() if key not in existing]
+        stale = [key for key in existing if key != "_id_" and key not in declared]
+
+        if missing and not dry_run:
+            await motor_collection.create_indexes(missing)
+            logger.info(
+                "Created indexes %s on collection '%s'",
+                [index.document["name"] for index in missing],
+                name,
+            )
+
+        dropped = []
+        if drop and not dry_run:
+            for key in stale:
+                await motor_collection.drop_index(key)
+                dropped.append(key)
+            if dropped:
+                logger.info("Dropped indexes %s on collection '%s'", dropped, name)
+
+        report[name] = {
+            "created": [index.document["name"] for index in missing],
+            "stale": stale,
+            "dropped": dropped,
+        }
+
+    return report
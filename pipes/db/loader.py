@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+
+from beanie import Document
+from bson import ObjectId
+
+from pipes.db.document import DocumentDB, current_docdb
+
+
+class DocumentLoader:
+    """Batching document loader with identity map.
+
+    All `get` calls of a collection issued within the same event loop tick are
+    fetched with one `{"_id": {"$in": [...]}}` query, and loaded documents are
+    kept in an identity map, so the same id is never fetched twice. Use one
+    loader per request, documents updated in the request should be primed or
+    cleared.
+    """
+
+    def __init__(self, docdb: DocumentDB | None = None) -> None:
+        self._docdb = docdb
+        self._futures: dict[tuple[type[Document], ObjectId], asyncio.Future] = {}
+        self._pending: dict[type[Document], list[ObjectId]] = {}
+        self._dispatching = False
+        self._tasks: set[asyncio.Task] = set()
+        self.queries = 0
+
+    @property
+    def docdb(self) -> DocumentDB:
+        return self._docdb or current_docdb()
+
+    async def get(
+        self,
+        collection: type[Document],
+        id: ObjectId | str | None,
+    ) -> Document | None:
+        """Get document by id, batched with the other gets of the same tick"""
+        if id is None:
+            return None
+
+        key = (collection, ObjectId(id))
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            self._pending.setdefault(collection, []).append(key[1])
+            if not self._dispatching:
+                self._dispatching = True
+                loop.call_soon(self._dispatch)
+
+        # Shield the shared future, a cancelled caller must not cancel other callers
+        return await asyncio.shield(future)
+
+    async def get_many(
+        self,
+        collection: type[Document],
+        ids: list[ObjectId | str],
+    ) -> list[Document | None]:
+        """Get documents by ids in the given order, None for missing ones"""
+        return list(await asyncio.gather(*[self.get(collection, id) for id in ids]))
+
+    def prime(self, doc: Document) -> None:
+        """Put the document into identity map, replacing the loaded one"""
+        key = (type(doc), ObjectId(doc.id))
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(doc)
+        self._futures[key] = future
+
+    def clear(
+        self,
+        collection: type[Document] | None = None,
+        id: ObjectId | str | None = None,
+    ) -> None:
+        """Remove documents from identity map, all of them by default"""
+        if collection is None:
+            self._futures.clear()
+        elif id is None:
+            for key in [key for key in self._futures if key[0] is collection]:
+                del self._futures[key]
+        else:
+            self._futures.pop((collection, ObjectId(id)), None)
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._dispatching = False
+        for collection, ids in pending.items():
+            task = asyncio.ensure_future(self._load(collection, ids))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load(self, collection: type[Document], ids: list[ObjectId]) -> None:
+        try:
+            docs = await self.docdb.find_all(
+                collection=collection,
+                query={"_id": {"$in": ids}},
+            )
+        except Exception as e:
+            for id in ids:
+                future = self._futures.pop((collection, id), None)
+                if future and not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.queries += 1
+
+        loaded = {doc.id: doc for doc in docs}
+        for id in ids:
+            future = self._futures.get((collection, id))
+            if future and not future.done():
+                future.set_result(loaded.get(id))
+
+
+_loader: ContextVar[DocumentLoader | None] = ContextVar("document_loader", default=None)
+
+
+def get_loader() -> DocumentLoader | None:
+    """Document loader of current request, None if out of request scope"""
+    return _loader.get()
+
+
+class DocumentLoaderMiddleware:
+    """ASGI middleware creating a fresh document loader for each HTTP request"""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _loader.set(DocumentLoader())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _loader.reset(token)
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 from abc import ABC
+from typing import Any
 
-from pipes.db.document import DocumentDB
+from beanie import Document
+from bson import ObjectId
+from pydantic import BaseModel
+
+from pipes.common.serialization import ReadModel, construct_read
+from pipes.db.document import DocumentDB, current_docdb
+from pipes.db.loader import DocumentLoader, get_loader
 
 
 class AbstractObjectManager(ABC):
@@ -10,13 +19,46 @@ class AbstractObjectManager(ABC):
     __label__: str | None = None
 
     @property
-    def d(self):
-        docdb = DocumentDB()
-        return docdb
+    def d(self) -> DocumentDB:
+        return current_docdb()
+
+    @property
+    def loader(self) -> DocumentLoader:
+        """Request-scoped document loader, or one of this manager out of request"""
+        loader = get_loader()
+        if loader is None:
+            if not hasattr(self, "_loader"):
+                self._loader = DocumentLoader()
+            loader = self._loader
+        return loader
 
     @property
     def label(self):
         return self.__label__
 
-    def __delete__(self):
-        self.d.close()
+    async def assemble(
+        self,
+        read_class: type[ReadModel],
+        doc: BaseModel | None = None,
+        **fields: Any,
+    ) -> ReadModel:
+        """Build read object from document fields and given field values.
+
+        Awaitable field values are awaited concurrently, so their document gets
+        are batched by the loader. The document and the field values are valid
+        already, the read object is constructed without validating them again.
+        """
+        names = [name for name, value in fields.items() if inspect.isawaitable(value)]
+        values = await asyncio.gather(*[fields[name] for name in names])
+        fields.update(zip(names, values))
+
+        return construct_read(read_class, doc, **fields)
+
+    async def get_name(
+        self,
+        collection: type[Document],
+        id: ObjectId | str | None,
+    ) -> str | None:
+        """Get document name by id through the loader, None if missing"""
+        doc = await self.loader.get(collection, id)
+        return doc.name if doc else None
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pymongo import monitoring
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Collect connection pool statistics of a Motor/PyMongo client"""
+
+    def __init__(self) -> None:
+        self.pools = 0
+        self.clears = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.check_outs_started = 0
+        self.check_outs_failed = 0
+        self.check_outs = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+
+    def stats(self) -> dict:
+        """Snapshot of the pool statistics, summed over all servers"""
+        waiting = self.check_outs_started - self.check_outs - self.check_outs_failed
+        return {
+            "pools": self.pools,
+            "clears": self.clears,
+            "open_connections": self.connections_created - self.connections_closed,
+            "connections_created": self.connections_created,
+            "connections_closed": self.connections_closed,
+            "checked_out": self.checked_out,
+            "max_checked_out": self.max_checked_out,
+            "waiting": waiting,
+            "check_outs": self.check_outs,
+            "check_outs_failed": self.check_outs_failed,
+        }
+
+    def pool_created(self, event):
+        self.pools += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.clears += 1
+
+    def pool_closed(self, event):
+        self.pools -= 1
+
+    def connection_created(self, event):
+        self.connections_created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.connections_closed += 1
+
+    def connection_check_out_started(self, event):
+        self.check_outs_started += 1
+
+    def connection_check_out_failed(self, event):
+        self.check_outs_failed += 1
+
+    def connection_checked_out(self, event):
+        self.check_outs += 1
+        self.checked_out += 1
+        self.max_checked_out = max(self.max_checked_out, self.checked_out)
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import base64
+from typing import Generic, TypeVar
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict, Field
+
+from pipes.common.serialization import json_response
+from pipes.config.settings import settings
+
+T = TypeVar("T")
+
+
+def encode_cursor(last_id: ObjectId) -> str:
+    """Opaque cursor pointing after the document of given id"""
+    return base64.urlsafe_b64encode(ObjectId(last_id).binary).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> ObjectId:
+    """Decode opaque cursor into the document id to continue after"""
+    try:
+        return ObjectId(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, InvalidId):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+
+
+class PageParams(BaseModel):
+    """Keyset pagination parameters.
+
+    Attributes:
+        limit: Maximum number of items in the page.
+        after: Id of the last document in previous page.
+        paginate: Return one page, or all items if opted out.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    limit: int = Field(
+        title="limit",
+        default=settings.PIPES_PAGE_SIZE,
+        description="maximum number of items in the page",
+    )
+    after: ObjectId | None = Field(
+        title="after",
+        default=None,
+        description="id of the last document in previous page",
+    )
+    paginate: bool = Field(
+        title="paginate",
+        default=True,
+        description="return one page, or all items if opted out",
+    )
+
+
+class Page(BaseModel, Generic[T]):
+    """A page of items.
+
+    Attributes:
+        data: Items of the page.
+        next_cursor: Cursor of the next page, None if this is the last page.
+    """
+
+    data: list[T] = Field(
+        title="data",
+        default=[],
+        description="items of the page",
+    )
+    next_cursor: str | None = Field(
+        title="next_cursor",
+        default=None,
+        description="cursor of the next page, None if this is the last page",
+    )
+
+
+async def page_params(
+    limit: int = Query(
+        default=settings.PIPES_PAGE_SIZE,
+        ge=1,
+        le=settings.PIPES_PAGE_SIZE_MAX,
+    ),
+    cursor: str | None = Query(
+        default=None,
+        description="next_cursor of previous page",
+    ),
+    paginate: bool = Query(
+        default=True,
+        description="set false to get all items unpaginated",
+    ),
+) -> PageParams:
+    """Pagination query parameters, use it as FastAPI dependency"""
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+    return PageParams(limit=limit, after=after, paginate=paginate)
+
+
+def page_response(page: Page, params: PageParams) -> Response:
+    """Serialized page, or its plain list of items if pagination opted out"""
+    if params.paginate:
+        return json_response(page)
+    return json_response(page.data)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
+from typing import AsyncIterator
 
 from pymongo.errors import DuplicateKeyError
 
 from pipes.common.exceptions import DocumentAlreadyExists, DocumentDoesNotExist
+from pipes.common.streaming import read_chunks
 from pipes.db.manager import AbstractObjectManager
+from pipes.db.pagination import Page, PageParams
 from pipes.common.constants import EdgeLabel
 from pipes.handoffs.schemas import (
     HandoffCreate,
@@ -90,7 +94,8 @@ class HandoffManager(AbstractObjectManager):
             h_docs.append(h_doc)
         return h_docs
 
-    async def get_handoffs(self, model: str | None = None) -> list[HandoffRead]:
+    async def _get_handoffs_query(self, model: str | None = None) -> dict:
+        """Query of the handoffs in the given context, from given model"""
         p_doc = self.context.project
         pr_doc = getattr(self.context, "projectrun", None)
         if pr_doc:
@@ -107,17 +112,36 @@ class HandoffManager(AbstractObjectManager):
             query = {
                 "context.project": p_doc.id,
             }
+        return query
 
-        h_docs = await self.d.find_all(
+    async def get_handoffs(
+        self,
+        model: str | None = None,
+        page: PageParams | None = None,
+    ) -> Page[HandoffRead]:
+        h_page = await self.d.find_page(
             collection=HandoffDocument,
-            query=query,
+            query=await self._get_handoffs_query(model),
+            page=page,
+        )
+
+        # Read concurrently, so the loader batches the gets of all handoffs
+        h_reads = await asyncio.gather(
+            *[self.read_handoff(h_doc) for h_doc in h_page.data],
         )
+        return Page(data=h_reads, next_cursor=h_page.next_cursor)
 
-        h_reads = []
-        for h_doc in h_docs:
-            h_read = await self.read_handoff(h_doc)
-            h_reads.append(h_read)
-        return h_reads
+    async def iter_handoffs(
+        self,
+        model: str | None = None,
+    ) -> AsyncIterator[HandoffRead]:
+        """Stream all handoffs in the given context, from given model"""
+        h_docs = self.d.iter_all(
+            collection=HandoffDocument,
+            query=await self._get_handoffs_query(model),
+        )
+        async for h_read in read_chunks(h_docs, self.read_handoff, self.loader):
+            yield h_read
 
     async def get_handoff_by_name(self, handoff_name: str) -> HandoffDocument:
         """Get a single handoff document by name"""
@@ -161,35 +185,20 @@ class HandoffManager(AbstractObjectManager):
         )
 
     async def read_handoff(self, h_doc: HandoffDocument) -> HandoffRead:
-        # Read context
-        p_id = h_doc.context.project
-        p_doc = await self.d.get(collection=ProjectDocument, id=p_id)
-
-        pr_id = h_doc.context.projectrun
-        pr_doc = await self.d.get(collection=ProjectRunDocument, id=pr_id)
-
-        m_from_id = h_doc.from_model
-        m_from_doc = await self.d.get(collection=ModelDocument, id=m_from_id)
-
-        m_to_id = h_doc.to_model
-        m_to_doc = await self.d.get(collection=ModelDocument, id=m_to_id)
-
-        mr_id = h_doc.from_modelrun
-        if mr_id:
-            mr_doc = await self.d.get(collection=ModelRunDocument, id=mr_id)
-        else:
-            mr_doc = None
-
-        data = h_doc.model_dump()
-        data["context"] = ProjectRunSimpleContext(
-            project=p_doc.name,
-            projectrun=pr_doc.name,
+        _context = h_doc.context
+        h_read = await self.assemble(
+            HandoffRead,
+            h_doc,
+            context=self.assemble(
+                ProjectRunSimpleContext,
+                project=self.get_name(ProjectDocument, _context.project),
+                projectrun=self.get_name(ProjectRunDocument, _context.projectrun),
+            ),
+            from_model=self.get_name(ModelDocument, h_doc.from_model),
+            to_model=self.get_name(ModelDocument, h_doc.to_model),
+            from_modelrun=self.get_name(ModelRunDocument, h_doc.from_modelrun),
         )
-        data["from_model"] = m_from_doc.name
-        data["to_model"] = m_to_doc.name
-        data["from_modelrun"] = mr_doc.name if mr_doc else None
-
-        return HandoffRead.model_validate(data)
+        return h_read
 
     async def update_handoff(
         self,
@@ -11,6 +11,9 @@ from pipes.common.exceptions import (
     DocumentDoesNotExist,
     DomainValidationError,
 )
+from pipes.common.serialization import json_response
+from pipes.common.streaming import ndjson_requested, ndjson_response, ndjson_responses
+from pipes.db.pagination import Page, PageParams, page_params, page_response
 from pipes.handoffs.manager import HandoffManager
 from pipes.handoffs.schemas import HandoffCreate, HandoffRead, HandoffUpdate
 from pipes.projects.contexts import ProjectSimpleContext
@@ -78,9 +81,9 @@ async def create_handoff(
         h_reads.append(h_read)
 
     if len(h_reads) == 1:
-        return h_reads[0]
+        return json_response(h_reads[0], HandoffRead, status_code=201)
 
-    return h_reads
+    return json_response(h_reads, list[HandoffRead], status_code=201)
 
 
 @router.get("/handoff", response_model=HandoffRead)
@@ -121,15 +124,21 @@ async def get_handoff(
             detail=f"Handoff '{handoff}' not found",
         )
 
-    return h_read
+    return json_response(h_read, HandoffRead)
 
 
-@router.get("/handoffs", response_model=list[HandoffRead])
+@router.get(
+    "/handoffs",
+    response_model=Page[HandoffRead] | list[HandoffRead],
+    responses=ndjson_responses,
+)
 async def get_handoffs(
     project: str,
     projectrun: str | None = None,
     model: str | None = None,
     user: UserDocument = Depends(auth_required),
+    page: PageParams = Depends(page_params),
+    ndjson: bool = Depends(ndjson_requested),
 ):
     """Get all models with given project and projectrun"""
     if projectrun:
@@ -150,9 +159,12 @@ async def get_handoffs(
             )
 
         manager = HandoffManager(context=validated_context)
-        h_reads = await manager.get_handoffs(model)
+        if ndjson:
+            return ndjson_response(manager.iter_handoffs(model))
 
-        return h_reads
+        h_page = await manager.get_handoffs(model, page)
+
+        return page_response(h_page, page)
 
     else:
         context = ProjectSimpleContext(project=project)
@@ -172,9 +184,12 @@ async def get_handoffs(
             )
 
         manager = HandoffManager(context=validated_context)
-        h_reads = await manager.get_handoffs(model)
+        if ndjson:
+            return ndjson_response(manager.iter_handoffs(model))
+
+        h_page = await manager.get_handoffs(model, page)
 
-        return h_reads
+        return page_response(h_page, page)
 
 
 @router.delete("/handoffs", status_code=204)
@@ -271,7 +286,7 @@ async def update_handoff(
     try:
         updated_h_doc = await handoff_manager.update_handoff(h_doc, data, user)
         updated_h_read = await handoff_manager.read_handoff(updated_h_doc)
-        return updated_h_read
+        return json_response(updated_h_read, HandoffRead)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
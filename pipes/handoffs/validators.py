@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pipes.common.exceptions import DomainValidationError
 from pipes.common.validators import DomainValidator
-from pipes.db.document import DocumentDB
+from pipes.db.document import current_docdb
 from pipes.models.schemas import ModelDocument
 from pipes.modelruns.schemas import ModelRunDocument
 from pipes.projectruns.contexts import ProjectRunDocumentContext
@@ -11,12 +11,48 @@ from pipes.handoffs.schemas import HandoffCreate
 
 class HandoffDomainValidator(DomainValidator):
 
+    # The from_model document is looked up once, the to_model one concurrently
+    validator_dependencies = {
+        "validate_from_modelrun": ["validate_from_model"],
+        "validate_scheduled_start": ["validate_from_model"],
+        "validate_scheduled_end": ["validate_from_model"],
+    }
+
     def __init__(self, context: ProjectRunDocumentContext) -> None:
         self.context = context
         self.from_model_doc = None
         self.to_model_doc = None
         self.from_modelrun_doc = None
 
+    async def find_model(self, name: str) -> ModelDocument | None:
+        """Find model of given name under the project run of the context"""
+        docdb = current_docdb()
+        return await docdb.find_one(
+            collection=ModelDocument,
+            query={
+                "context.project": self.context.project.id,  # type: ignore
+                "context.projectrun": self.context.projectrun.id,  # type: ignore
+                "name": name,
+            },
+        )
+
+    async def find_modelrun(
+        self,
+        m_doc: ModelDocument,
+        name: str,
+    ) -> ModelRunDocument | None:
+        """Find model run of given name under the model"""
+        docdb = current_docdb()
+        return await docdb.find_one(
+            collection=ModelRunDocument,
+            query={
+                "context.project": self.context.project.id,  # type: ignore
+                "context.projectrun": self.context.projectrun.id,  # type: ignore
+                "context.model": m_doc.id,
+                "name": name,
+            },
+        )
+
     async def validate_from_model(self, h_create: HandoffCreate) -> HandoffCreate:
         if self.from_model_doc:
             return h_create
@@ -26,15 +62,7 @@ class HandoffDomainValidator(DomainValidator):
                 f"Handoff from_model '{h_create.from_model}' could not be same as to_model '{h_create.to_model}'",
             )
 
-        docdb = DocumentDB()
-        m_doc = await docdb.find_one(
-            collection=ModelDocument,
-            query={
-                "context.project": self.context.project.id,  # type: ignore
-                "context.projectrun": self.context.projectrun.id,  # type: ignore
-                "name": h_create.from_model,
-            },
-        )
+        m_doc = await self.find_model(h_create.from_model)
         if m_doc is None:
             raise DomainValidationError(
                 f"Handoff from_model '{h_create.from_model}' does not exist under context {self.context}.",
@@ -53,15 +81,7 @@ class HandoffDomainValidator(DomainValidator):
                 f"Handoff to_model '{h_create.to_model}' could not be same as from_model '{h_create.from_model}'",
             )
 
-        docdb = DocumentDB()
-        m_doc = await docdb.find_one(
-            collection=ModelDocument,
-            query={
-                "context.project": self.context.project.id,  # type: ignore
-                "context.projectrun": self.context.projectrun.id,  # type: ignore
-                "name": h_create.to_model,
-            },
-        )
+        m_doc = await self.find_model(h_create.to_model)
         if m_doc is None:
             raise DomainValidationError(
                 f"Handoff to_model '{h_create.to_model}' does not exist under context {self.context}.",
@@ -81,16 +101,7 @@ class HandoffDomainValidator(DomainValidator):
         if h_create.from_modelrun is None:
             return h_create
 
-        docdb = DocumentDB()
-        mr_doc = await docdb.find_one(
-            collection=ModelRunDocument,
-            query={
-                "context.project": self.context.project.id,  # type: ignore
-                "context.projectrun": self.context.projectrun.id,  # type: ignore
-                "context.model": self.from_model_doc.id,  # type: ignore
-                "name": h_create.from_modelrun,
-            },
-        )
+        mr_doc = await self.find_modelrun(self.from_model_doc, h_create.from_modelrun)
         if mr_doc is None:
             raise DomainValidationError(
                 f"Handoff from_modelrun '{h_create.from_modelrun}' does not exist "
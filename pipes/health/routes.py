@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from pipes.db.document import DocumentDB, get_docdb
+from pipes.users.auth import auth_required
+from pipes.users.schemas import UserDocument
 
 router = APIRouter()
 
@@ -16,3 +20,20 @@ async def ping():
     Check the health status of the PIPES service.
     """
     return {"message": "pong", "status": "healthy"}
+
+
+@router.get("/health/docdb")
+async def docdb_pool_stats(
+    docdb: DocumentDB = Depends(get_docdb),
+    user: UserDocument = Depends(auth_required),
+):
+    """
+    DocumentDB connection pool options and statistics of this worker, admin only.
+    """
+    if not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not permitted. Admin only.",
+        )
+
+    return docdb.pool_stats()
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from functools import partial
+from uuid import uuid4
+
+from beanie import Document, PydanticObjectId
+
+from pipes.common.contexts import context_cache
+from pipes.common.exceptions import DocumentDoesNotExist
+from pipes.config.settings import settings
+from pipes.datasets.schemas import DatasetDocument
+from pipes.db.manager import AbstractObjectManager
+from pipes.handoffs.schemas import HandoffDocument
+from pipes.jobs.schemas import JobDocument, JobStatus, JobStep, JobType
+from pipes.models.schemas import ModelDocument
+from pipes.modelruns.schemas import ModelRunDocument
+from pipes.projects.schemas import ProjectDocument
+from pipes.projectruns.schemas import ProjectRunDocument
+from pipes.tasks.schemas import TaskDocument
+from pipes.teams.schemas import TeamDocument
+from pipes.users.schemas import UserDocument
+
+logger = logging.getLogger(__name__)
+
+# Context levels, with their document collection and the collections of the
+# documents under them, children first after the level document is deleted
+CONTEXT_LEVELS: dict[str, tuple[type[Document], list[type[Document]]]] = {
+    "project": (
+        ProjectDocument,
+        [
+            TeamDocument,
+            ProjectRunDocument,
+            ModelDocument,
+            ModelRunDocument,
+            HandoffDocument,
+            DatasetDocument,
+            TaskDocument,
+        ],
+    ),
+    "projectrun": (
+        ProjectRunDocument,
+        [
+            ModelDocument,
+            ModelRunDocument,
+            HandoffDocument,
+            DatasetDocument,
+            TaskDocument,
+        ],
+    ),
+    "model": (ModelDocument, [ModelRunDocument, DatasetDocument, TaskDocument]),
+    "modelrun": (ModelRunDocument, [DatasetDocument, TaskDocument]),
+}
+
+COLLECTIONS: dict[str, type[Document]] = {
+    collection.Settings.name: collection
+    for level_collection, children in CONTEXT_LEVELS.values()
+    for collection in [level_collection, *children]
+}
+
+# Context ids checked, and their orphans deleted, per query of the orphans sweep
+ORPHANS_BATCH_SIZE = 1000
+
+# Collections of context documents, cached by the context validators
+CONTEXT_COLLECTIONS = {
+    collection.Settings.name for collection, _ in CONTEXT_LEVELS.values()
+}
+
+
+class JobManager(AbstractObjectManager):
+    """Manager of background jobs deleting documents, step by step.
+
+    Each step is one `delete_many` on a collection, and the job saves its
+    progress after each one, so a job interrupted by a crash is resumed from
+    its first unfinished step by the next worker claiming it.
+    """
+
+    async def create_delete_project_job(
+        self,
+        p_doc: ProjectDocument,
+        user: UserDocument,
+    ) -> JobDocument:
+        """Job deleting the project and all documents under it"""
+        return await self._create_cascade_job(
+            level="project",
+            context={"project": p_doc.id},
+            doc_id=p_doc.id,
+            target={"project": p_doc.name},
+            user=user,
+        )
+
+    async def create_delete_projectrun_job(
+        self,
+        p_doc: ProjectDocument,
+        pr_doc: ProjectRunDocument,
+        user: UserDocument,
+    ) -> JobDocument:
+        """Job deleting the project run and all documents under it"""
+        return await self._create_cascade_job(
+            level="projectrun",
+            context={"project": p_doc.id, "projectrun": pr_doc.id},
+            doc_id=pr_doc.id,
+            target={"project": p_doc.name, "projectrun": pr_doc.name},
+            user=user,
+        )
+
+    async def create_sweep_orphans_job(self, user: UserDocument) -> JobDocument:
+        """Job deleting the documents whose context documents do not exist"""
+        steps = [
+            JobStep(collection=child.Settings.name, orphans_of=level)
+            for level, (_, children) in CONTEXT_LEVELS.items()
+            for child in children
+        ]
+        return await self._create_job(JobType.sweep_orphans, steps, {}, user)
+
+    async def _create_cascade_job(
+        self,
+        level: str,
+        context: dict[str, PydanticObjectId],
+        doc_id: PydanticObjectId,
+        target: dict[str, str],
+        user: UserDocument,
+    ) -> JobDocument:
+        # The context document first, so it is gone for readers right away
+        collection, children = CONTEXT_LEVELS[level]
+        steps = [JobStep(collection=collection.Settings.name, document=doc_id)]
+        steps += [
+            JobStep(collection=child.Settings.name, context=context)
+            for child in children
+        ]
+        return await self._create_job(JobType(f"delete_{level}"), steps, target, user)
+
+    async def _create_job(
+        self,
+        job_type: JobType,
+        steps: list[JobStep],
+        target: dict[str, str],
+        user: UserDocument,
+    ) -> JobDocument:
+        job = JobDocument(
+            type=job_type,
+            target=target,
+            steps=steps,
+            created_at=datetime.now(),
+            created_by=user.id,
+        )
+        job = await self.d.insert(job)
+        logger.info("Job '%s' of type '%s' created", job.id, job_type.value)
+        return job
+
+    async def get_job(self, job_id: PydanticObjectId) -> JobDocument:
+        job = await self.d.find_one(collection=JobDocument, query={"_id": job_id})
+        if not job:
+            raise DocumentDoesNotExist(f"Job '{job_id}' does not exist.")
+        return job
+
+    def _get_claimable_query(self) -> dict:
+        """Pending jobs, or running jobs of which the worker stopped making progress"""
+        stale = datetime.now() - timedelta(seconds=settings.PIPES_JOB_LEASE)
+        return {
+            "$or": [
+                {"status": JobStatus.pending.value},
+                {"status": JobStatus.running.value, "heartbeat": {"$lt": stale}},
+            ],
+        }
+
+    async def claim_job(self, job_id: PydanticObjectId) -> JobDocument | None:
+        """Mark the job running by this worker, None if claimed by another one"""
+        query = self._get_claimable_query()
+        query["_id"] = job_id
+        return await self.d.find_one_and_update(
+            collection=JobDocument,
+            find=query,
+            update={
+                "$set": {
+                    "status": JobStatus.running.value,
+                    "worker": uuid4().hex,
+                    "heartbeat": datetime.now(),
+                },
+            },
+        )
+
+    async def run_job(self, job_id: PydanticObjectId) -> JobDocument | None:
+        """Run the unfinished steps of the job, saving progress after each one"""
+        job = await self.claim_job(job_id)
+        if job is None:
+            return None
+
+        heartbeat = asyncio.ensure_future(self._keep_alive(job))
+        try:
+            for i, step in enumerate(job.steps):
+                if step.deleted is not None:
+                    continue
+
+                collection = COLLECTIONS[step.collection]
+                if step.orphans_of:
+                    step.deleted = await self._delete_orphans(
+                        collection,
+                        step.orphans_of,
+                    )
+                else:
+                    query = self._get_step_query(step)
+                    step.deleted = await self.d.delete_many(collection, query)
+
+                if step.deleted and collection.Settings.name in CONTEXT_COLLECTIONS:
+                    await context_cache.invalidate()
+
+                logger.info(
+                    "Job '%s' deleted %s documents from '%s'",
+                    job.id,
+                    step.deleted,
+                    step.collection,
+                )
+                if not await self._save_progress(
+                    job,
+                    {f"steps.{i}.deleted": step.deleted},
+                ):
+                    logger.warning(
+                        "Job '%s' claimed by another worker, stopped",
+                        job.id,
+                    )
+                    return None
+        except Exception as e:
+            logger.error("Job '%s' failed: %s", job.id, str(e))
+            return await self._finish_job(job, JobStatus.failed, str(e))
+        finally:
+            heartbeat.cancel()
+
+        return await self._finish_job(job, JobStatus.completed)
+
+    async def _save_progress(self, job: JobDocument, fields: dict) -> bool:
+        """Save the fields and refresh the heartbeat, False if the claim was lost"""
+        result = await self.d.update_one(
+            collection=JobDocument,
+            find={"_id": job.id, "worker": job.worker},
+            update={"$set": {**fields, "heartbeat": datetime.now()}},
+        )
+        return bool(result and result.matched_count)
+
+    async def _keep_alive(self, job: JobDocument) -> None:
+        """Refresh the heartbeat while a step runs, so the job stays within its lease"""
+        while True:
+            await asyncio.sleep(settings.PIPES_JOB_LEASE / 3)
+            try:
+                await self._save_progress(job, {})
+            except Exception as e:
+                logger.warning("Heartbeat of job '%s' failed: %s", job.id, str(e))
+
+    async def _finish_job(
+        self,
+        job: JobDocument,
+        status: JobStatus,
+        error: str | None = None,
+    ) -> JobDocument:
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.now()
+        finished = await self._save_progress(
+            job,
+            {
+                "status": status.value,
+                "error": error,
+                "finished_at": job.finished_at,
+            },
+        )
+        if not finished:
+            logger.warning("Job '%s' claimed by another worker, not finished", job.id)
+        return job
+
+    def _get_step_query(self, step: JobStep) -> dict:
+        if step.document is not None:
+            return {"_id": step.document}
+        return {f"context.{level}": value for level, value in step.context.items()}
+
+    async def _delete_orphans(self, collection: type[Document], level: str) -> int:
+        """Delete the documents of the collection whose context document is missing.
+
+        The context ids are read from the collection itself, so the documents
+        under a context document created meanwhile are never matched.
+        """
+        field = f"context.{level}"
+        context_ids = await self.d.distinct(collection, field)
+
+        parent, _ = CONTEXT_LEVELS[level]
+        deleted = 0
+        for start in range(0, len(context_ids), ORPHANS_BATCH_SIZE):
+            end = start + ORPHANS_BATCH_SIZE
+            batch = context_ids[start:end]
+            existing = await self.d.exists_many(parent, "_id", batch)
+            missing = [c_id for c_id in batch if c_id not in existing]
+            if missing:
+                deleted += await self.d.delete_many(
+                    collection,
+                    {field: {"$in": missing}},
+                )
+        return deleted
+
+    async def resume_jobs(self) -> int:
+        """Start the pending jobs, and the ones interrupted, in background"""
+        jobs = await self.d.find_all(
+            collection=JobDocument,
+            query=self._get_claimable_query(),
+        )
+        for job in jobs:
+            job_runner.start(job.id)
+
+        if jobs:
+            logger.info("Resumed %s background jobs", len(jobs))
+        return len(jobs)
+
+
+class JobRunner:
+    """Run jobs in background tasks of this worker, one task per job"""
+
+    def __init__(self) -> None:
+        self._tasks: dict[PydanticObjectId, asyncio.Task] = {}
+
+    def start(self, job_id: PydanticObjectId) -> None:
+        if job_id in self._tasks:
+            return
+
+        task = asyncio.ensure_future(JobManager().run_job(job_id))
+        task.add_done_callback(partial(self._discard, job_id))
+        self._tasks[job_id] = task
+
+    async def resume_periodically(self, interval: float | None = None) -> None:
+        """Resume the claimable jobs every lease interval, until cancelled.
+
+        Jobs of a worker that died stop making progress, and get claimed here
+        by a live worker once their lease expires.
+        """
+        interval = interval or settings.PIPES_JOB_LEASE
+        while True:
+            try:
+                await JobManager().resume_jobs()
+            except Exception as e:
+                logger.warning("Failed to resume background jobs: %s", e)
+            await asyncio.sleep(interval)
+
+    def _discard(self, job_id: PydanticObjectId, task: asyncio.Task) -> None:
+        self._tasks.pop(job_id, None)
+        if task.cancelled():
+            return
+        e = task.exception()
+        if e is not None:
+            logger.warning("Background job '%s' stopped: %s", job_id, e)
+
+
+job_runner = JobRunner()
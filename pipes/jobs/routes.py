@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from beanie import PydanticObjectId
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from pipes.common.exceptions import DocumentDoesNotExist
+from pipes.jobs.manager import JobManager, job_runner
+from pipes.jobs.schemas import JobRead
+from pipes.users.auth import auth_required
+from pipes.users.schemas import UserDocument
+
+router = APIRouter()
+
+
+@router.get("/jobs", response_model=JobRead)
+async def get_job(
+    job: PydanticObjectId,
+    user: UserDocument = Depends(auth_required),
+):
+    """Get a background job with its progress, by the user who created it"""
+    try:
+        manager = JobManager()
+        j_doc = await manager.get_job(job)
+    except DocumentDoesNotExist as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+
+    if (not user.is_superuser) and (j_doc.created_by != user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not permitted to read this job.",
+        )
+
+    return j_doc.read()
+
+
+@router.post("/jobs/orphans", response_model=JobRead, status_code=202)
+async def sweep_orphans(user: UserDocument = Depends(auth_required)):
+    """Delete the documents whose project, project run, model or model run is gone"""
+    if not user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not permitted. Admin only.",
+        )
+
+    manager = JobManager()
+    j_doc = await manager.create_sweep_orphans_job(user)
+    job_runner.start(j_doc.id)
+
+    return j_doc.read()
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel, Field
+
+from pipes.common.serialization import construct_read
+
+
+class JobType(str, Enum):
+    delete_project = "delete_project"
+    delete_projectrun = "delete_projectrun"
+    sweep_orphans = "sweep_orphans"
+
+
+class JobStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class JobStepRead(BaseModel):
+    """Job step read schema.
+
+    Attributes:
+        collection: Collection the step deletes documents from.
+        deleted: Number of deleted documents, None until the step is done.
+    """
+
+    collection: str = Field(
+        title="collection",
+        description="Collection the step deletes documents from",
+    )
+    deleted: int | None = Field(
+        title="deleted",
+        default=None,
+        description="Number of deleted documents, None until the step is done",
+    )
+
+
+class JobStep(JobStepRead):
+    """Job step, one delete_many on a collection.
+
+    Attributes:
+        collection: Collection the step deletes documents from.
+        deleted: Number of deleted documents, None until the step is done.
+        document: Id of the document to delete, if only this one.
+        context: Context ids by level of the documents to delete.
+        orphans_of: Context level whose missing documents make the documents of
+            the collection orphans, looked up when the step runs.
+    """
+
+    document: PydanticObjectId | None = Field(
+        title="document",
+        default=None,
+        description="Id of the document to delete, if only this one",
+    )
+    context: dict[str, PydanticObjectId] = Field(
+        title="context",
+        default={},
+        description="Context ids by level of the documents to delete",
+    )
+    orphans_of: str | None = Field(
+        title="orphans_of",
+        default=None,
+        description="Context level of the orphans to delete",
+    )
+
+
+class JobRead(BaseModel):
+    """Background job read schema.
+
+    Attributes:
+        id: The job id.
+        type: The job type.
+        status: The job status.
+        target: Names of the context the job applies to.
+        steps: Job steps in order, with their progress.
+        error: Error message of the failed job.
+        created_at: Job creation datetime.
+        finished_at: Job completion datetime.
+    """
+
+    id: str = Field(
+        title="id",
+        description="The job id",
+    )
+    type: JobType = Field(
+        title="type",
+        description="The job type",
+    )
+    status: JobStatus = Field(
+        title="status",
+        description="The job status",
+    )
+    target: dict[str, str] = Field(
+        title="target",
+        default={},
+        description="Names of the context the job applies to",
+    )
+    steps: list[JobStepRead] = Field(
+        title="steps",
+        default=[],
+        description="Job steps in order, with their progress",
+    )
+    error: str | None = Field(
+        title="error",
+        default=None,
+        description="Error message of the failed job",
+    )
+    created_at: datetime = Field(
+        title="created_at",
+        description="Job creation datetime",
+    )
+    finished_at: datetime | None = Field(
+        title="finished_at",
+        default=None,
+        description="Job completion datetime",
+    )
+
+
+class JobDocument(Document):
+    """Background job document, its progress is saved after each step.
+
+    Attributes:
+        type: The job type.
+        status: The job status.
+        target: Names of the context the job applies to.
+        steps: Job steps in order, with their filters and progress.
+        error: Error message of the failed job.
+        created_at: Job creation datetime.
+        created_by: User who created the job.
+        finished_at: Job completion datetime.
+        worker: Claim token of the worker running the job.
+        heartbeat: Last progress datetime of the running job, a job without
+            progress for longer than the lease is resumed by another worker.
+    """
+
+    type: JobType = Field(
+        title="type",
+        description="The job type",
+    )
+    status: JobStatus = Field(
+        title="status",
+        default=JobStatus.pending,
+        description="The job status",
+    )
+    target: dict[str, str] = Field(
+        title="target",
+        default={},
+        description="Names of the context the job applies to",
+    )
+    steps: list[JobStep] = Field(
+        title="steps",
+        default=[],
+        description="Job steps in order, with their filters and progress",
+    )
+    error: str | None = Field(
+        title="error",
+        default=None,
+        description="Error message of the failed job",
+    )
+    created_at: datetime = Field(
+        title="created_at",
+        description="Job creation datetime",
+    )
+    created_by: PydanticObjectId | None = Field(
+        title="created_by",
+        default=None,
+        description="User who created the job",
+    )
+    finished_at: datetime | None = Field(
+        title="finished_at",
+        default=None,
+        description="Job completion datetime",
+    )
+    worker: str | None = Field(
+        title="worker",
+        default=None,
+        description="Claim token of the worker running the job",
+    )
+    heartbeat: datetime | None = Field(
+        title="heartbeat",
+        default=None,
+        description="Last progress datetime of the running job",
+    )
+
+    class Settings:
+        name = "jobs"
+
+    def read(self) -> JobRead:
+        steps = [construct_read(JobStepRead, step) for step in self.steps]
+        return construct_read(JobRead, self, id=str(self.id), steps=steps)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
+from typing import AsyncIterator
 
 from pymongo.errors import DuplicateKeyError
 
 from pipes.common.exceptions import DocumentAlreadyExists
+from pipes.common.streaming import read_chunks
 from pipes.db.manager import AbstractObjectManager
+from pipes.db.pagination import Page, PageParams
 from pipes.common.constants import NodeLabel
 from pipes.projects.contexts import ProjectDocumentContext
 from pipes.projects.schemas import ProjectDocument
@@ -62,12 +66,12 @@ class ModelRunManager(AbstractObjectManager):
         m_doc = self.context.model
 
         mr_name = mr_create.name
-        mr_doc_exists = await self.d.find_one(
+        mr_doc_exists = await self.d.exists(
             collection=ModelRunDocument,
             query={
                 "context.project": p_doc.id,
                 "context.projectrun": pr_doc.id,
-                "context.model": m_doc,
+                "context.model": m_doc.id,
                 "name": mr_name,
             },
         )
@@ -115,8 +119,8 @@ class ModelRunManager(AbstractObjectManager):
         )
         return mr_doc
 
-    async def get_modelruns(self) -> list[ModelRunRead]:
-        """Get all model runs under given project, project run, model"""
+    def _get_modelruns_query(self) -> dict:
+        """Query of the model runs under given project, project run, model"""
         p_doc = self.context.project
         pr_doc = getattr(self.context, "projectrun", None)
         m_doc = getattr(self.context, "model", None)
@@ -135,40 +139,44 @@ class ModelRunManager(AbstractObjectManager):
                 "context.projectrun": pr_doc.id,
                 "context.model": m_doc.id,
             }
+        return query
 
-        mr_docs = await self.d.find_all(
+    async def get_modelruns(
+        self,
+        page: PageParams | None = None,
+    ) -> Page[ModelRunRead]:
+        """Get all model runs under given project, project run, model"""
+        mr_page = await self.d.find_page(
             collection=ModelRunDocument,
-            query=query,
+            query=self._get_modelruns_query(),
+            page=page,
         )
 
-        mr_reads = []
-        for mr_doc in mr_docs:
-            data = mr_doc.model_dump()
-            pr_doc = await self.d.get(ProjectRunDocument, mr_doc.context.projectrun)
-            m_doc = await self.d.get(ModelDocument, mr_doc.context.model)
-            data["context"] = ModelSimpleContext(
-                project=p_doc.name,
-                projectrun=pr_doc.name,
-                model=m_doc.name,
-            )
-            mr_reads.append(ModelRunRead.model_validate(data))
-        return mr_reads
-
-    async def read_modelrun(self, mr_doc: ModelRunDocument) -> ModelRunRead:
-        p_id = mr_doc.context.project
-        p_doc = await self.d.get(collection=ProjectDocument, id=p_id)
-
-        pr_id = mr_doc.context.projectrun
-        pr_doc = await self.d.get(collection=ProjectRunDocument, id=pr_id)
-
-        m_id = mr_doc.context.model
-        m_doc = await self.d.get(collection=ModelDocument, id=m_id)
+        # Read concurrently, so the loader batches the gets of all model runs
+        mr_reads = await asyncio.gather(
+            *[self.read_modelrun(mr_doc) for mr_doc in mr_page.data],
+        )
+        return Page(data=mr_reads, next_cursor=mr_page.next_cursor)
 
-        data = mr_doc.model_dump()
-        data["context"] = ModelSimpleContext(
-            project=p_doc.name,
-            projectrun=pr_doc.name,
-            model=m_doc.name,
+    async def iter_modelruns(self) -> AsyncIterator[ModelRunRead]:
+        """Stream all model runs under given project, project run, model"""
+        mr_docs = self.d.iter_all(
+            collection=ModelRunDocument,
+            query=self._get_modelruns_query(),
         )
+        async for mr_read in read_chunks(mr_docs, self.read_modelrun, self.loader):
+            yield mr_read
 
-        return ModelRunRead.model_validate(data)
+    async def read_modelrun(self, mr_doc: ModelRunDocument) -> ModelRunRead:
+        _context = mr_doc.context
+        mr_read = await self.assemble(
+            ModelRunRead,
+            mr_doc,
+            context=self.assemble(
+                ModelSimpleContext,
+                project=self.get_name(ProjectDocument, _context.project),
+                projectrun=self.get_name(ProjectRunDocument, _context.projectrun),
+                model=self.get_name(ModelDocument, _context.model),
+            ),
+        )
+        return mr_read
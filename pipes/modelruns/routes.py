@@ -4,6 +4,7 @@ import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
+from pipes.apikeys.schemas import APIKeyScope
 from pipes.common.exceptions import (
     ContextValidationError,
     DocumentAlreadyExists,
@@ -11,6 +12,9 @@ from pipes.common.exceptions import (
     DomainValidationError,
     UserPermissionDenied,
 )
+from pipes.common.serialization import json_response
+from pipes.common.streaming import ndjson_requested, ndjson_response, ndjson_responses
+from pipes.db.pagination import Page, PageParams, page_params, page_response
 from pipes.models.contexts import ModelSimpleContext
 from pipes.models.validators import ModelContextValidator
 from pipes.modelruns.manager import ModelRunManager
@@ -19,7 +23,7 @@ from pipes.projects.contexts import ProjectSimpleContext
 from pipes.projects.validators import ProjectContextValidator
 from pipes.projectruns.contexts import ProjectRunSimpleContext
 from pipes.projectruns.validators import ProjectRunContextValidator
-from pipes.users.auth import auth_required
+from pipes.users.auth import scoped_auth_required
 from pipes.users.schemas import UserDocument
 
 logger = logging.getLogger(__name__)
@@ -32,7 +36,7 @@ async def create_modelrun(
     projectrun: str,
     model: str,
     data: ModelRunCreate,
-    user: UserDocument = Depends(auth_required),
+    user: UserDocument = Depends(scoped_auth_required(APIKeyScope.modelruns)),
 ):
     """Create a model run with given project/projectrun/model"""
     context = ModelSimpleContext(
@@ -70,15 +74,21 @@ async def create_modelrun(
 
     mr_read = await manager.read_modelrun(mr_doc)
 
-    return mr_read
+    return json_response(mr_read, ModelRunRead, status_code=201)
 
 
-@router.get("/modelruns", response_model=list[ModelRunRead])
+@router.get(
+    "/modelruns",
+    response_model=Page[ModelRunRead] | list[ModelRunRead],
+    responses=ndjson_responses,
+)
 async def get_modelruns(
     project: str,
     projectrun: str | None = None,
     model: str | None = None,
-    user: UserDocument = Depends(auth_required),
+    user: UserDocument = Depends(scoped_auth_required(APIKeyScope.modelruns)),
+    page: PageParams = Depends(page_params),
+    ndjson: bool = Depends(ndjson_requested),
 ):
     """Get all model runs under the given project/projectrun/model"""
     if projectrun and model:
@@ -103,8 +113,11 @@ async def get_modelruns(
             )
 
         manager = ModelRunManager(context=validated_context)
-        mr_reads = await manager.get_modelruns()
-        return mr_reads
+        if ndjson:
+            return ndjson_response(manager.iter_modelruns())
+
+        mr_page = await manager.get_modelruns(page)
+        return page_response(mr_page, page)
 
     if projectrun and (not model):
         pr_context = ProjectRunSimpleContext(project=project, projectrun=projectrun)
@@ -122,8 +135,11 @@ async def get_modelruns(
                 detail=str(e),
             )
         manager = ModelRunManager(context=validated_context)
-        mr_reads = await manager.get_modelruns()
-        return mr_reads
+        if ndjson:
+            return ndjson_response(manager.iter_modelruns())
+
+        mr_page = await manager.get_modelruns(page)
+        return page_response(mr_page, page)
 
     if (not projectrun) and (not model):
         p_context = ProjectSimpleContext(project=project)
@@ -141,5 +157,8 @@ async def get_modelruns(
                 detail=str(e),
             )
         manager = ModelRunManager(context=validated_context)
-        mr_reads = await manager.get_modelruns()
-        return mr_reads
+        if ndjson:
+            return ndjson_response(manager.iter_modelruns())
+
+        mr_page = await manager.get_modelruns(page)
+        return page_response(mr_page, page)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from beanie import Document
+
 from pipes.common.exceptions import ContextValidationError
 from pipes.common.validators import DomainValidator
-from pipes.db.document import DocumentDB
 from pipes.models.contexts import ModelDocumentContext
 from pipes.models.validators import ModelContextValidator
 from pipes.modelruns.contexts import ModelRunSimpleContext, ModelRunDocumentContext
@@ -12,24 +13,25 @@ from pipes.modelruns.schemas import ModelRunDocument
 class ModelRunContextValidator(ModelContextValidator):
     """Model run context validator class"""
 
-    async def validate_document(
+    context_levels = ModelContextValidator.context_levels + [
+        ("modelrun", ModelRunDocument),
+    ]
+
+    def build_context(
         self,
         context: ModelRunSimpleContext,
+        docs: dict[str, Document | None],
     ) -> ModelRunDocumentContext:
-        """Get model run document through validation"""
-        m_context = await super().validate_document(context)
+        """Validate model run document of resolved documents"""
+        m_context = super().build_context(context, docs)
         p_doc = m_context.project
         pr_doc = m_context.projectrun
         m_doc = m_context.model
 
         mr_name = context.modelrun
-        docdb = DocumentDB()
-        mr_doc = await docdb.find_one(
-            collection=ModelRunDocument,
-            query={"name": mr_name},
-        )
+        mr_doc = docs["modelrun"]
 
-        if not m_doc:
+        if not mr_doc:
             raise ContextValidationError(
                 f"Invalid context, model run '{mr_name}' "
                 f"does not exist under model '{m_doc.name}'"
@@ -37,15 +39,12 @@ class ModelRunContextValidator(ModelContextValidator):
                 f"in project '{p_doc.name}'",
             )
 
-        validated_context = ModelRunDocumentContext(
+        return ModelRunDocumentContext(
             project=p_doc,
             projectrun=pr_doc,
             model=m_doc,
             modelrun=mr_doc,
         )
-        self._validated_context = validated_context
-
-        return validated_context
 
 
 class ModelRunDomainValidator(DomainValidator):
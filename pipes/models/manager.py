@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
+from typing import AsyncIterator
 
 from pymongo.errors import DuplicateKeyError
 
+from pipes.common.contexts import context_cache
 from pipes.common.exceptions import DocumentAlreadyExists, DocumentDoesNotExist
+from pipes.common.streaming import read_chunks
 from pipes.db.manager import AbstractObjectManager
+from pipes.db.pagination import Page, PageParams
 from pipes.common.constants import NodeLabel
 from pipes.projects.contexts import ProjectDocumentContext
 from pipes.projects.schemas import ProjectDocument
@@ -24,7 +29,7 @@ from pipes.models.schemas import (
 )
 from pipes.models.validators import ModelDomainValidator
 from pipes.teams.manager import TeamManager
-from pipes.teams.schemas import TeamDocument
+from pipes.teams.schemas import TeamDocument, TeamRead
 from pipes.users.schemas import UserDocument
 
 logger = logging.getLogger(__name__)
@@ -147,8 +152,8 @@ class ModelManager(AbstractObjectManager):
         )
         return m_doc
 
-    async def get_models(self) -> list[ModelRead]:
-        """Get all models under given project and project run"""
+    def _get_models_query(self) -> dict:
+        """Query of the models under given project and project run"""
         p_doc = self.context.project
         pr_doc = getattr(self.context, "projectrun", None)
 
@@ -160,51 +165,53 @@ class ModelManager(AbstractObjectManager):
                 "context.project": p_doc.id,
                 "context.projectrun": pr_doc.id,
             }
+        return query
 
-        m_docs = await self.d.find_all(
+    async def get_models(self, page: PageParams | None = None) -> Page[ModelRead]:
+        """Get all models under given project and project run"""
+        m_page = await self.d.find_page(
             collection=ModelDocument,
-            query=query,
+            query=self._get_models_query(),
+            page=page,
         )
 
-        team_manager = TeamManager(self.context)
-        m_reads = []
-        for m_doc in m_docs:
-            data = m_doc.model_dump()
-            pr_doc = await self.d.get(ProjectRunDocument, m_doc.context.projectrun)
-            data["context"] = ProjectRunSimpleContext(
-                project=p_doc.name,
-                projectrun=pr_doc.name,
-            )
-            modeling_team_doc = await self.d.get(
-                collection=TeamDocument,
-                id=m_doc.modeling_team,
-            )
-            data["modeling_team"] = await team_manager.read_team(modeling_team_doc)
-            m_reads.append(ModelRead.model_validate(data))
-        return m_reads
+        # Read concurrently, so the loader batches the gets of all models
+        m_reads = await asyncio.gather(
+            *[self.read_model(m_doc) for m_doc in m_page.data],
+        )
+        return Page(data=m_reads, next_cursor=m_page.next_cursor)
+
+    async def iter_models(self) -> AsyncIterator[ModelRead]:
+        """Stream all models under given project and project run"""
+        m_docs = self.d.iter_all(
+            collection=ModelDocument,
+            query=self._get_models_query(),
+        )
+        async for m_read in read_chunks(m_docs, self.read_model, self.loader):
+            yield m_read
 
     async def read_model(self, m_doc: ModelDocument):
         """Read a model from given model document"""
-        p_id = m_doc.context.project
-        p_doc = await self.d.get(collection=ProjectDocument, id=p_id)
-
-        pr_id = m_doc.context.projectrun
-        pr_doc = await self.d.get(collection=ProjectRunDocument, id=pr_id)
+        _context = m_doc.context
+        m_read = await self.assemble(
+            ModelRead,
+            m_doc,
+            context=self.assemble(
+                ProjectRunSimpleContext,
+                project=self.get_name(ProjectDocument, _context.project),
+                projectrun=self.get_name(ProjectRunDocument, _context.projectrun),
+            ),
+            modeling_team=self._read_modeling_team(m_doc),
+        )
+        return m_read
 
+    async def _read_modeling_team(self, m_doc: ModelDocument) -> TeamRead:
         team_manager = TeamManager(context=self.context)
-
-        data = m_doc.model_dump()
-        data["context"] = ProjectRunSimpleContext(
-            project=p_doc.name,
-            projectrun=pr_doc.name,
-        )
-        modeling_team_doc = await self.d.get(
+        modeling_team_doc = await self.loader.get(
             collection=TeamDocument,
             id=m_doc.modeling_team,
         )
-        data["modeling_team"] = await team_manager.read_team(modeling_team_doc)
-
-        return ModelRead.model_validate(data)
+        return await team_manager.read_team(modeling_team_doc)
 
     async def get_model(self, name: str) -> ModelDocument:
         """Get a specific model by name"""
@@ -259,6 +266,7 @@ class ModelManager(AbstractObjectManager):
                 "name": model,
             },
         )
+        await context_cache.invalidate()
 
         project_name = self.context.project.name
         projectrun_name = self.context.projectrun.name
@@ -333,6 +341,7 @@ class ModelManager(AbstractObjectManager):
         m_doc.last_modified = datetime.now()
         m_doc.modified_by = user.id
         await m_doc.save()
+        await context_cache.invalidate()
 
         logger.info(
             "Model '%s' updated successfully under context: %s",
@@ -10,6 +10,9 @@ from pipes.common.exceptions import (
     DomainValidationError,
     UserPermissionDenied,
 )
+from pipes.common.serialization import json_response
+from pipes.common.streaming import ndjson_requested, ndjson_response, ndjson_responses
+from pipes.db.pagination import Page, PageParams, page_params, page_response
 from pipes.modelruns.manager import ModelRunManager
 from pipes.models.manager import ModelManager
 from pipes.models.schemas import (
@@ -70,18 +73,22 @@ async def create_model(
 
     m_read = await manager.read_model(m_doc)
 
-    return m_read
+    return json_response(m_read, ModelRead, status_code=201)
 
 
-@router.get("/models", response_model=list[ModelRead])
+@router.get(
+    "/models",
+    response_model=Page[ModelRead] | list[ModelRead],
+    responses=ndjson_responses,
+)
 async def get_models(
     project: str,
     projectrun: str | None = None,
     user: UserDocument = Depends(auth_required),
+    page: PageParams = Depends(page_params),
+    ndjson: bool = Depends(ndjson_requested),
 ):
     """Get all models with given project and projectrun"""
-    m_reads = []
-
     if projectrun is None:
         p_context = ProjectSimpleContext(project=project)
         try:
@@ -103,8 +110,10 @@ async def get_models(
         # pr_docs = await pr_manager.get_projectruns(read_docs=False)
         p_context = ProjectDocumentContext(project=validated_context.project)
         m_manager = ModelManager(context=p_context)
-        _m_reads = await m_manager.get_models()
-        m_reads.extend(_m_reads)
+        if ndjson:
+            return ndjson_response(m_manager.iter_models())
+
+        m_page = await m_manager.get_models(page)
 
     else:
         pr_context = ProjectRunSimpleContext(project=project, projectrun=projectrun)
@@ -122,10 +131,12 @@ async def get_models(
                 detail=str(e),
             )
         manager = ModelManager(context=validated_context)
-        _m_reads = await manager.get_models()
-        m_reads.extend(_m_reads)
+        if ndjson:
+            return ndjson_response(manager.iter_models())
+
+        m_page = await manager.get_models(page)
 
-    return m_reads
+    return page_response(m_page, page)
 
 
 @router.get("/models/detail", response_model=ModelRead)
@@ -163,7 +174,7 @@ async def get_model(
         )
 
     m_read = await manager.read_model(m_doc)
-    return m_read
+    return json_response(m_read, ModelRead)
 
 
 @router.delete("/models", status_code=204)
@@ -206,9 +217,9 @@ async def delete_model(
 
         # Check if there are any model runs under this model
         modelrun_manager = ModelRunManager(context=validated_context)
-        modelruns = await modelrun_manager.get_modelruns()
+        mr_page = await modelrun_manager.get_modelruns(PageParams(limit=1))
 
-        if modelruns:
+        if mr_page.data:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot delete model '{model}' because it has model runs associated with it",
@@ -275,4 +286,4 @@ async def update_model(
         )
 
     m_read = await manager.read_model(updated_m_doc)
-    return m_read
+    return json_response(m_read, ModelRead)
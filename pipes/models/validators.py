@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from beanie import Document
+
 from pipes.common.exceptions import ContextValidationError, DomainValidationError
 from pipes.common.validators import DomainValidator
-from pipes.db.document import DocumentDB
+from pipes.db.document import current_docdb
 from pipes.models.contexts import ModelDocumentContext, ModelSimpleContext
 from pipes.models.schemas import ModelCreate, ModelDocument
 from pipes.projectruns.contexts import ProjectRunDocumentContext
@@ -12,18 +14,22 @@ from pipes.projectruns.validators import ProjectRunContextValidator
 class ModelContextValidator(ProjectRunContextValidator):
     """Model context validator class"""
 
-    async def validate_document(
+    context_levels = ProjectRunContextValidator.context_levels + [
+        ("model", ModelDocument),
+    ]
+
+    def build_context(
         self,
         context: ModelSimpleContext,
+        docs: dict[str, Document | None],
     ) -> ModelDocumentContext:
-        """Get model document through validation"""
-        pr_context = await super().validate_document(context)
+        """Validate model document of resolved documents"""
+        pr_context = super().build_context(context, docs)
         p_doc = pr_context.project
         pr_doc = pr_context.projectrun
 
         m_name = context.model
-        docdb = DocumentDB()
-        m_doc = await docdb.find_one(collection=ModelDocument, query={"name": m_name})
+        m_doc = docs["model"]
 
         if not m_doc:
             raise ContextValidationError(
@@ -32,14 +38,11 @@ class ModelContextValidator(ProjectRunContextValidator):
                 f"of project '{p_doc.name}'",
             )
 
-        validated_context = ModelDocumentContext(
+        return ModelDocumentContext(
             project=p_doc,
             projectrun=pr_doc,
             model=m_doc,
         )
-        self._validated_context = validated_context
-
-        return validated_context
 
 
 class ModelDomainValidator(DomainValidator):
@@ -48,6 +51,36 @@ class ModelDomainValidator(DomainValidator):
     def __init__(self, context: ProjectRunDocumentContext) -> None:
         self.context = context
 
+    async def find_duplicate_scenario(self) -> tuple[str, str] | None:
+        """Model scenario defined twice under the project run, and its second model"""
+        docdb = current_docdb()
+        raws = await docdb.aggregate(
+            collection=ModelDocument,
+            pipeline=[
+                {
+                    "$match": {
+                        "context.project": self.context.project.id,
+                        "context.projectrun": self.context.projectrun.id,
+                    },
+                },
+                {"$sort": {"_id": 1}},
+                {"$unwind": "$scenario_mappings"},
+                {
+                    "$group": {
+                        "_id": "$scenario_mappings.model_scenario",
+                        "models": {"$push": "$name"},
+                    },
+                },
+                {"$match": {"models.1": {"$exists": True}}},
+                {"$sort": {"_id": 1}},
+                {"$limit": 1},
+            ],
+        )
+        if not raws:
+            return None
+
+        return raws[0]["_id"], raws[0]["models"][1]
+
     async def validate_scenario_mappings(
         self,
         m_create: ModelCreate,
@@ -55,25 +88,13 @@ class ModelDomainValidator(DomainValidator):
         """Project run scenarios should be within project scenarios"""
 
         # Validate model scenarios
-        m_scenario_pool = set()
-        docdb = DocumentDB()
-        existing_m_docs = await docdb.find_all(
-            collection=ModelDocument,
-            query={
-                "context.project": self.context.project,
-                "context.projectrun": self.context.projectrun,
-            },
-        )
-        for m_doc in existing_m_docs:
-            for scenario_mapping in m_doc.scenario_mappings:
-                m_scenario = scenario_mapping.model_scenario
-                if m_scenario not in m_scenario_pool:
-                    m_scenario_pool.add(m_scenario)
-                else:
-                    raise DomainValidationError(
-                        f"Model scneario name '{m_scenario}' already defined in "
-                        f"model '{m_doc.name}' under same project and project run.",
-                    )
+        duplicate = await self.find_duplicate_scenario()
+        if duplicate:
+            m_scenario, m_name = duplicate
+            raise DomainValidationError(
+                f"Model scneario name '{m_scenario}' already defined in "
+                f"model '{m_name}' under same project and project run.",
+            )
 
         # Validate project scenarios
         pr_doc = self.context.projectrun
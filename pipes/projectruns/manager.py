@@ -5,9 +5,13 @@ from datetime import datetime
 
 from pymongo.errors import DuplicateKeyError
 
+from pipes.common.contexts import context_cache
 from pipes.common.exceptions import DocumentAlreadyExists, DocumentDoesNotExist
+from pipes.common.serialization import construct_read
 from pipes.db.manager import AbstractObjectManager
 from pipes.common.constants import NodeLabel
+from pipes.jobs.manager import JobManager, job_runner
+from pipes.jobs.schemas import JobDocument
 from pipes.projects.contexts import (
     ProjectDocumentContext,
     ProjectSimpleContext,
@@ -58,7 +62,7 @@ class ProjectRunManager(AbstractObjectManager):
         pr_name = pr_create.name
         p_doc = self.context.project
 
-        pr_doc_exists = await self.d.find_one(
+        pr_doc_exists = await self.d.exists(
             collection=ProjectRunDocument,
             query={"context.project": p_doc.id, "name": pr_name},
         )
@@ -117,22 +121,23 @@ class ProjectRunManager(AbstractObjectManager):
         if not read_docs:
             return pr_docs
 
-        pr_reads = []
-        for pr_doc in pr_docs:
-            data = pr_doc.model_dump()
-            data["context"] = ProjectSimpleContext(project=p_doc.name)
-            pr_reads.append(ProjectRunRead.model_validate(data))
+        context = ProjectSimpleContext(project=p_doc.name)
+        pr_reads = [
+            construct_read(ProjectRunRead, pr_doc, context=context)
+            for pr_doc in pr_docs
+        ]
         return pr_reads
 
     async def read_projectrun(self, pr_doc: ProjectRunDocument) -> ProjectRunRead:
         """Convert ProjectRunDocument to ProjectRunRead instance"""
-        p_id = pr_doc.context.project
-        p_doc = await self.d.get(collection=ProjectDocument, id=p_id)
-
-        data = pr_doc.model_dump()
-        data["context"] = ProjectSimpleContext(project=p_doc.name)
-        pr_read = ProjectRunRead.model_validate(data)
-
+        pr_read = await self.assemble(
+            ProjectRunRead,
+            pr_doc,
+            context=self.assemble(
+                ProjectSimpleContext,
+                project=self.get_name(ProjectDocument, pr_doc.context.project),
+            ),
+        )
         return pr_read
 
     async def get_projectrun(self, name: str) -> ProjectRunDocument:
@@ -150,21 +155,23 @@ class ProjectRunManager(AbstractObjectManager):
 
         return pr_doc
 
-    async def delete_projectrun(self, name: str) -> None:
-        """Delete a project run by name"""
+    async def delete_projectrun(
+        self,
+        pr_doc: ProjectRunDocument,
+        user: UserDocument,
+    ) -> JobDocument:
+        """Delete the project run and the documents under it in a background job"""
         p_doc = self.context.project
-
-        # Delete the project run document
-        await self.d.delete_one(
-            collection=ProjectRunDocument,
-            query={"context.project": p_doc.id, "name": name},
-        )
+        job = await JobManager().create_delete_projectrun_job(p_doc, pr_doc, user)
+        job_runner.start(job.id)
 
         logger.info(
-            "Project run '%s' of project '%s' deleted successfully",
-            name,
+            "Project run '%s' of project '%s' deletion started in job '%s'",
+            pr_doc.name,
             p_doc.name,
+            job.id,
         )
+        return job
 
     async def update_projectrun(
         self,
@@ -191,6 +198,7 @@ class ProjectRunManager(AbstractObjectManager):
             find={"context.project": pr_doc.context.project, "name": name},
             update={"$set": update_data},
         )
+        await context_cache.invalidate()
 
         # Get the updated document
         updated_pr_doc = await self.get_projectrun(name)
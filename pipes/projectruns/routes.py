@@ -4,6 +4,7 @@ import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
+from pipes.common.serialization import json_response
 from pipes.common.exceptions import (
     ContextValidationError,
     UserPermissionDenied,
@@ -11,6 +12,7 @@ from pipes.common.exceptions import (
     DomainValidationError,
     DocumentDoesNotExist,
 )
+from pipes.jobs.schemas import JobRead
 from pipes.projects.contexts import ProjectSimpleContext
 from pipes.projects.validators import ProjectContextValidator
 from pipes.projectruns.schemas import ProjectRunCreate, ProjectRunRead, ProjectRunUpdate
@@ -19,7 +21,6 @@ from pipes.projectruns.contexts import ProjectRunSimpleContext
 from pipes.projectruns.validators import ProjectRunContextValidator
 from pipes.users.auth import auth_required
 from pipes.users.schemas import UserDocument
-from pipes.models.manager import ModelManager
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -59,7 +60,7 @@ async def create_projectrun(
 
     pr_read = await manager.read_projectrun(pr_doc)
 
-    return pr_read
+    return json_response(pr_read, ProjectRunRead, status_code=201)
 
 
 @router.get("/projectruns", response_model=list[ProjectRunRead] | ProjectRunRead)
@@ -92,7 +93,7 @@ async def get_projectruns(
         try:
             pr_doc = await manager.get_projectrun(projectrun)
             pr_read = await manager.read_projectrun(pr_doc)
-            return pr_read
+            return json_response(pr_read, ProjectRunRead)
         except DocumentDoesNotExist as e:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -100,16 +101,16 @@ async def get_projectruns(
             )
     else:
         pr_docs = await manager.get_projectruns()
-        return pr_docs
+        return json_response(pr_docs, list[ProjectRunRead])
 
 
-@router.delete("/projectruns", status_code=204)
+@router.delete("/projectruns", status_code=202, response_model=JobRead)
 async def delete_projectrun(
     project: str,
     projectrun: str,
     user: UserDocument = Depends(auth_required),
 ):
-    """Delete project run if it doesn't have any models under it"""
+    """Delete project run, with the documents under it in background"""
     context = ProjectRunSimpleContext(project=project, projectrun=projectrun)
 
     try:
@@ -130,25 +131,14 @@ async def delete_projectrun(
 
     try:
         try:
-            await manager.get_projectrun(projectrun)
+            pr_doc = await manager.get_projectrun(projectrun)
         except DocumentDoesNotExist:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Project run '{projectrun}' not found",
             )
 
-        # Check if there are models under this project run
-        model_manager = ModelManager(context=validated_context)
-        models = await model_manager.get_models()
-
-        if models:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Cannot delete project run '{projectrun}' because it has models associated with it",
-            )
-
-        # Delete the project run
-        await manager.delete_projectrun(projectrun)
+        job = await manager.delete_projectrun(pr_doc, user)
     except HTTPException:
         raise
     except Exception as e:
@@ -157,7 +147,7 @@ async def delete_projectrun(
             detail=str(e),
         )
 
-    return None
+    return job.read()
 
 
 @router.put("/projectruns", response_model=ProjectRunRead)
@@ -200,4 +190,4 @@ async def update_projectrun(
 
     pr_read = await manager.read_projectrun(pr_doc)
 
-    return pr_read
+    return json_response(pr_read, ProjectRunRead)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from beanie import Document
+
 from pipes.common.exceptions import (
     ContextValidationError,
     DomainValidationError,
 )
 from pipes.common.validators import DomainValidator
-from pipes.db.document import DocumentDB
 from pipes.projects.contexts import ProjectDocumentContext
 from pipes.projects.validators import ProjectContextValidator
 from pipes.projectruns.contexts import (
@@ -18,36 +19,31 @@ from pipes.projectruns.schemas import ProjectRunCreate, ProjectRunDocument
 class ProjectRunContextValidator(ProjectContextValidator):
     """Project run context validator class"""
 
-    async def validate_document(
+    context_levels = ProjectContextValidator.context_levels + [
+        ("projectrun", ProjectRunDocument),
+    ]
+
+    def build_context(
         self,
         context: ProjectRunSimpleContext,
+        docs: dict[str, Document | None],
     ) -> ProjectRunDocumentContext:
-        """Get project run document through validation"""
-        p_context = await super().validate_document(context)
+        """Validate project run document of resolved documents"""
+        p_context = super().build_context(context, docs)
         p_doc = p_context.project
 
         pr_name = context.projectrun
-        docdb = DocumentDB()
-        pr_doc = await docdb.find_one(
-            collection=ProjectRunDocument,
-            query={
-                "context": {"project": p_doc.id},
-                "name": pr_name,
-            },
-        )
+        pr_doc = docs["projectrun"]
 
         if not pr_doc:
             raise ContextValidationError(
                 f"Invalid context, project run '{pr_name}' does not exist in project '{p_doc.name}'.",
             )
 
-        validated_context = ProjectRunDocumentContext(
+        return ProjectRunDocumentContext(
             project=p_doc,
             projectrun=pr_doc,
         )
-        self._validated_context = validated_context
-
-        return validated_context
 
 
 class ProjectRunDomainValidator(DomainValidator):
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+
+from pipes.db.manager import AbstractObjectManager
+from pipes.projects.schemas import ProjectAccessProjection, ProjectDocument
+from pipes.teams.schemas import TeamDocument, TeamMembersProjection
+
+logger = logging.getLogger(__name__)
+
+
+def get_project_access(
+    p_doc: ProjectAccessProjection | ProjectDocument,
+    t_docs: list[TeamMembersProjection | TeamDocument],
+) -> list[PydanticObjectId]:
+    """Users with access to the project: creator, owner, leads and team members"""
+    user_ids = {p_doc.created_by, p_doc.owner, *p_doc.leads}
+    for t_doc in t_docs:
+        user_ids.update(t_doc.members)
+    return sorted(user_ids)
+
+
+class ProjectAccessManager(AbstractObjectManager):
+    """Maintain the `access` field of projects, a per-user project access index.
+
+    The field is recomputed from the project and its teams whenever the owner,
+    leads or teams of the project change, so listing the projects of a user is
+    one indexed query on `access`.
+    """
+
+    async def update_access(self, p_id: PydanticObjectId) -> list[PydanticObjectId]:
+        """Recompute the access of the project"""
+        p_doc = await self.d.find_one(
+            collection=ProjectDocument,
+            query={"_id": p_id},
+            projection=ProjectAccessProjection,
+        )
+        if not p_doc:
+            return []
+
+        t_docs = await self.d.find_all(
+            collection=TeamDocument,
+            query={"context.project": p_id},
+            projection=TeamMembersProjection,
+        )
+        access = get_project_access(p_doc, t_docs)
+
+        motor_collection = ProjectDocument.get_motor_collection()
+        await motor_collection.update_one({"_id": p_id}, {"$set": {"access": access}})
+        return access
+
+    async def rebuild_access(self, missing_only: bool = False) -> int:
+        """Recompute the access of all projects, or of those without access yet"""
+        team_members = defaultdict(list)
+        async for t_doc in self.d.iter_all(
+            collection=TeamDocument,
+            projection=TeamMembersProjection,
+        ):
+            team_members[t_doc.context.project].append(t_doc)
+
+        query = {"access": {"$exists": False}} if missing_only else {}
+        updates = []
+        async for p_doc in self.d.iter_all(
+            collection=ProjectDocument,
+            query=query,
+            projection=ProjectAccessProjection,
+        ):
+            access = get_project_access(p_doc, team_members[p_doc.id])
+            updates.append(UpdateOne({"_id": p_doc.id}, {"$set": {"access": access}}))
+
+        if updates:
+            motor_collection = ProjectDocument.get_motor_collection()
+            await motor_collection.bulk_write(updates, ordered=False)
+            logger.info("Project access rebuilt for %s projects", len(updates))
+
+        return len(updates)
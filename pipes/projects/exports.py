@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, AsyncIterator
+
+from beanie import Document
+
+from pipes.config.settings import settings
+from pipes.datasets.schemas import DatasetDocument
+from pipes.db.manager import AbstractObjectManager
+from pipes.handoffs.schemas import HandoffDocument
+from pipes.models.schemas import ModelDocument
+from pipes.modelruns.schemas import ModelRunDocument
+from pipes.projects.schemas import ProjectDocument
+from pipes.projectruns.schemas import ProjectRunDocument
+from pipes.tasks.schemas import TaskDocument
+from pipes.teams.schemas import TeamDocument
+from pipes.users.schemas import UserDocument
+
+logger = logging.getLogger(__name__)
+
+# Collections of the project graph, in export order, referenced ones first
+EXPORT_COLLECTIONS: list[type[Document]] = [
+    TeamDocument,
+    ProjectRunDocument,
+    ModelDocument,
+    ModelRunDocument,
+    HandoffDocument,
+    DatasetDocument,
+    TaskDocument,
+]
+
+# Collections whose names are kept for the whole export, few documents each
+NAMED_COLLECTIONS = {"teams", "projectruns", "models", "modelruns"}
+
+# Collections of the documents referenced by context levels
+CONTEXT_REFERENCES = {
+    "project": "projects",
+    "projectrun": "projectruns",
+    "model": "models",
+    "modelrun": "modelruns",
+}
+
+# Fields referencing other documents, by the collection of the referenced ones
+REFERENCES: dict[str, dict[str, str]] = {
+    "projects": {"owner": "users", "leads": "users"},
+    "teams": {"members": "users"},
+    "models": {"modeling_team": "teams"},
+    "handoffs": {
+        "from_model": "models",
+        "to_model": "models",
+        "from_modelrun": "modelruns",
+    },
+    "datasets": {"registration_author": "users"},
+    "tasks": {
+        "assignee": "users",
+        "input_datasets": "datasets",
+        "output_datasets": "datasets",
+    },
+}
+AUDIT_REFERENCES = {"created_by": "users", "modified_by": "users"}
+
+# Internal fields, derived from other documents or kept by the ODM
+EXCLUDED_FIELDS = {"_id", "revision_id", "access", "teams"}
+
+
+class ProjectExportManager(AbstractObjectManager):
+    """Export the whole graph of a project as a stream of records.
+
+    Each collection is read with one cursor over `context.project`, and the
+    object ids are replaced by names, or emails for users. The names of the
+    teams, project runs, models and model runs are kept in memory once per
+    export, the ones of users are fetched per chunk and kept too, while
+    datasets are resolved per chunk and dropped, so memory stays flat with
+    the number of datasets and tasks.
+    """
+
+    def __init__(self, p_doc: ProjectDocument, chunk_size: int | None = None) -> None:
+        self.p_doc = p_doc
+        self.chunk_size = chunk_size or settings.PIPES_STREAM_CHUNK_SIZE
+        self.names: dict[str, dict] = {
+            "projects": {p_doc.id: p_doc.name},
+            "teams": {},
+            "projectruns": {},
+            "models": {},
+            "modelruns": {},
+            "datasets": {},
+            "users": {},
+        }
+
+    async def iter_records(self) -> AsyncIterator[dict]:
+        """Stream the records of the project graph, the project first"""
+        p_raw = self.p_doc.model_dump(by_alias=True)
+        await self._resolve_chunk("projects", [p_raw])
+        yield self.export_record("projects", p_raw)
+
+        for collection in EXPORT_COLLECTIONS:
+            c_name = collection.Settings.name
+            count = 0
+            async for chunk in self._iter_chunks(collection):
+                await self._resolve_chunk(c_name, chunk)
+                for raw in chunk:
+                    yield self.export_record(c_name, raw)
+                    if c_name in NAMED_COLLECTIONS:
+                        self.names[c_name][raw["_id"]] = raw["name"]
+                count += len(chunk)
+            logger.debug(
+                "Exported %s %s of project '%s'", count, c_name, self.p_doc.name
+            )
+
+    def export_record(self, c_name: str, raw: dict) -> dict:
+        """Record of the raw document, with object ids resolved to names"""
+        document = {
+            field: value for field, value in raw.items() if field not in EXCLUDED_FIELDS
+        }
+        if "context" in document:
+            document["context"] = {
+                level: self._resolve(CONTEXT_REFERENCES[level], value)
+                for level, value in document["context"].items()
+            }
+        for field, ref_name in self._get_references(c_name).items():
+            if field in document:
+                document[field] = self._resolve(ref_name, document[field])
+
+        return {"collection": c_name, "document": document}
+
+    def _get_references(self, c_name: str) -> dict[str, str]:
+        return {**REFERENCES.get(c_name, {}), **AUDIT_REFERENCES}
+
+    def _resolve(self, ref_name: str, value: Any) -> Any:
+        """Name of referenced document, or the id itself if not found"""
+        names = self.names[ref_name]
+        if isinstance(value, list):
+            return [names.get(v, v) for v in value]
+        return names.get(value, value)
+
+    async def _iter_chunks(
+        self, collection: type[Document]
+    ) -> AsyncIterator[list[dict]]:
+        """Raw documents of the project in the collection, chunk by chunk"""
+        chunk = []
+        async for raw in self.d.iter_raw(
+            collection=collection,
+            query={"context.project": self.p_doc.id},
+            batch_size=self.chunk_size,
+        ):
+            chunk.append(raw)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    async def _resolve_chunk(self, c_name: str, chunk: list[dict]) -> None:
+        """Fetch the user emails and dataset names referenced by the chunk"""
+        ids: dict[str, set] = {"users": set(), "datasets": set()}
+        for field, ref_name in self._get_references(c_name).items():
+            if ref_name not in ids:
+                continue
+            for raw in chunk:
+                value = raw.get(field)
+                ids[ref_name].update(value if isinstance(value, list) else [value])
+
+        # Dataset names are only kept for the chunk
+        self.names["datasets"] = {}
+        lookups = [
+            ("users", UserDocument, "email"),
+            ("datasets", DatasetDocument, "name"),
+        ]
+        for ref_name, collection, field in lookups:
+            missing = ids[ref_name] - self.names[ref_name].keys() - {None}
+            if not missing:
+                continue
+            async for raw in self.d.iter_raw(
+                collection=collection,
+                query={"_id": {"$in": list(missing)}},
+                projection={field: 1},
+            ):
+                self.names[ref_name][raw["_id"]] = raw[field]
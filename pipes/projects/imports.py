@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from beanie import Document, PydanticObjectId
+from pydantic import BaseModel
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from pipes.common.exceptions import (
+    DocumentAlreadyExists,
+    DomainValidationError,
+    ImportValidationError,
+)
+from pipes.common.utilities import parse_organization
+from pipes.common.validators import DomainValidator
+from pipes.db.manager import AbstractObjectManager
+from pipes.handoffs.schemas import HandoffDocument
+from pipes.handoffs.validators import HandoffDomainValidator
+from pipes.models.schemas import ModelDocument
+from pipes.models.validators import ModelDomainValidator
+from pipes.modelruns.schemas import ModelRunDocument
+from pipes.projects.access import get_project_access
+from pipes.projects.contexts import ProjectDocumentContext
+from pipes.projects.schemas import (
+    ProjectDocument,
+    ProjectImport,
+    ProjectImportError,
+    ProjectImportRead,
+    ProjectRunImport,
+)
+from pipes.projects.validators import ProjectDomainValidator
+from pipes.projectruns.contexts import (
+    ProjectRunDocumentContext,
+    ProjectRunObjectContext,
+)
+from pipes.projectruns.schemas import ProjectRunDocument
+from pipes.projectruns.validators import ProjectRunDomainValidator
+from pipes.teams.schemas import TeamDocument
+from pipes.users.schemas import UserCreate, UserDocument
+
+logger = logging.getLogger(__name__)
+
+
+class ImportModelDomainValidator(ModelDomainValidator):
+    """Model domain validator against the models of the import payload"""
+
+    def __init__(
+        self,
+        context: ProjectRunDocumentContext,
+        m_doc: ModelDocument,
+        m_scenarios: dict[str, str],
+    ) -> None:
+        super().__init__(context)
+        self.m_doc = m_doc
+        self.m_scenarios = m_scenarios
+
+    async def find_duplicate_scenario(self) -> tuple[str, str] | None:
+        """Model scenario of the new model defined already, and the model owning it"""
+        m_scenario_pool = set()
+        for scenario_mapping in self.m_doc.scenario_mappings:
+            m_scenario = scenario_mapping.model_scenario
+            if m_scenario in self.m_scenarios:
+                return m_scenario, self.m_scenarios[m_scenario]
+            if m_scenario in m_scenario_pool:
+                return m_scenario, self.m_doc.name
+            m_scenario_pool.add(m_scenario)
+        return None
+
+
+class ImportHandoffDomainValidator(HandoffDomainValidator):
+    """Handoff domain validator against the models of the import payload"""
+
+    def __init__(
+        self,
+        context: ProjectRunDocumentContext,
+        m_docs: dict[str, ModelDocument],
+    ) -> None:
+        super().__init__(context)
+        self.m_docs = m_docs
+
+    async def find_model(self, name: str) -> ModelDocument | None:
+        return self.m_docs.get(name)
+
+    async def find_modelrun(
+        self,
+        m_doc: ModelDocument,
+        name: str,
+    ) -> ModelRunDocument | None:
+        # Model runs are not part of project imports
+        return None
+
+
+class ProjectImportManager(AbstractObjectManager):
+    """Import a whole project tree, all or nothing.
+
+    The project, teams, project runs, models and handoffs of the payload are
+    built and validated in memory with the domain validators, the users are
+    resolved in one query, then each collection is written with one insert,
+    all in one transaction. No document is written if any item is invalid, or
+    if any insert fails.
+    """
+
+    def __init__(self) -> None:
+        self.errors: list[ProjectImportError] = []
+        self.u_docs: dict[str, UserDocument] = {}
+        self.new_u_docs: list[UserDocument] = []
+
+    async def import_project(
+        self,
+        p_import: ProjectImport,
+        user: UserDocument,
+    ) -> ProjectImportRead:
+        """Validate the project tree and create all of its documents"""
+        self.errors = []
+
+        p_exists = await self.d.exists(
+            collection=ProjectDocument,
+            query={"name": p_import.name},
+        )
+        if p_exists:
+            self.add_error("project", f"Project '{p_import.name}' already exists.")
+
+        await self._resolve_users(p_import)
+
+        # Build and validate documents in memory
+        p_doc = await self._build_project(p_import, user)
+        t_docs = self._build_teams(p_import, p_doc)
+        p_doc.teams = [t_doc.id for t_doc in t_docs]
+        p_doc.access = get_project_access(p_doc, t_docs)
+
+        pr_docs, m_docs, h_docs = [], [], []
+        for i, pr_import in enumerate(p_import.projectruns):
+            path = f"projectruns[{i}]"
+            if pr_import.name in {pr_doc.name for pr_doc in pr_docs}:
+                self.add_error(path, f"Duplicate project run '{pr_import.name}'.")
+
+            pr_doc = await self._build_projectrun(pr_import, p_doc, user, path)
+            pr_docs.append(pr_doc)
+
+            context = ProjectRunDocumentContext(project=p_doc, projectrun=pr_doc)
+            pr_m_docs = await self._build_models(pr_import, context, t_docs, user, path)
+            pr_h_docs = await self._build_handoffs(
+                pr_import,
+                context,
+                pr_m_docs,
+                user,
+                path,
+            )
+            m_docs.extend(pr_m_docs)
+            h_docs.extend(pr_h_docs)
+
+        if self.errors:
+            raise ImportValidationError(self.errors)
+
+        # Write documents, collection by collection
+        batches = [
+            (UserDocument, self.new_u_docs),
+            (ProjectDocument, [p_doc]),
+            (TeamDocument, t_docs),
+            (ProjectRunDocument, pr_docs),
+            (ModelDocument, m_docs),
+            (HandoffDocument, h_docs),
+        ]
+        try:
+            await self._insert_documents(batches)
+        except (BulkWriteError, DuplicateKeyError):
+            raise DocumentAlreadyExists(
+                f"Project '{p_import.name}' or some of its documents already exist.",
+            )
+
+        logger.info("Project '%s' imported successfully", p_doc.name)
+        return ProjectImportRead(
+            project=p_doc.name,
+            created={
+                collection.Settings.name: len(docs) for collection, docs in batches
+            },
+        )
+
+    def add_error(self, path: str, message: str) -> None:
+        self.errors.append(ProjectImportError(path=path, message=message))
+
+    async def _validate(
+        self,
+        validator: DomainValidator,
+        instance: BaseModel,
+        path: str,
+    ) -> bool:
+        """Run domain validator, record the error of the item instead of raising"""
+        try:
+            await validator.validate(instance)
+        except DomainValidationError as e:
+            self.add_error(path, str(e))
+            return False
+        return True
+
+    async def _resolve_users(self, p_import: ProjectImport) -> None:
+        """Find the users of the payload by email in one query, build missing ones"""
+        u_creates: dict[str, UserCreate] = {}
+        for u_create in [p_import.owner, *p_import.leads]:
+            u_creates.setdefault(u_create.email, u_create)
+        for t_create in p_import.teams:
+            for u_create in t_create.members:
+                u_creates.setdefault(u_create.email, u_create)
+
+        u_docs = await self.d.find_all(
+            collection=UserDocument,
+            query={"email": {"$in": list(u_creates)}},
+        )
+        self.u_docs = {u_doc.email: u_doc for u_doc in u_docs}
+
+        self.new_u_docs = []
+        for email, u_create in u_creates.items():
+            if email in self.u_docs:
+                continue
+
+            u_doc = UserDocument(
+                id=PydanticObjectId(),
+                email=u_create.email,
+                first_name=u_create.first_name,
+                last_name=u_create.last_name,
+                organization=u_create.organization or parse_organization(email),
+                created_at=datetime.now(),
+            )
+            self.u_docs[email] = u_doc
+            self.new_u_docs.append(u_doc)
+
+    async def _build_project(
+        self,
+        p_import: ProjectImport,
+        user: UserDocument,
+    ) -> ProjectDocument:
+        await self._validate(ProjectDomainValidator(), p_import, "project")
+
+        return ProjectDocument(
+            id=PydanticObjectId(),
+            # project information
+            name=p_import.name,
+            title=p_import.title,
+            description=p_import.description,
+            assumptions=p_import.assumptions,
+            requirements=p_import.requirements,
+            scenarios=p_import.scenarios,
+            sensitivities=p_import.sensitivities,
+            milestones=p_import.milestones,
+            scheduled_start=p_import.scheduled_start,
+            scheduled_end=p_import.scheduled_end,
+            owner=self.u_docs[p_import.owner.email].id,
+            leads=[self.u_docs[u_create.email].id for u_create in p_import.leads],
+            # document information
+            created_at=datetime.now(),
+            created_by=user.id,
+            last_modified=datetime.now(),
+            modified_by=user.id,
+        )
+
+    def _build_teams(
+        self,
+        p_import: ProjectImport,
+        p_doc: ProjectDocument,
+    ) -> list[TeamDocument]:
+        t_docs = []
+        for i, t_create in enumerate(p_import.teams):
+            if t_create.name in {t_doc.name for t_doc in t_docs}:
+                self.add_error(f"teams[{i}]", f"Duplicate team '{t_create.name}'.")
+
+            member_ids = {
+                self.u_docs[u_create.email].id for u_create in t_create.members
+            }
+            t_doc = TeamDocument(
+                id=PydanticObjectId(),
+                context={"project": p_doc.id},
+                name=t_create.name,
+                description=t_create.description,
+                members=list(member_ids),
+            )
+            t_docs.append(t_doc)
+        return t_docs
+
+    async def _build_projectrun(
+        self,
+        pr_import: ProjectRunImport,
+        p_doc: ProjectDocument,
+        user: UserDocument,
+        path: str,
+    ) -> ProjectRunDocument:
+        domain_validator = ProjectRunDomainValidator(
+            ProjectDocumentContext(project=p_doc),
+        )
+        await self._validate(domain_validator, pr_import, path)
+
+        return ProjectRunDocument(
+            id=PydanticObjectId(),
+            context={"project": p_doc.id},
+            # project run information
+            name=pr_import.name,
+            description=pr_import.description,
+            assumptions=pr_import.assumptions,
+            requirements=pr_import.requirements,
+            scenarios=pr_import.scenarios,
+            scheduled_start=pr_import.scheduled_start,
+            scheduled_end=pr_import.scheduled_end,
+            # document information
+            created_at=datetime.now(),
+            created_by=user.id,
+            last_modified=datetime.now(),
+            modified_by=user.id,
+        )
+
+    async def _build_models(
+        self,
+        pr_import: ProjectRunImport,
+        context: ProjectRunDocumentContext,
+        t_docs: list[TeamDocument],
+        user: UserDocument,
+        pr_path: str,
+    ) -> list[ModelDocument]:
+        p_doc, pr_doc = context.project, context.projectrun
+        o_context = ProjectRunObjectContext(project=p_doc.id, projectrun=pr_doc.id)
+        t_ids = {t_doc.name: t_doc.id for t_doc in t_docs}
+
+        m_docs: list[ModelDocument] = []
+        m_scenarios: dict[str, str] = {}
+        for i, m_create in enumerate(pr_import.models):
+            path = f"{pr_path}.models[{i}]"
+            if m_create.name in {m_doc.name for m_doc in m_docs}:
+                self.add_error(path, f"Duplicate model '{m_create.name}'.")
+
+            t_id = t_ids.get(m_create.modeling_team)
+            if t_id is None:
+                self.add_error(
+                    path,
+                    f"Modeling team '{m_create.modeling_team}' does not exist "
+                    f"in teams of project '{p_doc.name}'.",
+                )
+                continue
+
+            m_doc = ModelDocument(
+                id=PydanticObjectId(),
+                context=o_context,
+                # model information
+                name=m_create.name,
+                display_name=m_create.display_name,
+                type=m_create.type,
+                description=m_create.description,
+                modeling_team=t_id,
+                assumptions=m_create.assumptions,
+                requirements=m_create.requirements,
+                scheduled_start=m_create.scheduled_start,
+                scheduled_end=m_create.scheduled_end,
+                expected_scenarios=m_create.expected_scenarios,
+                scenario_mappings=m_create.scenario_mappings,
+                other=m_create.other,
+                # document information
+                created_at=datetime.now(),
+                created_by=user.id,
+                last_modified=datetime.now(),
+                modified_by=user.id,
+            )
+
+            # Scenario mappings are unique across the models of the project run,
+            # owned by the first model defining them
+            domain_validator = ImportModelDomainValidator(context, m_doc, m_scenarios)
+            await self._validate(domain_validator, m_create, path)
+            for scenario_mapping in m_doc.scenario_mappings:
+                m_scenarios.setdefault(scenario_mapping.model_scenario, m_doc.name)
+            m_docs.append(m_doc)
+
+        return m_docs
+
+    async def _build_handoffs(
+        self,
+        pr_import: ProjectRunImport,
+        context: ProjectRunDocumentContext,
+        m_docs: list[ModelDocument],
+        user: UserDocument,
+        pr_path: str,
+    ) -> list[HandoffDocument]:
+        p_doc, pr_doc = context.project, context.projectrun
+        o_context = ProjectRunObjectContext(project=p_doc.id, projectrun=pr_doc.id)
+        m_docs_by_name = {m_doc.name: m_doc for m_doc in m_docs}
+
+        h_docs: list[HandoffDocument] = []
+        for i, h_create in enumerate(pr_import.handoffs):
+            path = f"{pr_path}.handoffs[{i}]"
+            if h_create.name in {h_doc.name for h_doc in h_docs}:
+                self.add_error(path, f"Duplicate handoff '{h_create.name}'.")
+
+            domain_validator = ImportHandoffDomainValidator(context, m_docs_by_name)
+            if not await self._validate(domain_validator, h_create, path):
+                continue
+
+            h_doc = HandoffDocument(
+                id=PydanticObjectId(),
+                context=o_context,
+                from_model=domain_validator.from_model_doc.id,  # type: ignore
+                to_model=domain_validator.to_model_doc.id,  # type: ignore
+                from_modelrun=None,
+                name=h_create.name,
+                description=h_create.description,
+                scheduled_start=h_create.scheduled_start,
+                scheduled_end=h_create.scheduled_end,
+                submission_date=h_create.submission_date,
+                notes=h_create.notes,
+                # document information
+                created_at=datetime.now(),
+                created_by=user.id,
+                last_modified=datetime.now(),
+                modified_by=user.id,
+            )
+            h_docs.append(h_doc)
+
+        return h_docs
+
+    async def _insert_documents(
+        self,
+        batches: list[tuple[type[Document], list[Document]]],
+    ) -> None:
+        """Insert the documents of each collection in one transaction"""
+        async with self.d.transaction() as session:
+            if session is None:
+                await self._insert_documents_or_delete(batches)
+                return
+
+            for collection, docs in batches:
+                await self.d.insert_many(collection, docs, session=session)
+
+    async def _insert_documents_or_delete(
+        self,
+        batches: list[tuple[type[Document], list[Document]]],
+    ) -> None:
+        """Without transactions, delete the inserted documents if any insert fails"""
+        inserted: list[tuple[type[Document], list[Document]]] = []
+        try:
+            for collection, docs in batches:
+                inserted.append((collection, docs))
+                await self.d.insert_many(collection, docs)
+        except Exception:
+            # Partially inserted batches included, documents ids were assigned here
+            for collection, docs in reversed(inserted):
+                await self.d.delete_many(
+                    collection=collection,
+                    query={"_id": {"$in": [doc.id for doc in docs]}},
+                )
+            raise
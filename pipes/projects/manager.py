@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
-from itertools import chain
+from typing import AsyncIterator
 
+from beanie import PydanticObjectId
 from pymongo.errors import DuplicateKeyError
+from pipes.common.contexts import context_cache
 from pipes.common.exceptions import DocumentAlreadyExists, DocumentDoesNotExist
+from pipes.common.streaming import read_chunks
 from pipes.db.manager import AbstractObjectManager
+from pipes.db.pagination import Page, PageParams
 from pipes.common.constants import NodeLabel
-from pipes.projects.contexts import ProjectDocumentContext
+from pipes.jobs.manager import JobManager, job_runner
+from pipes.jobs.schemas import JobDocument
+from pipes.projects.access import ProjectAccessManager, get_project_access
 from pipes.projects.schemas import (
+    ProjectBasicProjection,
+    ProjectBasicRead,
     ProjectCreate,
     ProjectDetailRead,
     ProjectDocument,
@@ -19,8 +28,7 @@ from pipes.projects.validators import (
     ProjectDomainValidator,
     ProjectUpdateDomainValidator,
 )
-from pipes.projectruns.manager import ProjectRunManager
-from pipes.teams.schemas import TeamDocument, TeamBasicRead
+from pipes.teams.schemas import TeamBasicRead, TeamDocument
 from pipes.users.manager import UserManager
 from pipes.users.schemas import UserCreate, UserDocument, UserRead
 
@@ -89,6 +97,7 @@ class ProjectManager(AbstractObjectManager):
             last_modified=datetime.now(),
             modified_by=user.id,
         )
+        p_doc.access = get_project_access(p_doc, [])
 
         try:
             await p_doc.insert()
@@ -98,104 +107,93 @@ class ProjectManager(AbstractObjectManager):
         logger.info("New project '%s' created successfully", p_create.name)
         return p_doc
 
-    async def get_basic_projects(self, user: UserDocument) -> list[ProjectDocument]:
-        """Get all projects of current user, basic information only."""
+    def _get_basic_projects_query(self, user: UserDocument) -> dict:
+        """Query of the projects accessible by current user"""
         if user and user.is_superuser:
-            available_p_docs = await self.d.find_all(collection=ProjectDocument)
-        else:
-            # project created by current user
-            p1_docs = await self.d.find_all(
-                collection=ProjectDocument,
-                query={"created_by": {"$eq": user.id}},
-            )
-
-            # project owner is current user
-            p2_docs = await self.d.find_all(
-                collection=ProjectDocument,
-                query={"owner": {"$eq": user.id}},
-            )
+            return {}
+
+        query = {
+            "$or": [
+                # project created, owned or led by current user, or project team
+                # containing current user, see ProjectAccessManager
+                {"access": user.id},
+                # TODO: A hardcoded for all PIPES users accessing the test project.
+                {"name": {"$in": ["test1", "pipes101"]}},
+            ],
+        }
+        return query
 
-            # project leads containing current user
-            p3_docs = await self.d.find_all(
-                collection=ProjectDocument,
-                query={"leads": user.id},
-            )
+    async def get_basic_projects(
+        self,
+        user: UserDocument,
+        page: PageParams | None = None,
+    ) -> Page[ProjectBasicRead]:
+        """Get all projects of current user, basic information only."""
+        p_page = await self.d.find_page(
+            collection=ProjectDocument,
+            query=self._get_basic_projects_query(user),
+            page=page,
+            projection=ProjectBasicProjection,
+        )
 
-            # project team containing current user
-            u_team_docs = await self.d.find_all(
-                collection=TeamDocument,
-                query={"members": user.id},
-            )
-            p_ids = [t_doc.context.project for t_doc in u_team_docs]
-            p4_docs = await self.d.find_all(
-                collection=ProjectDocument,
-                query={"_id": {"$in": p_ids}},
-            )
+        # Read concurrently, so the loader batches the owners of all projects
+        p_reads = await asyncio.gather(
+            *[self.read_project_basic(p_doc) for p_doc in p_page.data],
+        )
+        return Page(data=p_reads, next_cursor=p_page.next_cursor)
 
-            # TODO: A hardcoded for all PIPES users accessing the test project.
-            p5_docs = await self.d.find_all(
-                collection=ProjectDocument,
-                query={"name": {"$in": ["test1", "pipes101"]}},
-            )
+    async def iter_basic_projects(
+        self,
+        user: UserDocument,
+    ) -> AsyncIterator[ProjectBasicRead]:
+        """Stream all projects of current user, basic information only."""
+        p_docs = self.d.iter_all(
+            collection=ProjectDocument,
+            query=self._get_basic_projects_query(user),
+            projection=ProjectBasicProjection,
+        )
+        async for p_read in read_chunks(p_docs, self.read_project_basic, self.loader):
+            yield p_read
 
-            available_p_docs = chain(p1_docs, p2_docs, p3_docs, p4_docs, p5_docs)
-
-        # return projects
-        p_docs = {}
-        for p_doc in available_p_docs:
-            if p_doc.id in p_docs:
-                continue
-            p_docs[p_doc.id] = p_doc
-            owner_id = p_doc.owner
-            owner_doc = await UserDocument.get(owner_id)
-            owner_read = UserRead.model_validate(owner_doc.model_dump())
-            p_doc.owner = owner_read
-        result = list(p_docs.values())
-        return result
+    async def read_project_basic(
+        self,
+        p_doc: ProjectBasicProjection,
+    ) -> ProjectBasicRead:
+        """Convert project basic projection into project basic read"""
+        owner_doc = await self.loader.get(UserDocument, p_doc.owner)
+        p_read = ProjectBasicRead(
+            name=p_doc.name,
+            title=p_doc.title,
+            description=p_doc.description,
+            owner=owner_doc.read(),
+            milestones=p_doc.milestones,
+            created_at=p_doc.created_at,
+        )
+        return p_read
 
     async def read_project_detail(self, p_doc: ProjectDocument) -> ProjectDetailRead:
-        """Dump project document into dictionary"""
-        # owner
-        owner_id = p_doc.owner
-        owner_doc = await UserDocument.get(owner_id)
-        owner_read = UserRead.model_validate(owner_doc.model_dump())
-
-        # leads
-        lead_docs = await self.d.find_all(
-            collection=UserDocument,
-            query={"_id": {"$in": p_doc.leads}},
-        )
-        lead_reads = []
-        for lead_doc in lead_docs:
-            lead_read = UserRead.model_validate(lead_doc.model_dump())
-            lead_reads.append(lead_read)
-
-        # teams
-        team_docs = await self.d.find_all(
-            collection=TeamDocument,
-            query={"_id": {"$in": p_doc.teams}},
-        )
-        team_reads = []
-        for team_doc in team_docs:
-            team_read = TeamBasicRead(
-                name=team_doc.name,
-                description=team_doc.description,
-            )
-            team_reads.append(team_read)
-
-        # project read
-        p_data = p_doc.model_dump()
-        p_data.update(
-            {
-                "owner": owner_read,
-                "leads": lead_reads,
-                "teams": team_reads,
-            },
+        """Convert project document into project detail read"""
+        p_read = await self.assemble(
+            ProjectDetailRead,
+            p_doc,
+            owner=self._read_user(p_doc.owner),
+            leads=self.d.find_all(
+                collection=UserDocument,
+                query={"_id": {"$in": p_doc.leads}},
+                projection=UserRead,
+            ),
+            teams=self.d.find_all(
+                collection=TeamDocument,
+                query={"_id": {"$in": p_doc.teams}},
+                projection=TeamBasicRead,
+            ),
         )
-        p_read = ProjectDetailRead.model_validate(p_data)
-
         return p_read
 
+    async def _read_user(self, u_id: PydanticObjectId) -> UserRead:
+        u_doc = await self.loader.get(UserDocument, u_id)
+        return u_doc.read()
+
     async def update_project(
         self,
         p_doc: ProjectDocument,
@@ -203,11 +201,9 @@ class ProjectManager(AbstractObjectManager):
         user: UserDocument,
     ) -> ProjectDocument:
         domain_validator = ProjectUpdateDomainValidator()
+        dependency_data = await domain_validator.get_dependency_data(p_doc)
 
-        pr_manager = ProjectRunManager(context=ProjectDocumentContext(project=p_doc))
-        projectrun_docs = await pr_manager.get_projectruns()
-
-        p_update = await domain_validator.project_validate(p_update, projectrun_docs)
+        p_update = await domain_validator.project_validate(p_update, dependency_data)
         p_owner = await self._get_or_create_project_owner(p_update.owner)
 
         other_p_doc_exists = await self.d.exists(
@@ -282,6 +278,9 @@ class ProjectManager(AbstractObjectManager):
             logger.error(f"Failed to update project '{project}': {e}")
             raise
 
+        # Owner and leads grant access to project
+        await ProjectAccessManager().update_access(p_doc.id)
+
         # Get the updated document
         updated_doc = await self.d.find_one(
             collection=ProjectDocument,
@@ -293,22 +292,18 @@ class ProjectManager(AbstractObjectManager):
                 f"Failed to retrieve updated project '{p_update.name}'.",
             )
 
+        await context_cache.invalidate()
+
         return updated_doc
 
-    async def delete_project(self, project: str) -> None:
-        """Delete a project from DocumentDB by name"""
-        try:
-            await self.d.delete_one(
-                collection=ProjectDocument,
-                query={"name": project},
-            )
-            logger.info("Project document '%s' deleted from documentdb", project)
-        except Exception as e:
-            logger.error(
-                "Failed to delete project document from documentdb: %s",
-                str(e),
-            )
-            # Re-raise this error as document deletion is critical
-            raise
+    async def delete_project(
+        self,
+        p_doc: ProjectDocument,
+        user: UserDocument,
+    ) -> JobDocument:
+        """Delete the project and the documents under it in a background job"""
+        job = await JobManager().create_delete_project_job(p_doc, user)
+        job_runner.start(job.id)
 
-        logger.info("Project '%s' deleted successfully", project)
+        logger.info("Project '%s' deletion started in job '%s'", p_doc.name, job.id)
+        return job
@@ -7,15 +7,31 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pipes.common.exceptions import (
     UserPermissionDenied,
     ContextValidationError,
+    DocumentAlreadyExists,
     DocumentDoesNotExist,
     DomainValidationError,
+    ImportValidationError,
 )
+from pipes.common.serialization import json_response
+from pipes.common.streaming import (
+    ndjson_archive_response,
+    ndjson_records_response,
+    ndjson_requested,
+    ndjson_response,
+    ndjson_responses,
+)
+from pipes.db.pagination import Page, PageParams, page_params, page_response
+from pipes.jobs.schemas import JobRead
 from pipes.projects.contexts import ProjectSimpleContext
+from pipes.projects.exports import ProjectExportManager
+from pipes.projects.imports import ProjectImportManager
 from pipes.projects.manager import ProjectManager
 from pipes.projects.schemas import (
     ProjectCreate,
     ProjectBasicRead,
     ProjectDetailRead,
+    ProjectImport,
+    ProjectImportRead,
     ProjectUpdate,
 )
 from pipes.projects.validators import ProjectContextValidator
@@ -26,12 +42,23 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("/projects/basics", response_model=list[ProjectBasicRead])
-async def get_basic_projects(user: UserDocument = Depends(auth_required)):
+@router.get(
+    "/projects/basics",
+    response_model=Page[ProjectBasicRead] | list[ProjectBasicRead],
+    responses=ndjson_responses,
+)
+async def get_basic_projects(
+    user: UserDocument = Depends(auth_required),
+    page: PageParams = Depends(page_params),
+    ndjson: bool = Depends(ndjson_requested),
+):
     """Get all projects with basic information"""
     manager = ProjectManager()
-    p_read_docs = await manager.get_basic_projects(user)
-    return p_read_docs
+    if ndjson:
+        return ndjson_response(manager.iter_basic_projects(user))
+
+    p_page = await manager.get_basic_projects(user, page)
+    return page_response(p_page, page)
 
 
 @router.post("/projects", response_model=ProjectDetailRead, status_code=201)
@@ -52,7 +79,30 @@ async def create_project(
     # Read referenced documents
     p_read = await manager.read_project_detail(p_doc)
 
-    return p_read
+    return json_response(p_read, ProjectDetailRead, status_code=201)
+
+
+@router.post("/projects/import", response_model=ProjectImportRead, status_code=201)
+async def import_project(
+    data: ProjectImport,
+    user: UserDocument = Depends(auth_required),
+):
+    """Import a project with its teams, project runs, models and handoffs, all or nothing"""
+    try:
+        manager = ProjectImportManager()
+        p_import_read = await manager.import_project(data, user)
+    except ImportValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=[error.model_dump() for error in e.errors],
+        )
+    except DocumentAlreadyExists as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    return p_import_read
 
 
 @router.get("/projects", response_model=ProjectDetailRead)
@@ -83,7 +133,37 @@ async def get_project(
     manager = ProjectManager()
     p_read = await manager.read_project_detail(p_doc)
 
-    return p_read
+    return json_response(p_read, ProjectDetailRead)
+
+
+@router.get("/projects/export", responses=ndjson_responses)
+async def export_project(
+    project: str,
+    archive: bool = False,
+    user: UserDocument = Depends(auth_required),
+):
+    """Export project with all of its documents, one record per line, or gzip archive"""
+    context = ProjectSimpleContext(project=project)
+
+    try:
+        validator = ProjectContextValidator()
+        validated_context = await validator.validate(user, context)
+    except ContextValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except UserPermissionDenied as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e),
+        )
+
+    p_doc = validated_context.project
+    records = ProjectExportManager(p_doc).iter_records()
+    if archive:
+        return ndjson_archive_response(records, f"{p_doc.name}.ndjson.gz")
+    return ndjson_records_response(records)
 
 
 @router.put("/projects", response_model=ProjectDetailRead, status_code=200)
@@ -125,15 +205,15 @@ async def update_project(
         )
     p_read = await p_manager.read_project_detail(p_doc)
 
-    return p_read
+    return json_response(p_read, ProjectDetailRead)
 
 
-@router.delete("/projects", status_code=204)
+@router.delete("/projects", status_code=202, response_model=JobRead)
 async def delete_project(
     project: str,
     user: UserDocument = Depends(auth_required),
 ):
-    """Delete a project by given project name"""
+    """Delete a project by given project name, with the documents under it in background"""
     context = ProjectSimpleContext(project=project)
 
     # NOTE: Hard-coded, to project pipes101 project
@@ -161,7 +241,7 @@ async def delete_project(
     manager = ProjectManager()
     p_doc = validated_context.project
     try:
-        await manager.delete_project(p_doc.name)
+        job = await manager.delete_project(p_doc, user)
     except DocumentDoesNotExist as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -173,3 +253,5 @@ async def delete_project(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete project: {str(e)}",
         )
+
+    return job.read()
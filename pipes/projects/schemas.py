@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from datetime import datetime
 from pipes.common.utilities import parse_datetime
-from pipes.teams.schemas import TeamBasicRead
+from pipes.handoffs.schemas import HandoffCreate
+from pipes.models.schemas import ModelCreate
+from pipes.projectruns.schemas import ProjectRunCreate
+from pipes.teams.schemas import TeamBasicRead, TeamCreate
 from pipes.users.schemas import UserCreate, UserRead
 
 import pymongo
@@ -272,6 +275,83 @@ class ProjectBasicRead(BaseModel):
     )
 
 
+class ProjectBasicProjection(BaseModel):
+    """Project basic projection, fields of project basic read from document.
+
+    Attributes:
+        id: Project document id.
+        name: Human-readable project id name, must be unique.
+        title: Project title.
+        description: Project description.
+        owner: Project owner object id.
+        milestones: Project milestones.
+        created_at: Project creation time.
+    """
+
+    id: PydanticObjectId = Field(
+        alias="_id",
+        title="id",
+        description="project document id",
+    )
+    name: str = Field(
+        title="name",
+        description="human-readable project id name, must be unique.",
+    )
+    title: str = Field(
+        title="title",
+        default="",
+        description="Project title",
+    )
+    description: str = Field(
+        title="description",
+        default="",
+        description="project description",
+    )
+    owner: PydanticObjectId = Field(
+        title="owner",
+        description="project owner object id",
+    )
+    milestones: list[Milestone] = Field(
+        title="milestones",
+        default=[],
+        description="project milestones",
+    )
+    created_at: datetime = Field(
+        title="created_at",
+        description="project creation time",
+    )
+
+
+class ProjectAccessProjection(BaseModel):
+    """Project access projection, fields granting users access to project.
+
+    Attributes:
+        id: Project document id.
+        owner: Project owner object id.
+        leads: List of project lead object ids.
+        created_by: User who created the project.
+    """
+
+    id: PydanticObjectId = Field(
+        alias="_id",
+        title="id",
+        description="project document id",
+    )
+    owner: PydanticObjectId = Field(
+        title="owner",
+        description="project owner object id",
+    )
+    leads: list[PydanticObjectId] = Field(
+        title="leads",
+        default=[],
+        description="list of project lead object ids",
+    )
+    created_by: PydanticObjectId = Field(
+        title="created_by",
+        description="user who created the project",
+    )
+
+
 class ProjectDetailRead(ProjectCreate):
     """Project detail read schema.
 
@@ -328,6 +408,8 @@ class ProjectDocument(ProjectDetailRead, Document):
         created_by: User who created the project.
         last_modified: Last modification datetime.
         modified_by: User who modified the project.
+        access: Users with access to the project, maintained from the fields
+            above and the project team members.
     """
 
     owner: PydanticObjectId = Field(
@@ -361,6 +443,11 @@ class ProjectDocument(ProjectDetailRead, Document):
         title="modified_by",
         description="user who modified the project",
     )
+    access: list[PydanticObjectId] = Field(
+        title="access",
+        default=[],
+        description="users with access to the project",
+    )
 
     class Settings:
         name = "projects"
@@ -370,3 +457,100 @@ class ProjectDocument(ProjectDetailRead, Document):
                 unique=True,
             ),
         ]
+
+
+# Project import
+class ProjectRunImport(ProjectRunCreate):
+    """Project run import schema.
+
+    Attributes:
+        name: Project run name.
+        description: The description of this project run.
+        assumptions: Assumptions associated with project run that differ from project.
+        requirements: Requirements of the project run that differ from the project.
+        scenarios: The scenarios of this project run.
+        scheduled_start: Schedule project run start date in YYYY-MM-DD format.
+        scheduled_end: Schedule project run end date in YYYY-MM-DD format.
+        models: Models of the project run.
+        handoffs: Handoffs between the models of the project run.
+    """
+
+    models: list[ModelCreate] = Field(
+        title="models",
+        default=[],
+        description="models of the project run",
+    )
+    handoffs: list[HandoffCreate] = Field(
+        title="handoffs",
+        default=[],
+        description="handoffs between the models of the project run",
+    )
+
+
+class ProjectImport(ProjectCreate):
+    """Project import schema, the whole project tree in one payload.
+
+    Attributes:
+        name: Human-readable project id name, must be unique.
+        title: Project title.
+        description: Project description.
+        assumptions: Project assumptions.
+        requirements: Project requirements.
+        scenarios: Project scenarios.
+        sensitivities: Project sensitivities.
+        milestones: Project milestones.
+        scheduled_start: Project start datetime, format YYYY-MM-DD.
+        scheduled_end: Project end datetime, format YYYY-MM-DD.
+        owner: Project owner.
+        leads: List of project leads.
+        teams: List of project teams, the modeling teams of the models.
+        projectruns: List of project runs, with their models and handoffs.
+    """
+
+    teams: list[TeamCreate] = Field(
+        title="teams",
+        default=[],
+        description="list of project teams",
+    )
+    projectruns: list[ProjectRunImport] = Field(
+        title="projectruns",
+        default=[],
+        description="list of project runs",
+    )
+
+
+class ProjectImportError(BaseModel):
+    """Project import error of one item in the payload.
+
+    Attributes:
+        path: Location of the item in the payload, like 'projectruns[0].models[1]'.
+        message: Validation error message.
+    """
+
+    path: str = Field(
+        title="path",
+        description="location of the item in the payload",
+    )
+    message: str = Field(
+        title="message",
+        description="validation error message",
+    )
+
+
+class ProjectImportRead(BaseModel):
+    """Project import result schema.
+
+    Attributes:
+        project: The imported project name.
+        created: Number of documents created, by collection name.
+    """
+
+    project: str = Field(
+        title="project",
+        description="the imported project name",
+    )
+    created: dict[str, int] = Field(
+        title="created",
+        default={},
+        description="number of documents created, by collection name",
+    )
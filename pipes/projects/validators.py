@@ -1,40 +1,55 @@
 from __future__ import annotations
 from datetime import datetime
+from typing import Awaitable, Callable
+
+from beanie import Document
 from pydantic import BaseModel
+
 from pipes.common.exceptions import (
     ContextValidationError,
     DomainValidationError,
     UserPermissionDenied,
 )
 from pipes.common.validators import ContextValidator, DomainValidator
-from pipes.db.document import DocumentDB
+from pipes.db.document import current_docdb
 from pipes.projects.contexts import ProjectSimpleContext, ProjectDocumentContext
 from pipes.projects.schemas import ProjectCreate, ProjectDocument, ProjectUpdate
 from pipes.users.schemas import UserDocument
-from pipes.projectruns.schemas import ProjectRunRead
+from pipes.projectruns.schemas import ProjectRunDocument
 
 
 class ProjectContextValidator(ContextValidator):
     """Project context validator class"""
 
+    context_levels = [("project", ProjectDocument)]
+
     async def validate_document(
         self,
         context: ProjectSimpleContext,
     ) -> ProjectDocumentContext:
-        """Get project document through validation"""
+        """Get context documents through validation, resolved in one round trip"""
+        docs = await self.resolve_documents(context)
+
+        validated_context = self.build_context(context, docs)
+        self._validated_context = validated_context
+
+        return validated_context
+
+    def build_context(
+        self,
+        context: ProjectSimpleContext,
+        docs: dict[str, Document | None],
+    ) -> ProjectDocumentContext:
+        """Validate project document of resolved documents"""
         p_name = context.project
-        docdb = DocumentDB()
-        p_doc = await docdb.find_one(collection=ProjectDocument, query={"name": p_name})
+        p_doc = docs["project"]
 
         if not p_doc:
             raise ContextValidationError(
                 f"Invalid context, project '{p_name}' does not exist",
             )
 
-        validated_context = ProjectDocumentContext(project=p_doc)
-        self._validated_context = validated_context
-
-        return validated_context
+        return ProjectDocumentContext(project=p_doc)
 
     async def validate_permission(self, user: UserDocument) -> bool:
         """Check user permission in context through validation"""
@@ -91,62 +106,54 @@ class ProjectUpdateDomainValidator(DomainValidator):
 
     # TODO: Check and refactor this class for project update logic validation later.
 
-    def get_dependency_data(self, projectrun_docs: list[ProjectRunRead]):
-        dependency_data = {
-            "scenarios": [],
-            "scheduled_start": datetime.max,
-            "scheduled_end": datetime.min,
-        }
-
-        # Create a set to collect unique scenarios
-        scenarios_set = set()
-
-        for projectrun in projectrun_docs:
-            # Add scenarios to set
-            if projectrun.scenarios:
-                scenarios_set.update(projectrun.scenarios)
-
-            # Update earliest start time
-            if projectrun.scheduled_start:
-                if dependency_data["scheduled_start"] is None or (
-                    isinstance(dependency_data["scheduled_start"], datetime)
-                    and projectrun.scheduled_start < dependency_data["scheduled_start"]
-                ):
-                    dependency_data["scheduled_start"] = projectrun.scheduled_start
-
-            # Update latest end time
-            if projectrun.scheduled_end:
-                if dependency_data["scheduled_end"] is None or (
-                    isinstance(dependency_data["scheduled_end"], datetime)
-                    and projectrun.scheduled_end > dependency_data["scheduled_end"]
-                ):
-                    dependency_data["scheduled_end"] = projectrun.scheduled_end
-
-        # Convert scenarios set to list
-        dependency_data["scenarios"] = list(scenarios_set)
+    # Schedule and scenarios of the project runs, passed to validate_dependency_
+    dependency_data: dict = {}
+
+    async def get_dependency_data(self, p_doc: ProjectDocument) -> dict:
+        """Earliest start, latest end and scenarios of the project runs, in one aggregation"""
+        docdb = current_docdb()
+        raws = await docdb.aggregate(
+            collection=ProjectRunDocument,
+            pipeline=[
+                {"$match": {"context.project": p_doc.id}},
+                {
+                    "$unwind": {
+                        "path": "$scenarios",
+                        "preserveNullAndEmptyArrays": True,
+                    },
+                },
+                {
+                    "$group": {
+                        "_id": None,
+                        "scheduled_start": {"$min": "$scheduled_start"},
+                        "scheduled_end": {"$max": "$scheduled_end"},
+                        "scenarios": {"$addToSet": "$scenarios"},
+                    },
+                },
+            ],
+        )
+        raw = raws[0] if raws else {}
 
-        return dependency_data
+        # Without project runs, any project schedule is valid
+        return {
+            "scenarios": [s for s in raw.get("scenarios", []) if s is not None],
+            "scheduled_start": raw.get("scheduled_start") or datetime.max,
+            "scheduled_end": raw.get("scheduled_end") or datetime.min,
+        }
 
     async def project_validate(
         self,
         instance: BaseModel,
-        projectrun_docs: list[ProjectRunRead],
+        dependency_data: dict,
     ) -> BaseModel:
-        """Call validation methods with names starting with validate_"""
-
-        dependency_data = self.get_dependency_data(projectrun_docs)
-        for attr_name in dir(self):
-            if attr_name.startswith("validate_dependency_"):
-                validate_method = getattr(self, attr_name)
-                instance = await validate_method(instance, dependency_data)
-            elif attr_name.startswith("validate_"):
-                validate_method = getattr(self, attr_name)
-                instance = await validate_method(instance)
-            else:
-                continue
-
-        # return instance
-        return instance
+        """Call validation methods, with the dependency data for validate_dependency_"""
+        self.dependency_data = dependency_data
+        return await self.validate(instance)
+
+    def call_validator(self, method: Callable, instance: BaseModel) -> Awaitable:
+        if method.__name__.startswith("validate_dependency_"):
+            return method(self, instance, self.dependency_data)
+        return method(self, instance)
 
     async def validate_name(self, p_update: ProjectUpdate) -> ProjectUpdate:
         """Validates name no none or empty string. Make sure document does not already exist"""
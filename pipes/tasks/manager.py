@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime
+from typing import AsyncIterator
 
 from pydantic import EmailStr
 from pymongo.errors import DuplicateKeyError
@@ -10,7 +12,9 @@ from pipes.common.exceptions import DocumentAlreadyExists, DocumentDoesNotExist
 from pipes.common.schemas import ExecutionStatus
 from pipes.datasets.manager import DatasetManager
 from pipes.datasets.schemas import DatasetRead, DatasetDocument
+from pipes.common.streaming import read_chunks
 from pipes.db.manager import AbstractObjectManager
+from pipes.db.pagination import Page, PageParams
 from pipes.common.constants import NodeLabel
 from pipes.projects.schemas import ProjectDocument
 from pipes.projectruns.schemas import ProjectRunDocument
@@ -121,27 +125,41 @@ class TaskManager(AbstractObjectManager):
             )
         return d_doc
 
-    async def get_tasks(self) -> list[TaskRead]:
+    def _get_tasks_query(self) -> dict:
+        """Query of the tasks in the given context"""
         _context = ModelRunObjectContext(
             project=self.context.project.id,
             projectrun=self.context.projectrun.id,
             model=self.context.model.id,
             modelrun=self.context.modelrun.id,
         )
-        task_docs = await self.d.find_all(
+        return {
+            "context.project": _context.project,
+            "context.projectrun": _context.projectrun,
+            "context.model": _context.model,
+            "context.modelrun": _context.modelrun,
+        }
+
+    async def get_tasks(self, page: PageParams | None = None) -> Page[TaskRead]:
+        task_page = await self.d.find_page(
             collection=TaskDocument,
-            query={
-                "context.project": _context.project,
-                "context.projectrun": _context.projectrun,
-                "context.model": _context.model,
-                "context.modelrun": _context.modelrun,
-            },
+            query=self._get_tasks_query(),
+            page=page,
+        )
+        # Read concurrently, so the loader batches the gets of all tasks
+        task_reads = await asyncio.gather(
+            *[self.read_task(task_doc) for task_doc in task_page.data],
+        )
+        return Page(data=task_reads, next_cursor=task_page.next_cursor)
+
+    async def iter_tasks(self) -> AsyncIterator[TaskRead]:
+        """Stream all tasks in the given context"""
+        task_docs = self.d.iter_all(
+            collection=TaskDocument,
+            query=self._get_tasks_query(),
         )
-        task_reads = []
-        for task_doc in task_docs:
-            task_read = await self.read_task(task_doc)
-            task_reads.append(task_read)
-        return task_reads
+        async for task_read in read_chunks(task_docs, self.read_task, self.loader):
+            yield task_read
 
     async def update_task_status(self, name: str, status: ExecutionStatus) -> TaskRead:
         _context = ModelRunObjectContext(
@@ -175,52 +193,34 @@ class TaskManager(AbstractObjectManager):
         return task_read
 
     async def read_task(self, task_doc: TaskDocument) -> TaskRead:
-        # Read context
-        p_id = task_doc.context.project
-        p_doc = await self.d.get(collection=ProjectDocument, id=p_id)
-
-        pr_id = task_doc.context.projectrun
-        pr_doc = await self.d.get(collection=ProjectRunDocument, id=pr_id)
-
-        m_id = task_doc.context.model
-        m_doc = await self.d.get(collection=ModelDocument, id=m_id)
-
-        mr_id = task_doc.context.modelrun
-        mr_doc = await self.d.get(collection=ModelRunDocument, id=mr_id)
-
-        data = task_doc.model_dump()
-        data["context"] = ModelRunSimpleContext(
-            project=p_doc.name,
-            projectrun=pr_doc.name,
-            model=m_doc.name,
-            modelrun=mr_doc.name,
+        _context = task_doc.context
+        task_read = await self.assemble(
+            TaskRead,
+            task_doc,
+            context=self.assemble(
+                ModelRunSimpleContext,
+                project=self.get_name(ProjectDocument, _context.project),
+                projectrun=self.get_name(ProjectRunDocument, _context.projectrun),
+                model=self.get_name(ModelDocument, _context.model),
+                modelrun=self.get_name(ModelRunDocument, _context.modelrun),
+            ),
+            assignee=self._read_assignee(task_doc),
+            input_datasets=self._read_datasets(task_doc.input_datasets),
+            output_datasets=self._read_datasets(task_doc.output_datasets),
         )
+        return task_read
 
-        # task assignee
-        assignee_doc = await self.d.get(
+    async def _read_assignee(self, task_doc: TaskDocument) -> UserRead | None:
+        assignee_doc = await self.loader.get(
             collection=UserDocument,
             id=task_doc.assignee,
         )
-        if assignee_doc:
-            assigee_read = UserRead.model_validate(assignee_doc.model_dump())
-            data["assignee"] = assigee_read
-        else:
-            data["assignee"] = None
+        return assignee_doc.read() if assignee_doc else None
 
-        # task input & output datasets
+    async def _read_datasets(self, d_ids: list) -> list[DatasetRead]:
         dataset_manager = DatasetManager(self.context)
-        input_datasets = []
-        for d_id in task_doc.input_datasets:
-            d_doc = await self.d.get(collection=DatasetDocument, id=d_id)
-            d_read = await dataset_manager.read_dataset(d_doc)
-            input_datasets.append(d_read)
-        data["input_datasets"] = input_datasets
-
-        output_datasets = []
-        for d_id in task_doc.output_datasets:
-            d_doc = await self.d.get(collection=DatasetDocument, id=d_id)
-            d_read = await dataset_manager.read_dataset(d_doc)
-            output_datasets.append(d_read)
-        data["output_datasets"] = output_datasets
-
-        return TaskRead.model_validate(data)
+        d_docs = await self.loader.get_many(collection=DatasetDocument, ids=d_ids)
+        d_reads = await asyncio.gather(
+            *[dataset_manager.read_dataset(d_doc) for d_doc in d_docs],
+        )
+        return list(d_reads)
@@ -3,6 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi import status as fastapi_status
 
+from pipes.apikeys.schemas import APIKeyScope
 from pipes.common.exceptions import (
     ContextValidationError,
     DocumentAlreadyExists,
@@ -11,11 +12,14 @@ from pipes.common.exceptions import (
     UserPermissionDenied,
 )
 from pipes.common.schemas import ExecutionStatus
+from pipes.common.serialization import json_response
+from pipes.common.streaming import ndjson_requested, ndjson_response, ndjson_responses
+from pipes.db.pagination import Page, PageParams, page_params, page_response
 from pipes.modelruns.contexts import ModelRunSimpleContext
 from pipes.modelruns.validators import ModelRunContextValidator
 from pipes.tasks.schemas import TaskCreate, TaskRead
 from pipes.tasks.manager import TaskManager
-from pipes.users.auth import auth_required
+from pipes.users.auth import scoped_auth_required
 from pipes.users.schemas import UserDocument
 
 router = APIRouter()
@@ -28,7 +32,7 @@ async def create_task(
     model: str,
     modelrun: str,
     data: TaskCreate,
-    user: UserDocument = Depends(auth_required),
+    user: UserDocument = Depends(scoped_auth_required(APIKeyScope.tasks)),
 ):
     """Create a task with given context"""
     context = ModelRunSimpleContext(
@@ -67,16 +71,22 @@ async def create_task(
 
     task_read = await manager.read_task(task_doc)
 
-    return task_read
+    return json_response(task_read, TaskRead, status_code=201)
 
 
-@router.get("/tasks", response_model=list[TaskRead])
+@router.get(
+    "/tasks",
+    response_model=Page[TaskRead] | list[TaskRead],
+    responses=ndjson_responses,
+)
 async def get_tasks(
     project: str,
     projectrun: str,
     model: str,
     modelrun: str,
-    user: UserDocument = Depends(auth_required),
+    user: UserDocument = Depends(scoped_auth_required(APIKeyScope.tasks)),
+    page: PageParams = Depends(page_params),
+    ndjson: bool = Depends(ndjson_requested),
 ):
     """Get all tasks under given context"""
     context = ModelRunSimpleContext(
@@ -101,9 +111,12 @@ async def get_tasks(
         )
 
     manager = TaskManager(context=validated_context)
-    task_reads = await manager.get_tasks()
+    if ndjson:
+        return ndjson_response(manager.iter_tasks())
+
+    task_page = await manager.get_tasks(page)
 
-    return task_reads
+    return page_response(task_page, page)
 
 
 @router.patch("/tasks", response_model=TaskRead)
@@ -114,7 +127,7 @@ async def update_task_status(
     modelrun: str,
     task: str,
     status: ExecutionStatus,
-    user: UserDocument = Depends(auth_required),
+    user: UserDocument = Depends(scoped_auth_required(APIKeyScope.tasks)),
 ) -> TaskRead:
     """Update the status of given task"""
     context = ModelRunSimpleContext(
@@ -140,4 +153,4 @@ async def update_task_status(
 
     manager = TaskManager(context=validated_context)
     task = await manager.update_task_status(name=task, status=status)
-    return task
+    return json_response(task, TaskRead)
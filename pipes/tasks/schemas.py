@@ -173,8 +173,8 @@ class TaskRead(TaskCreate):
         description="Assignee in user read schema",
     )
     input_datasets: list[DatasetRead] = Field(
-         title="input_datasets",
-         description="List of input datasets in read schema",
+        title="input_datasets",
+        description="List of input datasets in read schema",
     )
     output_datasets: list[DatasetRead] = Field(
         title="output_datasets",
@@ -4,10 +4,13 @@ import logging
 
 from pymongo.errors import DuplicateKeyError
 
+from pipes.common.contexts import context_cache
 from pipes.common.exceptions import DocumentAlreadyExists, DocumentDoesNotExist
 from pipes.db.manager import AbstractObjectManager
 from pipes.common.constants import NodeLabel
-from pipes.projects.contexts import ProjectDocumentContext
+from pipes.projects.access import ProjectAccessManager
+from pipes.projects.contexts import ProjectDocumentContext, ProjectSimpleContext
+from pipes.projects.schemas import ProjectDocument
 from pipes.teams.schemas import TeamCreate, TeamRead, TeamUpdate, TeamDocument
 from pipes.users.manager import UserManager
 from pipes.users.schemas import UserCreate, UserDocument, UserRead
@@ -76,9 +79,14 @@ class TeamManager(AbstractObjectManager):
                 f"Team '{t_create.name}' already exists under project '{p_doc.name}'.",
             )
 
-        # Update project teams reference
-        p_doc.teams.append(t_doc.id)
-        await p_doc.save()
+        # Update project teams reference, p_doc could be a stale cached copy
+        await self.d.update_one(
+            collection=ProjectDocument,
+            find={"_id": p_doc.id},
+            update={"$addToSet": {"teams": t_doc.id}},
+        )
+        await context_cache.invalidate()
+        await ProjectAccessManager().update_access(p_doc.id)
 
         logger.info(
             "New team '%s' created successfully under project '%s'.",
@@ -125,11 +133,8 @@ class TeamManager(AbstractObjectManager):
         return teams
 
     async def get_team_members(self, t_doc: TeamDocument) -> list[UserRead]:
-        u_docs = await self.d.find_all(
-            collection=UserDocument,
-            query={"_id": {"$in": t_doc.members}},
-        )
-        members = [UserRead.model_validate(u_doc.model_dump()) for u_doc in u_docs]
+        u_docs = await self.loader.get_many(UserDocument, t_doc.members)
+        members = [u_doc.read() for u_doc in u_docs if u_doc]
         return members
 
     async def update_team(
@@ -169,16 +174,20 @@ class TeamManager(AbstractObjectManager):
         t_doc.description = data.description
         t_doc.members = list(member_doc_ids)
         await t_doc.save()
+        await ProjectAccessManager().update_access(p_doc.id)
 
         return t_doc
 
     async def read_team(self, t_doc: TeamDocument) -> TeamRead:
         """Convert team document to read object"""
-        data = t_doc.model_dump()
         p_doc = self.context.project
-        data["context"]["project"] = p_doc.name
-        data["members"] = await self.get_team_members(t_doc)
-        return TeamRead.model_validate(data)
+        t_read = await self.assemble(
+            TeamRead,
+            t_doc,
+            context=ProjectSimpleContext(project=p_doc.name),
+            members=self.get_team_members(t_doc),
+        )
+        return t_read
 
     async def delete_team(self, name: str) -> None:
         """Delete a team by name"""
@@ -189,6 +198,7 @@ class TeamManager(AbstractObjectManager):
             collection=TeamDocument,  # Replace with your actual team document class
             query={"context.project": p_doc.id, "name": name},
         )
+        await ProjectAccessManager().update_access(p_doc.id)
 
         logger.info(
             "Team '%s' of project '%s' deleted successfully",
@@ -2,19 +2,20 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
+from pipes.common.serialization import json_response
 from pipes.common.exceptions import (
     ContextValidationError,
     UserPermissionDenied,
     DocumentAlreadyExists,
     DocumentDoesNotExist,
 )
-from pipes.db.document import DocumentDB
+from pipes.db.document import DocumentDB, get_docdb
 from pipes.projects.contexts import ProjectSimpleContext
 from pipes.projects.validators import ProjectContextValidator
 from pipes.teams.manager import TeamManager
 from pipes.teams.schemas import TeamCreate, TeamRead, TeamUpdate
 from pipes.users.auth import auth_required
-from pipes.users.schemas import UserDocument
+from pipes.users.schemas import UserDocument, UserRead
 
 router = APIRouter()
 
@@ -25,6 +26,7 @@ async def create_team(
     project: str,
     data: TeamCreate,
     user: UserDocument = Depends(auth_required),
+    docdb: DocumentDB = Depends(get_docdb),
 ):
     """Create a new team"""
     context = ProjectSimpleContext(project=project)
@@ -53,20 +55,20 @@ async def create_team(
         )
 
     # Query members
-    docdb = DocumentDB()
-    u_docs = await docdb.find_all(
+    u_reads = await docdb.find_all(
         collection=UserDocument,
         query={"_id": {"$in": t_doc.members}},
+        projection=UserRead,
     )
 
     t_read = TeamRead(
         name=t_doc.name,
         description=t_doc.description,
         context={"project": project},
-        members=u_docs,
+        members=u_reads,
     )
 
-    return t_read
+    return json_response(t_read, TeamRead, status_code=201)
 
 
 @router.get("/teams", response_model=list[TeamRead])
@@ -93,7 +95,7 @@ async def get_teams(
 
     manager = TeamManager(context=validated_context)
     p_teams = await manager.get_all_teams()
-    return p_teams
+    return json_response(p_teams, list[TeamRead])
 
 
 @router.get("/teams/detail", response_model=TeamRead)
@@ -101,6 +103,7 @@ async def get_team(
     project: str,
     team: str,
     user: UserDocument = Depends(auth_required),
+    docdb: DocumentDB = Depends(get_docdb),
 ):
     """Get a specific team by name"""
     context = ProjectSimpleContext(project=project)
@@ -129,20 +132,20 @@ async def get_team(
         )
 
     # Query members
-    docdb = DocumentDB()
-    u_docs = await docdb.find_all(
+    u_reads = await docdb.find_all(
         collection=UserDocument,
         query={"_id": {"$in": t_doc.members}},
+        projection=UserRead,
     )
 
     t_read = TeamRead(
         name=t_doc.name,
         description=t_doc.description,
         context={"project": project},
-        members=u_docs,
+        members=u_reads,
     )
 
-    return t_read
+    return json_response(t_read, TeamRead)
 
 
 @router.patch("/teams")
@@ -151,6 +154,7 @@ async def update_team(
     team: str,
     data: TeamUpdate,
     user: UserDocument = Depends(auth_required),
+    docdb: DocumentDB = Depends(get_docdb),
 ):
     """Update project team"""
     context = ProjectSimpleContext(project=project)
@@ -178,15 +182,15 @@ async def update_team(
             detail=str(e),
         )
 
-    docdb = DocumentDB()
-    u_docs = await docdb.find_all(
+    u_reads = await docdb.find_all(
         collection=UserDocument,
         query={"_id": {"$in": t_doc.members}},
+        projection=UserRead,
     )
     t_read = TeamRead(
         name=t_doc.name,
         description=t_doc.description,
-        members=u_docs,
+        members=u_reads,
         context=ProjectSimpleContext(project=project),
     )
     return t_read
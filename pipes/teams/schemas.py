@@ -113,6 +113,34 @@ class TeamBasicRead(BaseModel):
     )
 
 
+class TeamContextProjection(BaseModel):
+    """Team context projection.
+
+    Attributes:
+        context: Project referenced context.
+    """
+
+    context: ProjectObjectContext = Field(
+        title="context",
+        description="project referenced context",
+    )
+
+
+class TeamMembersProjection(TeamContextProjection):
+    """Team members projection.
+
+    Attributes:
+        context: Project referenced context.
+        members: List of user object ids.
+    """
+
+    members: list[PydanticObjectId] = Field(
+        title="members",
+        default=[],
+        description="List of user object ids",
+    )
+
+
 class TeamDocument(TeamRead, Document):
     """Team document in db.
 
@@ -2,72 +2,73 @@ from __future__ import annotations
 
 import time
 from calendar import timegm
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any
 
-import boto3
-import requests
-from botocore.exceptions import ClientError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import jwk, jwt
-from jose.exceptions import JWTError, JWKError
+from jose import jwt
+from jose.exceptions import JWTError
 from jose.utils import base64url_decode
 
 from pipes.config.settings import settings
+from pipes.apikeys.manager import APIKeyManager, is_api_key
+from pipes.apikeys.schemas import APIKeyScope
 from pipes.common.exceptions import (
+    APIKeyAuthError,
     CognitoAuthError,
-    DocumentAlreadyExists,
     DocumentDoesNotExist,
+    UserPermissionDenied,
 )
-from pipes.common.utilities import parse_organization
-from pipes.users.schemas import CognitoUserCreate, UserDocument
+from pipes.users.backends import get_verification_backend
+from pipes.users.cache import PrincipalCache, VerifiedTokenCache
+from pipes.users.cognito import CognitoUserProvisioner
+from pipes.users.jwks import CognitoJWKsProvider
+from pipes.users.schemas import UserDocument
 from pipes.users.manager import UserManager
 
 http_bearer = HTTPBearer()
 
-_jwks_cache = {
-    "keys": None,
-    "expires_at": None,
-}
+jwks_provider = CognitoJWKsProvider(
+    url=f"https://cognito-idp.{settings.PIPES_REGION}.amazonaws.com/{settings.PIPES_COGNITO_USER_POOL_ID}/.well-known/jwks.json",  # noqa: E501
+    ttl=settings.PIPES_COGNITO_JWKS_TTL,
+    refresh_ahead=settings.PIPES_COGNITO_JWKS_REFRESH_AHEAD,
+    max_stale=settings.PIPES_COGNITO_JWKS_MAX_STALE,
+    backend=get_verification_backend(settings.PIPES_AUTH_VERIFY_BACKEND),
+)
+
+token_cache = VerifiedTokenCache(maxsize=settings.PIPES_AUTH_TOKEN_CACHE_SIZE)
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PIPES_AUTH_PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PIPES_AUTH_PRINCIPAL_CACHE_TTL,
+)
+
+user_provisioner = CognitoUserProvisioner()
 
 
 class CognitoJWKsVerifier:
     """AWS Cognito JWKs Verifier"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        provider: CognitoJWKsProvider | None = None,
+        cache: VerifiedTokenCache | None = None,
+    ) -> None:
+        self.provider = provider or jwks_provider
+        self.cache = token_cache if cache is None else cache
         self._aud = settings.PIPES_COGNITO_CLIENT_ID
         self._iss = f"https://cognito-idp.{settings.PIPES_REGION}.amazonaws.com/{settings.PIPES_COGNITO_USER_POOL_ID}"
         self._claims: dict[Any, Any] = {}
 
     @property
     def jwks_url(self):
-        return f"https://cognito-idp.{settings.PIPES_REGION}.amazonaws.com/{settings.PIPES_COGNITO_USER_POOL_ID}/.well-known/jwks.json"  # noqa: E501
+        return self.provider.url
 
     @property
     def keys(self):
-        # Check if we have cached keys that haven't expired
-        global _jwks_cache  # pylint: disable=global-statement  # noqa: F824
-        now = datetime.now()
-        if (
-            _jwks_cache["keys"] is not None
-            and _jwks_cache["expires_at"] is not None
-            and now < _jwks_cache["expires_at"]
-        ):
-            return _jwks_cache["keys"]
-
-        try:
-            response = requests.get(self.jwks_url, timeout=10).json()
-            keys = {key["kid"]: key for key in response["keys"]}
-
-            # Cache for 24 hours
-            _jwks_cache["keys"] = keys
-            _jwks_cache["expires_at"] = now + timedelta(hours=24)
-
-            return keys
-
-        except Exception as e:
-            raise CognitoAuthError(f"Failed to fetch JWKs: {e}")
+        """The JWKs set currently held by the provider"""
+        return self.provider.keys
 
     @property
     def aud(self):
@@ -79,7 +80,7 @@ class CognitoJWKsVerifier:
         """JWT Issuer"""
         return self._iss
 
-    def _get_publickey(self, access_token: str):
+    async def _get_publickey(self, access_token: str):
         try:
             headers = jwt.get_unverified_headers(access_token)
         except jwt.JWTError:
@@ -92,9 +93,8 @@ class CognitoJWKsVerifier:
             raise CognitoAuthError("Not authenticated. Invalid access token - not kid.")
 
         try:
-            key = self.keys.get(kid)
-            publickey = jwk.construct(key)
-        except (KeyError, JWKError) as e:
+            publickey = await self.provider.get_publickey(kid)
+        except CognitoAuthError as e:
             raise CognitoAuthError(f"Not authenticated. Invalid access token. {e}.")
         return publickey
 
@@ -119,7 +119,13 @@ class CognitoJWKsVerifier:
 
         return True
 
-    def verify_token(self, access_token: str) -> bool:
+    async def verify_token(self, access_token: str) -> bool:
+        # Token verified before, skip signature verification
+        cached_claims = self.cache.get(access_token)
+        if cached_claims is not None:
+            self._claims = cached_claims
+            return True
+
         try:
             claims = jwt.get_unverified_claims(access_token)
         except JWTError:
@@ -134,17 +140,23 @@ class CognitoJWKsVerifier:
         decoded_signature = base64url_decode(signature.encode("utf-8"))
 
         try:
-            publickey = self._get_publickey(access_token)
+            publickey = await self._get_publickey(access_token)
         except JWTError:
             return False
 
-        is_verified = publickey.verify(message.encode("utf-8"), decoded_signature)
+        is_verified = self.provider.backend.verify(
+            publickey,
+            message.encode("utf-8"),
+            decoded_signature,
+        )
         if not is_verified:
             raise CognitoAuthError(
                 "Not authenticated. Invalid access token - not verified.",
             )
 
         is_verified = self._verify_claims(claims)
+        if is_verified:
+            self.cache.put(access_token, claims)
 
         return is_verified
 
@@ -154,8 +166,14 @@ class CognitoAuth:
     Verify the `access token` and authorize based on scope (or groups)
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        principals: PrincipalCache | None = None,
+        provisioner: CognitoUserProvisioner | None = None,
+    ):
         self.verifier = CognitoJWKsVerifier()
+        self.principals = principal_cache if principals is None else principals
+        self.provisioner = provisioner or user_provisioner
 
     async def authenticate(
         self,
@@ -164,34 +182,26 @@ class CognitoAuth:
         """Authenticate user based Cognito credentials"""
         access_token = auth_creds.credentials
 
-        is_verified = self.verifier.verify_token(access_token)
+        is_verified = await self.verifier.verify_token(access_token)
         if not is_verified:
             return None
 
-        # Get current user
+        # Get current user, from principal cache first
+        cognito_username = self.verifier._claims.get("username")
+        principal = self.principals.get(cognito_username)
+        if principal is not None:
+            if not principal.is_active:
+                return None
+            return await self._authorize(principal.user)
+
         manager = UserManager()
         try:
-            cognito_username = self.verifier._claims.get("username")
             u_doc = await manager.get_user_by_username(cognito_username)
         except DocumentDoesNotExist:
-            cognito_user = await self._get_cognito_user_attributes(access_token)
-            if not cognito_user:
-                raise CognitoAuthError("Invalid access token.")
-
-            email = cognito_user["email"].lower()
-            organization = parse_organization(email)
-            u_create = CognitoUserCreate(
-                username=cognito_user["username"],
-                email=email,
-                first_name=cognito_user["first_name"],
-                last_name=cognito_user["last_name"],
-                organization=organization,
-            )
+            u_doc = await self.provisioner.provision(access_token, cognito_username)
 
-            try:
-                u_doc = await manager.create_user(u_create=u_create)
-            except DocumentAlreadyExists:
-                u_doc = await manager.get_user_by_email(email)
+        if u_doc:
+            self.principals.put(u_doc)
 
         if (not u_doc) or (not u_doc.is_active):
             return None
@@ -209,27 +219,6 @@ class CognitoAuth:
 
         return user
 
-    async def _get_cognito_user_attributes(self, access_token: str) -> dict | None:
-        """Given access token, get current user"""
-        cognito_idp = boto3.client("cognito-idp", region_name=settings.PIPES_REGION)
-        try:
-            response = cognito_idp.get_user(AccessToken=access_token)
-        except ClientError:
-            return None
-
-        # Get user attributes from Cognito
-        user_attrs = {
-            "username": response["Username"],
-            "email": None,
-            "first_name": None,
-            "last_name": None,
-        }
-        for item in response["UserAttributes"]:
-            if item["Name"] in user_attrs:
-                user_attrs[item["Name"]] = item["Value"]
-
-        return user_attrs
-
 
 async def auth_required(
     auth_creds: HTTPAuthorizationCredentials = Depends(http_bearer),
@@ -250,3 +239,30 @@ async def auth_required(
             detail="Authentication failed, user None.",
         )
     return user
+
+
+def scoped_auth_required(scope: APIKeyScope):
+    """Authenticate the user with Cognito access token, or API key of given scope"""
+
+    async def _scoped_auth_required(
+        auth_creds: HTTPAuthorizationCredentials = Depends(http_bearer),
+    ):
+        if not is_api_key(auth_creds.credentials):
+            return await auth_required(auth_creds)
+
+        try:
+            manager = APIKeyManager()
+            user = await manager.authenticate(auth_creds.credentials, scope)
+        except APIKeyAuthError as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=str(e),
+            )
+        except UserPermissionDenied as e:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=str(e),
+            )
+        return user
+
+    return _scoped_auth_required
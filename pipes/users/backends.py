@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Any
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
+from jose import jwk
+from jose.utils import base64url_decode
+
+
+class VerificationBackend:
+    """Construct public keys from JWKs and verify token signatures with them"""
+
+    name: str = ""
+
+    def construct(self, key: dict) -> Any:
+        """Build a ready-to-use public key object from a JWK"""
+        raise NotImplementedError
+
+    def verify(self, publickey: Any, message: bytes, signature: bytes) -> bool:
+        """Verify the signature of the message with the public key"""
+        raise NotImplementedError
+
+
+class JoseVerificationBackend(VerificationBackend):
+    """Verification backend based on python-jose"""
+
+    name = "jose"
+
+    def construct(self, key: dict) -> Any:
+        return jwk.construct(key)
+
+    def verify(self, publickey: Any, message: bytes, signature: bytes) -> bool:
+        return publickey.verify(message, signature)
+
+
+class CryptographyVerificationBackend(VerificationBackend):
+    """Verification backend calling cryptography directly, RSA keys only"""
+
+    name = "cryptography"
+
+    hash_algorithms = {
+        "RS256": hashes.SHA256,
+        "RS384": hashes.SHA384,
+        "RS512": hashes.SHA512,
+    }
+
+    def construct(self, key: dict) -> Any:
+        if key.get("kty") != "RSA":
+            raise ValueError(f"Unsupported key type '{key.get('kty')}'")
+
+        alg = key.get("alg", "RS256")
+        if alg not in self.hash_algorithms:
+            raise ValueError(f"Unsupported key algorithm '{alg}'")
+
+        n = int.from_bytes(base64url_decode(key["n"].encode("utf-8")), "big")
+        e = int.from_bytes(base64url_decode(key["e"].encode("utf-8")), "big")
+        publickey = RSAPublicNumbers(e, n).public_key()
+        return publickey, self.hash_algorithms[alg]()
+
+    def verify(self, publickey: Any, message: bytes, signature: bytes) -> bool:
+        rsa_key, algorithm = publickey
+        try:
+            rsa_key.verify(signature, message, PKCS1v15(), algorithm)
+        except InvalidSignature:
+            return False
+        return True
+
+
+VERIFICATION_BACKENDS: dict[str, type[VerificationBackend]] = {
+    JoseVerificationBackend.name: JoseVerificationBackend,
+    CryptographyVerificationBackend.name: CryptographyVerificationBackend,
+}
+
+
+def get_verification_backend(name: str) -> VerificationBackend:
+    """Get verification backend by name"""
+    try:
+        return VERIFICATION_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Not a valid verification backend '{name}', "
+            f"please use one of {list(VERIFICATION_BACKENDS)}",
+        )
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from pipes.users.schemas import UserDocument
+
+
+class ExpiringLRUCache:
+    """Bounded LRU cache whose entries expire at a given epoch time"""
+
+    def __init__(self, maxsize: int = 10000) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: Any) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def _put(self, key: Any, value: Any, expires_at: float) -> None:
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _pop(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Cache size and hit/miss counters"""
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class VerifiedTokenCache(ExpiringLRUCache):
+    """Bounded LRU cache of verified access tokens.
+
+    Entries are keyed by the SHA-256 digest of the token, hold the verified
+    claims, and expire at the token's `exp` claim.
+    """
+
+    @staticmethod
+    def digest(access_token: str) -> bytes:
+        return hashlib.sha256(access_token.encode("utf-8")).digest()
+
+    def get(self, access_token: str) -> dict | None:
+        """Return the verified claims of the token, None if not cached or expired"""
+        return self._get(self.digest(access_token))
+
+    def put(self, access_token: str, claims: dict) -> None:
+        """Cache the verified claims of the token until it expires"""
+        self._put(self.digest(access_token), claims, float(claims["exp"]))
+
+
+class Principal(NamedTuple):
+    """Authenticated user with its permission flags"""
+
+    user: UserDocument
+    is_active: bool
+    is_superuser: bool
+
+
+class PrincipalCache(ExpiringLRUCache):
+    """Bounded LRU cache of user documents keyed by Cognito username.
+
+    Entries live for `ttl` seconds at most, and must be invalidated explicitly
+    whenever the user document gets updated.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 300) -> None:
+        super().__init__(maxsize=maxsize)
+        self.ttl = ttl
+
+    def get(self, username: str) -> Principal | None:
+        """Return the cached principal of the username"""
+        return self._get(username)
+
+    def put(self, u_doc: UserDocument) -> None:
+        """Cache the user document under its Cognito username"""
+        if not u_doc.username:
+            return
+
+        principal = Principal(
+            user=u_doc,
+            is_active=u_doc.is_active,
+            is_superuser=u_doc.is_superuser,
+        )
+        self._put(u_doc.username, principal, time.time() + self.ttl)
+
+    def invalidate(self, username: str | None) -> None:
+        """Remove the cached principal of the username"""
+        if username:
+            self._pop(username)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import boto3
+from botocore.exceptions import ClientError
+
+from pipes.config.settings import settings
+from pipes.common.exceptions import CognitoAuthError
+from pipes.common.utilities import parse_organization
+from pipes.users.manager import UserManager
+from pipes.users.schemas import CognitoUserCreate, UserDocument
+
+
+class CognitoUserProvisioner:
+    """Provision PIPES users from Cognito on their first login.
+
+    Cognito GetUser calls go through one shared client in a worker thread, so
+    the event loop is never blocked, and concurrent first logins of the same
+    username are merged into a single provisioning task.
+    """
+
+    def __init__(self, client: Any = None) -> None:
+        self._client = client
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @property
+    def client(self) -> Any:
+        """Shared cognito-idp client, boto3 clients are thread-safe"""
+        if self._client is None:
+            self._client = boto3.client(
+                "cognito-idp",
+                region_name=settings.PIPES_REGION,
+                endpoint_url=settings.PIPES_COGNITO_ENDPOINT_URL,
+            )
+        return self._client
+
+    async def get_user_attributes(self, access_token: str) -> dict | None:
+        """Given access token, get user attributes from Cognito"""
+        try:
+            response = await asyncio.to_thread(
+                self.client.get_user,
+                AccessToken=access_token,
+            )
+        except ClientError:
+            return None
+
+        user_attrs = {
+            "username": response["Username"],
+            "email": None,
+            "first_name": None,
+            "last_name": None,
+        }
+        for item in response["UserAttributes"]:
+            if item["Name"] in user_attrs:
+                user_attrs[item["Name"]] = item["Value"]
+
+        return user_attrs
+
+    async def provision(self, access_token: str, username: str) -> UserDocument:
+        """Provision the user, joining the in-flight provisioning of the username"""
+        task = self._tasks.get(username)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._provision(access_token))
+            self._tasks[username] = task
+            task.add_done_callback(lambda t: self._discard(username, t))
+        return await asyncio.shield(task)
+
+    def _discard(self, username: str, task: asyncio.Task) -> None:
+        if self._tasks.get(username) is task:
+            del self._tasks[username]
+
+    async def _provision(self, access_token: str) -> UserDocument:
+        cognito_user = await self.get_user_attributes(access_token)
+        if not cognito_user or not cognito_user["email"]:
+            raise CognitoAuthError("Invalid access token.")
+
+        email = cognito_user["email"].lower()
+        u_create = CognitoUserCreate(
+            username=cognito_user["username"],
+            email=email,
+            first_name=cognito_user["first_name"],
+            last_name=cognito_user["last_name"],
+            organization=parse_organization(email),
+        )
+
+        manager = UserManager()
+        u_doc = await manager.upsert_cognito_user(u_create)
+        return u_doc
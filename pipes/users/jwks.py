@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import requests
+
+from pipes.common.exceptions import CognitoAuthError
+from pipes.users.backends import VerificationBackend, CryptographyVerificationBackend
+
+logger = logging.getLogger(__name__)
+
+
+class CognitoJWKsProvider:
+    """Async provider of the Cognito JSON Web Key set.
+
+    All concurrent callers share a single in-flight refresh. Keys are refreshed
+    in the background once they get close to expiry, stale keys are served when
+    Cognito can not be reached, and an unknown `kid` triggers a (rate limited)
+    refetch to pick up rotated keys. Public key objects are constructed once per
+    `kid` by the verification backend whenever the key set is refreshed.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float = 86400,
+        refresh_ahead: float = 3600,
+        max_stale: float = 86400,
+        refetch_interval: float = 60,
+        timeout: float = 10,
+        backend: VerificationBackend | None = None,
+    ) -> None:
+        self.url = url
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.max_stale = max_stale
+        self.refetch_interval = refetch_interval
+        self.timeout = timeout
+        self.backend = backend or CryptographyVerificationBackend()
+
+        self._keys: dict[str, dict] | None = None
+        self._publickeys: dict[str, Any] = {}
+        self._fetched_at: float = 0.0
+        self._expires_at: float = 0.0
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def keys(self) -> dict[str, dict] | None:
+        """The current JWKs set keyed by kid, without triggering a refresh"""
+        return self._keys
+
+    async def get_keys(self) -> dict[str, dict]:
+        """Return the JWKs set, refreshing it if it is missing or expired"""
+        now = time.monotonic()
+
+        if self._keys is None:
+            return await self.refresh()
+
+        if now >= self._expires_at:
+            try:
+                return await self.refresh()
+            except CognitoAuthError:
+                if now - self._expires_at > self.max_stale:
+                    raise
+                logger.warning("Serving stale JWKs, failed to refresh from Cognito.")
+                return self._keys
+
+        if now >= self._expires_at - self.refresh_ahead:
+            self._refresh_in_background()
+
+        return self._keys
+
+    async def get_key(self, kid: str) -> dict:
+        """Return the JWK of given kid, refetch once if the kid is unknown"""
+        await self._ensure_kid(kid)
+        return self._keys[kid]  # type: ignore[index]
+
+    async def get_publickey(self, kid: str) -> Any:
+        """Return the pre-constructed public key of given kid"""
+        await self._ensure_kid(kid)
+        if kid not in self._publickeys:
+            raise CognitoAuthError(f"Invalid JWK of kid '{kid}'")
+        return self._publickeys[kid]
+
+    async def _ensure_kid(self, kid: str) -> None:
+        keys = await self.get_keys()
+        if kid in keys:
+            return
+
+        # Unknown kid, Cognito may have rotated its signing keys
+        if time.monotonic() - self._fetched_at >= self.refetch_interval:
+            try:
+                keys = await self.refresh()
+            except CognitoAuthError:
+                pass
+
+        if kid not in keys:
+            raise CognitoAuthError(f"Unknown JWK kid '{kid}'")
+
+    async def refresh(self) -> dict[str, dict]:
+        """Fetch the JWKs set, joining the in-flight refresh if there is one"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._fetch())
+        return await asyncio.shield(self._refresh_task)
+
+    def _refresh_in_background(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+
+        task = asyncio.ensure_future(self._fetch())
+        task.add_done_callback(self._log_background_failure)
+        self._refresh_task = task
+
+    @staticmethod
+    def _log_background_failure(task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        e = task.exception()
+        if e is not None:
+            logger.warning("Background JWKs refresh failed: %s", e)
+
+    async def _fetch(self) -> dict[str, dict]:
+        try:
+            data = await asyncio.to_thread(self._request)
+            keys = {key["kid"]: key for key in data["keys"]}
+        except Exception as e:
+            raise CognitoAuthError(f"Failed to fetch JWKs: {e}")
+
+        publickeys = {}
+        for kid, key in keys.items():
+            try:
+                publickeys[kid] = self.backend.construct(key)
+            except Exception as e:
+                logger.warning("Failed to construct public key of kid '%s': %s", kid, e)
+
+        now = time.monotonic()
+        self._keys = keys
+        self._publickeys = publickeys
+        self._fetched_at = now
+        self._expires_at = now + self.ttl
+
+        return keys
+
+    def _request(self) -> Any:
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
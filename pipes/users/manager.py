@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
+from typing import AsyncIterator
 
 from beanie import PydanticObjectId
 from pydantic import EmailStr
@@ -10,8 +11,14 @@ from pymongo.errors import DuplicateKeyError
 from pipes.common.exceptions import DocumentDoesNotExist, DocumentAlreadyExists
 from pipes.common.utilities import parse_organization
 from pipes.db.manager import AbstractObjectManager
+from pipes.db.pagination import Page, PageParams
 from pipes.common.constants import NodeLabel
-from pipes.users.schemas import UserCreate, CognitoUserCreate, UserDocument
+from pipes.users.schemas import (
+    UserCreate,
+    CognitoUserCreate,
+    UserDocument,
+    UserRead,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -83,10 +90,45 @@ class UserManager(AbstractObjectManager):
         u_doc = await self.d.insert(u_doc)
         return u_doc
 
-    async def get_all_users(self) -> list[UserDocument]:
-        """Admin get all users from documentdb"""
-        u_docs = await self.d.find_all(collection=UserDocument)
-        return u_docs
+    async def upsert_cognito_user(self, u_create: CognitoUserCreate) -> UserDocument:
+        """Link Cognito username to the user of given email, create it if not exists"""
+        email = u_create.email.lower()
+        organization = u_create.organization
+        if not organization:
+            organization = parse_organization(email)
+
+        u_doc = await self.d.upsert_one(
+            collection=UserDocument,
+            find={"email": email},
+            update={
+                "$set": {"username": u_create.username},
+                "$setOnInsert": {
+                    "first_name": u_create.first_name,
+                    "last_name": u_create.last_name,
+                    "organization": organization,
+                    "created_at": datetime.now(),
+                    "is_active": True,
+                    "is_superuser": False,
+                },
+            },
+        )
+        return u_doc
+
+    async def get_all_users(self, page: PageParams | None = None) -> Page[UserRead]:
+        """Admin get all users from documentdb, fields of user read only"""
+        u_page = await self.d.find_page(
+            collection=UserDocument,
+            page=page,
+            projection=UserRead,
+        )
+        return u_page
+
+    async def iter_all_users(self) -> AsyncIterator[UserRead]:
+        """Admin stream all users from documentdb, fields of user read only"""
+        async for u_read in self.d.iter_all(
+            collection=UserDocument, projection=UserRead
+        ):
+            yield u_read
 
     async def get_user_by_email(self, email: EmailStr) -> UserDocument:
         """Get user by email"""
@@ -108,7 +150,7 @@ class UserManager(AbstractObjectManager):
 
     async def get_user_by_id(self, id: PydanticObjectId) -> UserDocument:
         """Get user by document id"""
-        u_doc = await self.d.get(collection=UserDocument, id=id)
+        u_doc = await self.loader.get(collection=UserDocument, id=id)
         if not u_doc:
             raise DocumentDoesNotExist(f"User not found - user id: {id}")
         return u_doc
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from pipes.apikeys.manager import apikey_cache
 from pipes.common.exceptions import DocumentAlreadyExists, DocumentDoesNotExist
-from pipes.users.auth import auth_required
+from pipes.common.streaming import ndjson_requested, ndjson_response, ndjson_responses
+from pipes.db.pagination import Page, PageParams, page_params, page_response
+from pipes.users.auth import auth_required, principal_cache
 from pipes.users.manager import UserManager
 from pipes.users.schemas import UserCreate, UserDocument, UserRead, UserUpdate
 
@@ -34,8 +37,16 @@ async def create_user(
     return u_doc
 
 
-@router.get("/users", response_model=list[UserRead])
-async def get_all_users(user: UserDocument = Depends(auth_required)):
+@router.get(
+    "/users",
+    response_model=Page[UserRead] | list[UserRead],
+    responses=ndjson_responses,
+)
+async def get_all_users(
+    user: UserDocument = Depends(auth_required),
+    page: PageParams = Depends(page_params),
+    ndjson: bool = Depends(ndjson_requested),
+):
     """Get a user by email"""
     if not user.is_superuser:
         raise HTTPException(
@@ -44,8 +55,11 @@ async def get_all_users(user: UserDocument = Depends(auth_required)):
         )
 
     manager = UserManager()
-    u_docs = await manager.get_all_users()
-    return u_docs
+    if ndjson:
+        return ndjson_response(manager.iter_all_users())
+
+    u_page = await manager.get_all_users(page)
+    return page_response(u_page, page)
 
 
 @router.get("/users/detail", response_model=UserRead)
@@ -119,6 +133,8 @@ async def update_user(
             u_doc.is_superuser = data.is_superuser
 
         await u_doc.save()
+        principal_cache.invalidate(u_doc.username)
+        apikey_cache.invalidate_user(u_doc.id)
         return u_doc
     except DocumentDoesNotExist as e:
         raise HTTPException(
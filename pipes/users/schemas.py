@@ -4,10 +4,12 @@ from datetime import datetime, timezone
 from uuid import UUID
 
 import pymongo
-from beanie import Document
+from beanie import Document, PydanticObjectId
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from pymongo import IndexModel
 
+from pipes.common.serialization import construct_read
+
 
 # User
 class UserCreate(BaseModel):
@@ -96,6 +98,25 @@ class UserRead(UserCreate):
     )
 
 
+class UserEmailProjection(BaseModel):
+    """User email projection.
+
+    Attributes:
+        id: User document id.
+        email: Email address.
+    """
+
+    id: PydanticObjectId = Field(
+        alias="_id",
+        title="id",
+        description="User document id",
+    )
+    email: EmailStr = Field(
+        title="email",
+        description="Email address",
+    )
+
+
 class UserUpdate(BaseModel):
     """Schema for updating user information.
 
@@ -175,8 +196,7 @@ class UserDocument(UserRead, Document):
         ]
 
     def read(self) -> UserRead:
-        data = self.model_dump()
-        return UserRead.model_validate(data)
+        return construct_read(UserRead, self)
 
     @field_validator("username", mode="before")
     @classmethod
@@ -0,0 +1,93 @@
+"""
+Benchmark of response compression, bytes on the wire and CPU cost, without a
+database.
+
+Compresses a large dataset list response, with verbose schema, temporal,
+spatial and location metadata, with each content encoding available and a few
+levels. Complete responses are compressed at once, streamed NDJSON responses
+record by record with a flush after each record, as the middleware does.
+
+    $ python -m scripts.benchmarks.compression --number 20 --items 1000
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from pipes.common.compression import ENCODERS
+from pipes.common.serialization import dump_json
+from pipes.datasets.schemas import DatasetRead
+from scripts.benchmarks.json_response import make_dataset_read
+
+
+def make_payload(items: int) -> list[DatasetRead]:
+    d_reads = []
+    for i in range(items):
+        d_read = make_dataset_read(i)
+        columns = [
+            {"name": f"column{j}", "type": "float64", "unit": "MWh"} for j in range(20)
+        ]
+        d_read.schema_info = json.dumps({"columns": columns})
+        d_reads.append(d_read)
+    return d_reads
+
+
+def compress_complete(
+    encoder_class, level: int, body: bytes, records: list[bytes]
+) -> int:
+    return len(encoder_class(level).finish(body))
+
+
+def compress_streamed(
+    encoder_class, level: int, body: bytes, records: list[bytes]
+) -> int:
+    encoder = encoder_class(level)
+    size = sum(len(encoder.compress(record)) for record in records)
+    return size + len(encoder.finish())
+
+
+def measure(
+    compress, encoder_class, level, body, records, number: int
+) -> tuple[int, list[float]]:
+    timings = []
+    for _ in range(number):
+        start = time.process_time()
+        size = compress(encoder_class, level, body, records)
+        timings.append(time.process_time() - start)
+    return size, timings
+
+
+def run(number: int, items: int, levels: list[int]) -> None:
+    d_reads = make_payload(items)
+    body = dump_json(d_reads, list[DatasetRead])
+    records = [dump_json(d_read) + b"\n" for d_read in d_reads]
+    print(f"identity                 {len(body):>10} bytes")
+
+    cases = {"complete": compress_complete, "streamed": compress_streamed}
+    for encoding, encoder_class in ENCODERS.items():
+        for level in levels:
+            for name, compress in cases.items():
+                size, timings = measure(
+                    compress, encoder_class, level, body, records, number
+                )
+                cpu = statistics.median(timings) * 1e3
+                ratio = len(body) / size
+                print(
+                    f"{encoding:<5} level {level:<2} {name:<9} {size:>10} bytes  "
+                    f"ratio {ratio:6.1f}   cpu {cpu:8.3f} ms",
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9])
+    args = parser.parse_args()
+
+    run(args.number, args.items, args.levels)
+
+
+if __name__ == "__main__":
+    main()
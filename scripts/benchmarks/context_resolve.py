@@ -0,0 +1,137 @@
+"""
+Benchmark of nested context resolution against a running DocumentDB.
+
+Compares resolving a model run context with one `find_one` per context level,
+one after another, against the single aggregation of the context validators.
+Documents are seeded into a scratch database, which is dropped afterwards.
+
+    $ python -m scripts.benchmarks.context_resolve --number 500 --siblings 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from pipes.db.document import get_docdb_uri
+from pipes.db.indexes import sync_indexes
+from pipes.modelruns.contexts import ModelRunSimpleContext
+from pipes.modelruns.validators import ModelRunContextValidator
+
+BENCHMARK_DATABASE = "pipes_benchmark"
+
+
+async def seed(database, siblings: int) -> ModelRunSimpleContext:
+    """One project with `siblings` documents on each nested level"""
+    p_id = ObjectId()
+    await database.projects.insert_one({"_id": p_id, "name": "p0"})
+
+    prs = [
+        {"_id": ObjectId(), "name": f"pr{i}", "context": {"project": p_id}}
+        for i in range(siblings)
+    ]
+    await database.projectruns.insert_many(prs)
+    pr_id = prs[-1]["_id"]
+
+    ms = [
+        {
+            "_id": ObjectId(),
+            "name": f"m{i}",
+            "context": {"project": p_id, "projectrun": pr_id},
+        }
+        for i in range(siblings)
+    ]
+    await database.models.insert_many(ms)
+    m_id = ms[-1]["_id"]
+
+    mrs = [
+        {
+            "name": f"mr{i}",
+            "context": {"project": p_id, "projectrun": pr_id, "model": m_id},
+        }
+        for i in range(siblings)
+    ]
+    await database.modelruns.insert_many(mrs)
+
+    return ModelRunSimpleContext(
+        project="p0",
+        projectrun=f"pr{siblings - 1}",
+        model=f"m{siblings - 1}",
+        modelrun=f"mr{siblings - 1}",
+    )
+
+
+async def resolve_sequential(database, context: ModelRunSimpleContext):
+    p_doc = await database.projects.find_one({"name": context.project})
+    pr_doc = await database.projectruns.find_one(
+        {"context.project": p_doc["_id"], "name": context.projectrun},
+    )
+    m_doc = await database.models.find_one(
+        {
+            "context.project": p_doc["_id"],
+            "context.projectrun": pr_doc["_id"],
+            "name": context.model,
+        },
+    )
+    mr_doc = await database.modelruns.find_one(
+        {
+            "context.project": p_doc["_id"],
+            "context.projectrun": pr_doc["_id"],
+            "context.model": m_doc["_id"],
+            "name": context.modelrun,
+        },
+    )
+    assert mr_doc is not None
+
+
+async def resolve_aggregation(database, context: ModelRunSimpleContext):
+    pipeline = ModelRunContextValidator().get_context_pipeline(context)
+    raws = await database.projects.aggregate(pipeline).to_list(length=None)
+    assert raws[0]["modelrun"] is not None
+
+
+async def measure(resolve, database, context, number: int) -> list[float]:
+    timings = []
+    for _ in range(number):
+        start = time.perf_counter()
+        await resolve(database, context)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def run(number: int, siblings: int) -> None:
+    client = AsyncIOMotorClient(get_docdb_uri())
+    database = client[BENCHMARK_DATABASE]
+    try:
+        await sync_indexes(database)
+        context = await seed(database, siblings)
+
+        cases = {
+            "find_one per level": resolve_sequential,
+            "single aggregation": resolve_aggregation,
+        }
+        for name, resolve in cases.items():
+            await measure(resolve, database, context, 10)
+            timings = await measure(resolve, database, context, number)
+            p50 = statistics.median(timings) * 1e3
+            p95 = statistics.quantiles(timings, n=20)[-1] * 1e3
+            print(f"{name:<20} p50 {p50:8.3f} ms   p95 {p95:8.3f} ms")
+    finally:
+        await client.drop_database(BENCHMARK_DATABASE)
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=500)
+    parser.add_argument("--siblings", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.number, args.siblings))
+
+
+if __name__ == "__main__":
+    main()
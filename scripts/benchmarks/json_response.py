@@ -0,0 +1,143 @@
+"""
+Benchmark of JSON response rendering over large list responses, without a
+database.
+
+Renders lists of dataset, task and catalog dataset read objects with the
+standard FastAPI encoding, `jsonable_encoder` then `json.dumps`, against the
+pydantic-core rendering of `FastJSONResponse` and of `json_response`.
+
+    $ python -m scripts.benchmarks.json_response --number 200 --items 1000
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from pipes.catalogdatasets.schemas import (
+    CatalogDatasetRead,
+    DatasetLocation,
+    SpatialInfo,
+    TemporalInfo,
+)
+from pipes.common.schemas import ExecutionStatus, SourceCode
+from pipes.common.serialization import FastJSONResponse, construct_read, json_response
+from pipes.datasets.schemas import DatasetRead
+from pipes.modelruns.contexts import ModelRunSimpleContext
+from pipes.tasks.schemas import SubTask, TaskRead
+from scripts.benchmarks.serialization import make_dataset, make_user
+
+
+def make_dataset_read(i: int) -> DatasetRead:
+    d_doc, refs = make_dataset(i)
+    return construct_read(DatasetRead, d_doc, **refs)
+
+
+def make_task_read(i: int) -> TaskRead:
+    now = datetime.now()
+    return TaskRead(
+        name=f"task{i}",
+        type="QAQC",
+        description="A task of the benchmark",
+        assignee=make_user(i),
+        status=ExecutionStatus.SUCCESS,
+        subtasks=[SubTask(name=f"subtask{j}", description="check") for j in range(3)],
+        scheduled_start=now,
+        scheduled_end=now,
+        completion_date=now,
+        source_code=SourceCode(location="https://github.com/example/model"),
+        input_datasets=[make_dataset_read(j) for j in range(2)],
+        input_parameters={"threshold": 0.5},
+        output_values={"passed": True},
+        context=ModelRunSimpleContext(
+            project="p0", projectrun="pr0", model="m0", modelrun="mr0"
+        ),
+    )
+
+
+def make_catalog_dataset_read(i: int) -> CatalogDatasetRead:
+    return CatalogDatasetRead(
+        name=f"catalogdataset{i}",
+        display_name=f"Catalog dataset {i}",
+        description="A catalog dataset of the benchmark",
+        version="1.0.0",
+        hash_value="abc",
+        location=DatasetLocation(
+            system_type="AWS S3",
+            storage_path=f"s3://bucket/dataset{i}",
+            access_info="",
+        ),
+        weather_years=[2012, 2018],
+        model_years=list(range(2025, 2051, 5)),
+        units=["MW", "MWh"],
+        temporal_info=TemporalInfo(),
+        spatial_info=SpatialInfo(),
+        scenarios=["baseline", "high"],
+        source_code=SourceCode(location="https://github.com/example/model"),
+        access_group=[f"user{j}@example.com" for j in range(3)],
+        created_at=datetime.now(),
+        created_by=make_user(i),
+    )
+
+
+def render_standard(reads: list, read_class) -> bytes:
+    return JSONResponse(jsonable_encoder(reads)).body
+
+
+def render_fast(reads: list, read_class) -> bytes:
+    return FastJSONResponse(reads).body
+
+
+def render_preserialized(reads: list, read_class) -> bytes:
+    return json_response(reads, list[read_class]).body
+
+
+def measure(render, reads: list, read_class, number: int) -> list[float]:
+    timings = []
+    for _ in range(number):
+        start = time.perf_counter()
+        render(reads, read_class)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(number: int, items: int) -> None:
+    payloads = {
+        "datasets": (DatasetRead, [make_dataset_read(i) for i in range(items)]),
+        "tasks": (TaskRead, [make_task_read(i) for i in range(items)]),
+        "catalogdatasets": (
+            CatalogDatasetRead,
+            [make_catalog_dataset_read(i) for i in range(items)],
+        ),
+    }
+    cases = {
+        "jsonable_encoder": render_standard,
+        "FastJSONResponse": render_fast,
+        "json_response": render_preserialized,
+    }
+    for payload, (read_class, reads) in payloads.items():
+        expected = json.loads(render_standard(reads, read_class))
+        for name, render in cases.items():
+            assert json.loads(render(reads, read_class)) == expected
+            measure(render, reads, read_class, 5)
+            timings = measure(render, reads, read_class, number)
+            p50 = statistics.median(timings) * 1e3
+            p95 = statistics.quantiles(timings, n=20)[-1] * 1e3
+            print(f"{payload:<16} {name:<17} p50 {p50:8.3f} ms   p95 {p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--items", type=int, default=1000)
+    args = parser.parse_args()
+
+    run(args.number, args.items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Load test of the accessible projects query against a running DocumentDB.
+
+Compares the former query of `/api/projects/basics`, teams of the user then a
+`$or` over creator, owner, leads and team projects, against one indexed query
+on the maintained `access` field of projects. Thousands of projects, teams and
+users are seeded into a scratch database, which is dropped afterwards.
+
+    $ python -m scripts.benchmarks.project_access --projects 5000 --users 500
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from pipes.db.document import get_docdb_uri
+from pipes.db.indexes import sync_indexes
+from pipes.projects.access import get_project_access
+from pipes.projects.schemas import ProjectAccessProjection
+from pipes.teams.schemas import TeamMembersProjection
+
+BENCHMARK_DATABASE = "pipes_benchmark"
+
+
+async def seed(database, projects: int, users: int, teams: int) -> list[ObjectId]:
+    """Projects with random owner and leads, and `teams` random teams each"""
+    u_ids = [ObjectId() for _ in range(users)]
+    await database.users.insert_many([{"_id": u_id} for u_id in u_ids])
+
+    p_docs, t_docs = [], []
+    for i in range(projects):
+        owner = random.choice(u_ids)
+        p_doc = {
+            "_id": ObjectId(),
+            "name": f"p{i}",
+            "owner": owner,
+            "created_by": owner,
+            "leads": random.sample(u_ids, 2),
+        }
+        p_teams = [
+            {
+                "name": f"t{j}",
+                "context": {"project": p_doc["_id"]},
+                "members": random.sample(u_ids, 5),
+            }
+            for j in range(teams)
+        ]
+        p_doc["access"] = get_project_access(
+            ProjectAccessProjection.model_validate(p_doc),
+            [TeamMembersProjection.model_validate(t_doc) for t_doc in p_teams],
+        )
+        p_docs.append(p_doc)
+        t_docs.extend(p_teams)
+
+    await database.projects.insert_many(p_docs)
+    await database.teams.insert_many(t_docs)
+    return u_ids
+
+
+async def query_teams(database, u_id: ObjectId) -> set:
+    t_docs = database.teams.find({"members": u_id}, {"context.project": 1})
+    p_ids = [t_doc["context"]["project"] async for t_doc in t_docs]
+    query = {
+        "$or": [
+            {"created_by": u_id},
+            {"owner": u_id},
+            {"leads": u_id},
+            {"_id": {"$in": p_ids}},
+        ],
+    }
+    return {p_doc["_id"] async for p_doc in database.projects.find(query, {"_id": 1})}
+
+
+async def query_access(database, u_id: ObjectId) -> set:
+    p_docs = database.projects.find({"access": u_id}, {"_id": 1}).sort("_id")
+    return {p_doc["_id"] async for p_doc in p_docs}
+
+
+async def measure(query, database, u_ids: list[ObjectId]) -> list[float]:
+    timings = []
+    for u_id in u_ids:
+        start = time.perf_counter()
+        await query(database, u_id)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def run(projects: int, users: int, teams: int, number: int) -> None:
+    client = AsyncIOMotorClient(get_docdb_uri())
+    database = client[BENCHMARK_DATABASE]
+    try:
+        await sync_indexes(database)
+        u_ids = await seed(database, projects, users, teams)
+        sample = random.choices(u_ids, k=number)
+
+        for u_id in u_ids[:50]:
+            assert await query_teams(database, u_id) == await query_access(
+                database, u_id
+            )
+
+        cases = {
+            "teams then $or": query_teams,
+            "access index": query_access,
+        }
+        for name, query in cases.items():
+            await measure(query, database, sample[:10])
+            timings = await measure(query, database, sample)
+            p50 = statistics.median(timings) * 1e3
+            p95 = statistics.quantiles(timings, n=20)[-1] * 1e3
+            print(f"{name:<16} p50 {p50:8.3f} ms   p95 {p95:8.3f} ms")
+    finally:
+        await client.drop_database(BENCHMARK_DATABASE)
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--teams", type=int, default=2)
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.projects, args.users, args.teams, args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Benchmark of read object serialization, without a database.
+
+Compares building `DatasetRead` and `ProjectDetailRead` payloads the former
+way, dumping the document, validating the read model, then validating and
+encoding it again as FastAPI does for the response model of a route, against
+constructing the read model from the trusted document and serializing it into
+bytes once.
+
+    $ python -m scripts.benchmarks.serialization --number 2000 --items 20
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime
+
+from beanie import PydanticObjectId
+from fastapi.encoders import jsonable_encoder
+
+from pipes.common.schemas import SourceCode, VersionStatus
+from pipes.common.serialization import construct_read, dump_json, get_type_adapter
+from pipes.datasets.schemas import DatasetDocument, DatasetRead
+from pipes.modelruns.contexts import ModelRunObjectContext, ModelRunSimpleContext
+from pipes.projects.schemas import (
+    Milestone,
+    ProjectDetailRead,
+    ProjectDocument,
+    Scenario,
+    Sensitivity,
+)
+from pipes.teams.schemas import TeamBasicRead
+from pipes.users.schemas import UserRead
+
+
+def make_user(i: int) -> UserRead:
+    return UserRead(
+        id=PydanticObjectId(),
+        email=f"user{i}@example.com",
+        first_name="First",
+        last_name="Last",
+        is_active=True,
+        is_superuser=False,
+    )
+
+
+def make_dataset(i: int) -> tuple[DatasetDocument, dict]:
+    """Dataset document as loaded from database, and its referenced reads"""
+    now = datetime.now()
+    d_doc = DatasetDocument.model_construct(
+        id=PydanticObjectId(),
+        name=f"dataset{i}",
+        display_name=f"Dataset {i}",
+        description="A dataset of the benchmark",
+        version="1.0.0",
+        version_status=VersionStatus.Active,
+        location={"system": "S3", "storage_path": f"s3://bucket/dataset{i}"},
+        registration_author=PydanticObjectId(),
+        weather_years=[2012, 2018],
+        model_years=list(range(2025, 2051, 5)),
+        units=["MW", "MWh"],
+        scenarios=["baseline", "high"],
+        sensitivities=["low-cost"],
+        source_code=SourceCode(
+            location="https://github.com/example/model", branch="main"
+        ),
+        relevant_links=["https://example.com"],
+        other={"key": "value"},
+        context=ModelRunObjectContext(
+            project=PydanticObjectId(),
+            projectrun=PydanticObjectId(),
+            model=PydanticObjectId(),
+            modelrun=PydanticObjectId(),
+        ),
+        created_at=now,
+        created_by=PydanticObjectId(),
+        last_modified=now,
+        modified_by=PydanticObjectId(),
+    )
+    refs = {
+        "context": ModelRunSimpleContext(
+            project="p0", projectrun="pr0", model="m0", modelrun="mr0"
+        ),
+        "registration_author": make_user(i),
+    }
+    return d_doc, refs
+
+
+def make_project(i: int) -> tuple[ProjectDocument, dict]:
+    """Project document as loaded from database, and its referenced reads"""
+    now = datetime.now()
+    p_doc = ProjectDocument.model_construct(
+        id=PydanticObjectId(),
+        name=f"project{i}",
+        title=f"Project {i}",
+        description="A project of the benchmark",
+        assumptions=[f"assumption {j}" for j in range(5)],
+        requirements={"keys": ["a", "b"]},
+        scenarios=[
+            Scenario(name=f"scenario{j}", description=["one", "two"]) for j in range(5)
+        ],
+        sensitivities=[
+            Sensitivity(name=f"sensitivity{j}", description=["one"]) for j in range(5)
+        ],
+        milestones=[
+            Milestone(name=f"milestone{j}", description="due", milestone_date=now)
+            for j in range(5)
+        ],
+        scheduled_start=now,
+        scheduled_end=now,
+        owner=PydanticObjectId(),
+        leads=[PydanticObjectId() for _ in range(3)],
+        teams=[PydanticObjectId() for _ in range(3)],
+        created_at=now,
+        created_by=PydanticObjectId(),
+        last_modified=now,
+        modified_by=PydanticObjectId(),
+    )
+    refs = {
+        "owner": make_user(i),
+        "leads": [make_user(j) for j in range(3)],
+        "teams": [
+            TeamBasicRead(name=f"team{j}", description="A team") for j in range(3)
+        ],
+    }
+    return p_doc, refs
+
+
+def revalidated(read_class, docs: list) -> bytes:
+    reads = []
+    for doc, refs in docs:
+        data = doc.model_dump()
+        data.update(refs)
+        reads.append(read_class.model_validate(data))
+
+    # Response model validation and encoding of FastAPI
+    adapter = get_type_adapter(list[read_class])
+    content = adapter.validate_python([read.model_dump() for read in reads])
+    content = adapter.dump_python(content, mode="json", by_alias=True)
+    return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode("utf-8")
+
+
+def constructed(read_class, docs: list) -> bytes:
+    reads = [construct_read(read_class, doc, **refs) for doc, refs in docs]
+    return dump_json(reads, list[read_class])
+
+
+def measure(build, read_class, docs: list, number: int) -> list[float]:
+    timings = []
+    for _ in range(number):
+        start = time.perf_counter()
+        build(read_class, docs)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(number: int, items: int) -> None:
+    payloads = {
+        "DatasetRead": (DatasetRead, [make_dataset(i) for i in range(items)]),
+        "ProjectDetailRead": (
+            ProjectDetailRead,
+            [make_project(i) for i in range(items)],
+        ),
+    }
+    for payload, (read_class, docs) in payloads.items():
+        assert json.loads(revalidated(read_class, docs)) == json.loads(
+            constructed(read_class, docs)
+        )
+        for name, build in {
+            "revalidated": revalidated,
+            "constructed": constructed,
+        }.items():
+            measure(build, read_class, docs, 10)
+            timings = measure(build, read_class, docs, number)
+            p50 = statistics.median(timings) * 1e3
+            p95 = statistics.quantiles(timings, n=20)[-1] * 1e3
+            print(f"{payload:<18} {name:<12} p50 {p50:8.3f} ms   p95 {p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.number, args.items)
+
+
+if __name__ == "__main__":
+    main()
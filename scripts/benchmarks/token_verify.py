@@ -0,0 +1,78 @@
+"""
+Micro-benchmark of access token signature verification.
+
+Compares the per-request `jwk.construct` + python-jose verification against
+verifying with public keys pre-constructed per kid, for each verification
+backend.
+
+    $ python -m scripts.benchmarks.token_verify --number 2000
+"""
+
+import argparse
+import time
+import timeit
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from jose.utils import base64url_decode
+
+from pipes.users.backends import VERIFICATION_BACKENDS
+
+
+def make_token() -> tuple[str, dict]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+    public_jwk = jwk.construct(private_pem, "RS256").public_key().to_dict()
+    public_jwk["kid"] = "benchmark"
+
+    now = int(time.time())
+    claims = {"token_use": "access", "iat": now, "exp": now + 3600}
+    token = jwt.encode(
+        claims, private_pem, algorithm="RS256", headers={"kid": "benchmark"}
+    )
+    return token, public_jwk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    token, public_jwk = make_token()
+    message, signature = token.rsplit(".", 1)
+    message_bytes = message.encode("utf-8")
+    signature_bytes = base64url_decode(signature.encode("utf-8"))
+
+    def construct_per_request():
+        publickey = jwk.construct(public_jwk)
+        assert publickey.verify(message_bytes, signature_bytes)
+
+    cases = {"jose, construct per request": construct_per_request}
+    for name, backend_class in VERIFICATION_BACKENDS.items():
+        backend = backend_class()
+        publickey = backend.construct(public_jwk)
+
+        def preconstructed(backend=backend, publickey=publickey):
+            assert backend.verify(publickey, message_bytes, signature_bytes)
+
+        cases[f"{name}, pre-constructed"] = preconstructed
+
+    baseline = None
+    for name, func in cases.items():
+        seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+        throughput = args.number / seconds
+        baseline = baseline or throughput
+        print(
+            f"{name:<32} {throughput:>10.0f} verify/s "
+            f"{seconds / args.number * 1e6:>8.1f} us/op "
+            f"x{throughput / baseline:.2f}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -48,53 +48,19 @@ clean_project = dict(
     owner=raw_project["owner"],
 )
 
-p_url = f"{host}/api/projects"
-response = requests.post(p_url, data=json.dumps(clean_project), headers=headers)
-if response.status_code != 201:
-    print(p_url, response.text)
-else:
-    print(f"Project {p_name} created successfully.")
-
-
-# Create project teams
-t_url = f"{host}/api/teams?project={p_name}"
-for team in raw_teams:
-    t_name = team["name"]
-    response = requests.post(t_url, data=json.dumps(team), headers=headers)
-    if response.status_code != 201:
-        print(t_url, response.text)
-    else:
-        print(f"Team {t_name} created successfully.")
-
-# Create project runs
-pr_url = f"{host}/api/projectruns?project={p_name}"
+# Project teams, and project runs with their models and handoff plans
+projectruns = []
 for projectrun in raw_projectruns:
-    pr_name = projectrun["name"]
-    response = requests.post(pr_url, data=json.dumps(projectrun), headers=headers)
-    if response.status_code != 201:
-        print(pr_url, response.text)
-    else:
-        print(f"Project run {pr_name} created successfully.")
-
-    # Add models to project runs
-    m_url = f"{host}/api/models?project={p_name}&projectrun={pr_name}"
+    models = []
     for raw_model in projectrun["models"]:
         clean_model = raw_model.copy()
         clean_model["name"] = raw_model["model"]
-        m_name = clean_model["name"]
         if not clean_model.get("modeling_team", None):
             clean_model["modeling_team"] = raw_model["model"]
+        models.append(clean_model)
 
-        response = requests.post(m_url, data=json.dumps(clean_model), headers=headers)
-        if response.status_code != 201:
-            print(m_url, response.text)
-        else:
-            print(f"Model {m_name} created successfully.")
-
-    # Create handoff plans
-    topology = projectrun["topology"]
     handoffs = []
-    for topo in topology:
+    for topo in projectrun["topology"]:
         for h in topo["handoffs"]:
             handoff = {
                 "from_model": topo["from_model"],
@@ -106,12 +72,26 @@ for projectrun in raw_projectruns:
                 "notes": h["notes"],
             }
             handoffs.append(handoff)
-    h_url = f"{host}/api/handoffs?project={p_name}&projectrun={pr_name}"
-    response = requests.post(h_url, data=json.dumps(handoffs), headers=headers)
-    if response.status_code != 201:
-        print(h_url, response.text)
-    else:
-        print(f"{len(handoffs)} Handoffs created successfully.")
+
+    clean_projectrun = projectrun.copy()
+    clean_projectrun.pop("topology")
+    clean_projectrun["models"] = models
+    clean_projectrun["handoffs"] = handoffs
+    projectruns.append(clean_projectrun)
+
+clean_project["teams"] = raw_teams
+clean_project["projectruns"] = projectruns
+
+# Import project tree, all or nothing
+p_url = f"{host}/api/projects/import"
+response = requests.post(p_url, data=json.dumps(clean_project), headers=headers)
+if response.status_code != 201:
+    print(p_url, response.text)
+    sys.exit(1)
+else:
+    print(f"Project {p_name} imported successfully: {response.json()['created']}")
+
+pr_name = raw_projectruns[-1]["name"]
 
 
 # Model runs
@@ -0,0 +1,54 @@
+"""
+Sync the declared DocumentDB indexes, see pipes.db.indexes.
+
+Creates the missing indexes of every collection, and reports the existing
+indexes that are not declared anymore.
+
+    $ python -m scripts.sync_indexes --dry-run
+    $ python -m scripts.sync_indexes --drop
+"""
+
+import argparse
+import asyncio
+
+from pipes.config.settings import settings
+from pipes.db.document import get_docdb
+from pipes.db.indexes import sync_indexes
+
+
+async def run(drop: bool, dry_run: bool) -> dict:
+    docdb = get_docdb()
+    try:
+        return await sync_indexes(
+            docdb.connect()[settings.PIPES_DOCDB_NAME],
+            drop=drop,
+            dry_run=dry_run,
+        )
+    finally:
+        docdb.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--drop",
+        action="store_true",
+        help="drop the stale indexes not declared anymore",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report the indexes to create and drop",
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run(drop=args.drop, dry_run=args.dry_run))
+    for name, result in report.items():
+        print(f"{name}:")
+        for action, indexes in result.items():
+            if indexes:
+                print(f"  {action}: {', '.join(indexes)}")
+
+
+if __name__ == "__main__":
+    main()
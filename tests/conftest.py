@@ -34,7 +34,7 @@ def pipes_settings(autouse=True):
 
 @pytest.fixture(autouse=True)
 def test_client():
-    from main import app
+    from pipes.app import app
 
     return TestClient(app)
 
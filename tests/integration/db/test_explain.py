@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+from pipes.db.document import get_docdb_uri
+from pipes.db.indexes import QUERY_INDEXES, Query, sync_indexes
+from tests.recorder import record_manager_queries
+
+EXPLAIN_DATABASE = "pipes_explain_test"
+
+
+def find_stages(plan, stage: str) -> list[dict]:
+    """Find all the stages of given type in the explained query plan"""
+    stages = []
+    if isinstance(plan, dict):
+        if plan.get("stage") == stage:
+            stages.append(plan)
+        for value in plan.values():
+            stages.extend(find_stages(value, stage))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(find_stages(value, stage))
+    return stages
+
+
+async def explain_manager_queries() -> list[tuple[str, Query, dict]]:
+    """Explain the queries recorded from the managers, with the method sending them"""
+    recorded = await record_manager_queries()
+
+    client = AsyncIOMotorClient(get_docdb_uri(), serverSelectionTimeoutMS=2000)
+    try:
+        await client.admin.command("ping")
+    except PyMongoError as e:
+        pytest.skip(f"DocumentDB is not reachable: {e}")
+
+    database = client[EXPLAIN_DATABASE]
+    try:
+        # The planner only explains the collections that exist
+        for collection in QUERY_INDEXES:
+            await database[collection.Settings.name].insert_one({"_id": ObjectId()})
+        await sync_indexes(database)
+
+        plans = []
+        for method, queries in recorded.items():
+            for query in queries:
+                # Reads of whole collections scan them by design
+                if not query.filter and query.sort is None:
+                    continue
+
+                cursor = database[query.collection.Settings.name].find(query.filter)
+                if query.sort:
+                    cursor = cursor.sort(query.sort, 1)
+                explained = await cursor.explain()
+                plans.append((method, query, explained["queryPlanner"]["winningPlan"]))
+        return plans
+    finally:
+        await client.drop_database(EXPLAIN_DATABASE)
+        client.close()
+
+
+def test_manager_queries__no_collection_scan():
+    plans = asyncio.run(explain_manager_queries())
+    scans = [
+        (method, query)
+        for method, query, plan in plans
+        if find_stages(plan, "COLLSCAN")
+    ]
+    assert scans == []
@@ -0,0 +1,613 @@
+"""Record the queries the managers send to DocumentDB, without a database"""
+
+from __future__ import annotations
+
+import inspect
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable
+
+from beanie import Document, PydanticObjectId
+
+from pipes.apikeys.manager import APIKeyManager, apikey_cache
+from pipes.apikeys.schemas import APIKeyCreate, APIKeyScope
+from pipes.catalogdatasets.manager import CatalogDatasetManager
+from pipes.catalogmodels.manager import CatalogModelManager
+from pipes.datasets.manager import DatasetManager
+from pipes.db.document import DocumentDB, use_docdb
+from pipes.db.indexes import Query, pipeline_queries
+from pipes.db.pagination import Page, PageParams
+from pipes.handoffs.manager import HandoffManager
+from pipes.handoffs.schemas import HandoffDocument
+from pipes.handoffs.validators import HandoffDomainValidator
+from pipes.jobs.manager import CONTEXT_LEVELS, JobManager
+from pipes.jobs.schemas import JobDocument, JobStatus, JobStep, JobType
+from pipes.modelruns.contexts import ModelRunSimpleContext
+from pipes.modelruns.manager import ModelRunManager
+from pipes.modelruns.validators import ModelRunContextValidator
+from pipes.models.manager import ModelManager
+from pipes.models.schemas import ModelDocument
+from pipes.models.validators import ModelDomainValidator
+from pipes.projectruns.manager import ProjectRunManager
+from pipes.projectruns.schemas import ProjectRunDocument
+from pipes.projects.access import ProjectAccessManager
+from pipes.projects.exports import ProjectExportManager
+from pipes.projects.imports import ProjectImportManager
+from pipes.projects.manager import ProjectManager
+from pipes.projects.validators import ProjectUpdateDomainValidator
+from pipes.tasks.manager import TaskManager
+from pipes.teams.manager import TeamManager
+from pipes.teams.schemas import TeamDocument
+from pipes.users.manager import UserManager
+from pipes.users.schemas import UserDocument
+
+
+class RecordingCollection:
+    """Raw collection of the shared versions, by `_id` only, not recorded"""
+
+    async def find_one(self, *args, **kwargs) -> None:
+        return None
+
+    async def find_one_and_update(self, *args, **kwargs) -> dict:
+        return {"version": 0}
+
+
+class RecordingDocumentDB(DocumentDB):
+    """DocumentDB recording the filter of each query, and finding no document.
+
+    Documents found by `find_one`, `find_one_and_update` and `upsert_one` are
+    given per collection in `documents`. Distinct values are read from whole
+    collections, they are not recorded.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.queries: list[Query] = []
+        self.documents: dict[type[Document], Document] = {}
+
+    def record(
+        self,
+        collection: type[Document],
+        query: dict | None,
+        sort: str | None = None,
+    ) -> None:
+        self.queries.append(Query(collection, query or {}, sort=sort))
+
+    @property
+    def database(self) -> dict:
+        return {"versions": RecordingCollection()}
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield None
+
+    async def get(self, collection, id):
+        return None
+
+    async def insert(self, instance):
+        return instance
+
+    async def insert_many(self, collection, instances, session=None):
+        return [instance.id for instance in instances]
+
+    async def find_one(self, collection, query, projection=None):
+        self.record(collection, query)
+        return self.documents.get(collection)
+
+    async def exists(self, collection, query):
+        self.record(collection, query)
+        return False
+
+    async def exists_many(self, collection, field, values, query=None):
+        self.record(collection, {**(query or {}), field: {"$in": list(values)}})
+        return set()
+
+    async def find_all(self, collection, query=None, projection=None):
+        self.record(collection, query)
+        return []
+
+    async def iter_all(self, collection, query=None, projection=None):
+        self.record(collection, query)
+        return
+        yield
+
+    async def iter_raw(self, collection, query, projection=None, batch_size=None):
+        self.record(collection, query)
+        return
+        yield
+
+    async def find_page(self, collection, query=None, page=None, projection=None):
+        paginate = page is not None and page.paginate
+        self.record(collection, query, sort="_id" if paginate else None)
+        return Page(data=[])
+
+    async def aggregate(self, collection, pipeline):
+        self.queries.extend(pipeline_queries(collection, pipeline))
+        return []
+
+    async def distinct(self, collection, field, query=None):
+        return []
+
+    async def update_one(self, collection, find, update):
+        self.record(collection, find)
+        return SimpleNamespace(matched_count=1, modified_count=1)
+
+    async def find_one_and_update(self, collection, find, update):
+        self.record(collection, find)
+        return self.documents.get(collection)
+
+    async def upsert_one(self, collection, find, update):
+        self.record(collection, find)
+        return self.documents.get(collection)
+
+    async def delete_one(self, collection, query):
+        self.record(collection, query)
+        return 0
+
+    async def delete_many(self, collection, query):
+        self.record(collection, query)
+        return 0
+
+
+class Fields(SimpleNamespace):
+    """Input of a manager method, its fields not given are None"""
+
+    def __getattr__(self, name: str) -> None:
+        return None
+
+    def model_dump(self, **kwargs) -> dict:
+        return {}
+
+
+def construct(collection: type[Document], **fields: Any) -> Document:
+    """Document with an id and the given fields, without validation"""
+    return collection.model_construct(id=PydanticObjectId(), **fields)
+
+
+def make_context(*levels: str) -> SimpleNamespace:
+    """Context documents of the levels, named after their level"""
+    context = SimpleNamespace()
+    for i, level in enumerate(levels):
+        parents = {parent: getattr(context, parent).id for parent in levels[:i]}
+        doc = construct(
+            CONTEXT_LEVELS[level][0],
+            name=level,
+            context=SimpleNamespace(**parents),
+        )
+        setattr(context, level, doc)
+    return context
+
+
+def get_manager_calls(docdb: RecordingDocumentDB) -> list[tuple[str, Callable]]:
+    """Calls of the manager methods sending queries, by method name.
+
+    The orphans sweep job is left out, it reads the context ids of whole
+    collections by design.
+    """
+    user = construct(
+        UserDocument,
+        email="user@example.com",
+        username="user",
+        is_active=True,
+        is_superuser=False,
+    )
+    p_context = make_context("project")
+    pr_context = make_context("project", "projectrun")
+    m_context = make_context("project", "projectrun", "model")
+    mr_context = make_context("project", "projectrun", "model", "modelrun")
+    p_doc, pr_doc = pr_context.project, pr_context.projectrun
+    m_doc = m_context.model
+    page = PageParams()
+
+    def named(name: str, **fields: Any) -> Fields:
+        return Fields(name=name, **fields)
+
+    def found(collection: type[Document], doc: Document, call: Callable) -> Callable:
+        def call_found():
+            docdb.documents[collection] = doc
+            return call()
+
+        return call_found
+
+    def job(*steps: JobStep) -> JobDocument:
+        return construct(
+            JobDocument,
+            type=JobType.delete_project,
+            status=JobStatus.pending,
+            steps=list(steps),
+            created_at=datetime.now(),
+        )
+
+    context = {"project": p_doc.id, "projectrun": pr_doc.id}
+    delete_job = job(
+        JobStep(collection="projects", document=p_doc.id),
+        JobStep(collection="models", context=context),
+    )
+    project_update = named(
+        "p2",
+        owner=named("owner", email="owner@example.com"),
+        scheduled_start=datetime(2025, 1, 1),
+        scheduled_end=datetime(2025, 12, 31),
+        scenarios=[],
+    )
+
+    return [
+        # projects
+        (
+            "ProjectManager._create_project_document",
+            lambda: ProjectManager()._create_project_document(
+                named("p1"),
+                user,
+                user,
+            ),
+        ),
+        (
+            "ProjectManager.get_basic_projects",
+            lambda: ProjectManager().get_basic_projects(user, page),
+        ),
+        (
+            "ProjectManager.iter_basic_projects",
+            lambda: ProjectManager().iter_basic_projects(user),
+        ),
+        (
+            "ProjectManager.update_project",
+            lambda: ProjectManager().update_project(p_doc, project_update, user),
+        ),
+        (
+            "ProjectUpdateDomainValidator.get_dependency_data",
+            lambda: ProjectUpdateDomainValidator().get_dependency_data(p_doc),
+        ),
+        (
+            "ProjectAccessManager.update_access",
+            lambda: ProjectAccessManager().update_access(p_doc.id),
+        ),
+        (
+            "ProjectAccessManager.rebuild_access",
+            lambda: ProjectAccessManager().rebuild_access(missing_only=True),
+        ),
+        (
+            "ProjectExportManager.iter_records",
+            lambda: ProjectExportManager(p_doc).iter_records(),
+        ),
+        # project runs
+        (
+            "ProjectRunManager._create_projectrun_document",
+            lambda: ProjectRunManager(p_context)._create_projectrun_document(
+                named("pr1"),
+                user,
+            ),
+        ),
+        (
+            "ProjectRunManager.get_projectruns",
+            lambda: ProjectRunManager(p_context).get_projectruns(),
+        ),
+        (
+            "ProjectRunManager.get_projectrun",
+            lambda: ProjectRunManager(p_context).get_projectrun("pr1"),
+        ),
+        (
+            "ProjectRunManager.update_projectrun",
+            found(
+                ProjectRunDocument,
+                pr_doc,
+                lambda: ProjectRunManager(p_context).update_projectrun(
+                    "pr1",
+                    named(
+                        "pr1",
+                        scheduled_start=datetime(2025, 1, 1),
+                        scheduled_end=datetime(2025, 12, 31),
+                        scenarios=[],
+                    ),
+                    user,
+                ),
+            ),
+        ),
+        # teams
+        (
+            "TeamManager._create_team_document",
+            lambda: TeamManager(p_context)._create_team_document(named("t1"), []),
+        ),
+        ("TeamManager.get_team", lambda: TeamManager(p_context).get_team("t1")),
+        ("TeamManager.get_all_teams", lambda: TeamManager(p_context).get_all_teams()),
+        (
+            "TeamManager.update_team",
+            found(
+                TeamDocument,
+                construct(TeamDocument, name="t1"),
+                lambda: TeamManager(p_context).update_team("t1", named("t2")),
+            ),
+        ),
+        ("TeamManager.delete_team", lambda: TeamManager(p_context).delete_team("t1")),
+        # models
+        (
+            "ModelManager._create_model_document",
+            lambda: ModelManager(pr_context)._create_model_document(
+                named("m1", modeling_team="t1"),
+                user,
+            ),
+        ),
+        (
+            "ModelManager.get_models",
+            lambda: ModelManager(p_context).get_models(page),
+        ),
+        (
+            "ModelManager.get_models",
+            lambda: ModelManager(pr_context).get_models(page),
+        ),
+        (
+            "ModelManager.iter_models",
+            lambda: ModelManager(p_context).iter_models(),
+        ),
+        (
+            "ModelManager.iter_models",
+            lambda: ModelManager(pr_context).iter_models(),
+        ),
+        ("ModelManager.get_model", lambda: ModelManager(p_context).get_model("m1")),
+        ("ModelManager.get_model", lambda: ModelManager(pr_context).get_model("m1")),
+        (
+            "ModelManager.update_model",
+            lambda: ModelManager(pr_context).update_model(
+                m_doc,
+                named("m2"),
+                user,
+            ),
+        ),
+        (
+            "ModelManager.delete_model",
+            lambda: ModelManager(pr_context).delete_model(p_doc, pr_doc, "m1"),
+        ),
+        (
+            "ModelDomainValidator.find_duplicate_scenario",
+            lambda: ModelDomainValidator(pr_context).find_duplicate_scenario(),
+        ),
+        # model runs
+        (
+            "ModelRunManager._create_modelrun_document",
+            lambda: ModelRunManager(m_context)._create_modelrun_document(
+                named("mr1"),
+                user,
+            ),
+        ),
+        (
+            "ModelRunManager.get_modelruns",
+            lambda: ModelRunManager(p_context).get_modelruns(page),
+        ),
+        (
+            "ModelRunManager.get_modelruns",
+            lambda: ModelRunManager(pr_context).get_modelruns(page),
+        ),
+        (
+            "ModelRunManager.iter_modelruns",
+            lambda: ModelRunManager(pr_context).iter_modelruns(),
+        ),
+        (
+            "ModelRunManager.get_modelruns",
+            lambda: ModelRunManager(m_context).get_modelruns(page),
+        ),
+        # datasets
+        (
+            "DatasetManager._create_dataset_document",
+            lambda: DatasetManager(mr_context)._create_dataset_document(
+                named("d1"),
+                user,
+                user,
+            ),
+        ),
+        (
+            "DatasetManager.get_dataset_document",
+            lambda: DatasetManager(mr_context).get_dataset_document("d1"),
+        ),
+        (
+            "DatasetManager.get_dataset",
+            lambda: DatasetManager(mr_context).get_dataset("d1"),
+        ),
+        (
+            "DatasetManager.get_datasets",
+            lambda: DatasetManager(mr_context).get_datasets(page),
+        ),
+        # tasks
+        ("TaskManager.get_tasks", lambda: TaskManager(mr_context).get_tasks(page)),
+        (
+            "TaskManager.update_task_status",
+            lambda: TaskManager(mr_context).update_task_status("t1", "pending"),
+        ),
+        # handoffs
+        (
+            "HandoffManager.get_handoffs",
+            lambda: HandoffManager(p_context).get_handoffs(page=page),
+        ),
+        (
+            "HandoffManager.get_handoffs",
+            lambda: HandoffManager(pr_context).get_handoffs(page=page),
+        ),
+        (
+            "HandoffManager.get_handoffs",
+            found(
+                ModelDocument,
+                m_doc,
+                lambda: HandoffManager(pr_context).get_handoffs("m1", page=page),
+            ),
+        ),
+        (
+            "HandoffManager.iter_handoffs",
+            lambda: HandoffManager(pr_context).iter_handoffs(),
+        ),
+        (
+            "HandoffManager.get_handoff_by_name",
+            lambda: HandoffManager(pr_context).get_handoff_by_name("h1"),
+        ),
+        (
+            "HandoffManager.update_handoff",
+            lambda: HandoffManager(pr_context).update_handoff(
+                construct(HandoffDocument, name="h1"),
+                named("h2"),
+                user,
+            ),
+        ),
+        (
+            "HandoffManager.delete_handoff",
+            lambda: HandoffManager(pr_context).delete_handoff(
+                p_doc.id,
+                pr_doc.id,
+                "h1",
+            ),
+        ),
+        (
+            "HandoffDomainValidator.find_model",
+            lambda: HandoffDomainValidator(pr_context).find_model("m1"),
+        ),
+        (
+            "HandoffDomainValidator.find_modelrun",
+            lambda: HandoffDomainValidator(pr_context).find_modelrun(m_doc, "mr1"),
+        ),
+        # contexts, all levels looked up in one pipeline
+        (
+            "ModelRunContextValidator.aggregate_documents",
+            lambda: ModelRunContextValidator().aggregate_documents(
+                ModelRunSimpleContext(
+                    project="project",
+                    projectrun="projectrun",
+                    model="model",
+                    modelrun="modelrun",
+                ),
+            ),
+        ),
+        # users
+        (
+            "UserManager.create_user",
+            lambda: UserManager().create_user(named("u1", email="u1@example.com")),
+        ),
+        (
+            "UserManager.get_or_create_user",
+            lambda: UserManager().get_or_create_user(
+                named("u1", email="u1@example.com"),
+            ),
+        ),
+        (
+            "UserManager.upsert_cognito_user",
+            lambda: UserManager().upsert_cognito_user(
+                named("u1", email="u1@example.com", username="u1"),
+            ),
+        ),
+        ("UserManager.get_all_users", lambda: UserManager().get_all_users(page)),
+        (
+            "UserManager.get_user_by_email",
+            lambda: UserManager().get_user_by_email("u1@example.com"),
+        ),
+        (
+            "UserManager.get_user_by_username",
+            lambda: UserManager().get_user_by_username("u1"),
+        ),
+        # catalog
+        (
+            "CatalogModelManager._create_model_document",
+            lambda: CatalogModelManager()._create_model_document(named("cm1"), user),
+        ),
+        (
+            "CatalogModelManager.get_models",
+            lambda: CatalogModelManager().get_models(user, page),
+        ),
+        (
+            "CatalogModelManager.get_model",
+            lambda: CatalogModelManager().get_model("cm1", user),
+        ),
+        (
+            "CatalogModelManager.update_model",
+            lambda: CatalogModelManager().update_model("cm1", named("cm2"), user),
+        ),
+        (
+            "CatalogModelManager.delete_model",
+            lambda: CatalogModelManager().delete_model("cm1", user),
+        ),
+        (
+            "CatalogDatasetManager._create_dataset_document",
+            lambda: CatalogDatasetManager()._create_dataset_document(
+                named("cd1", access_group=[]),
+                user,
+            ),
+        ),
+        (
+            "CatalogDatasetManager.get_datasets",
+            lambda: CatalogDatasetManager().get_datasets(user, page),
+        ),
+        (
+            "CatalogDatasetManager.get_dataset",
+            lambda: CatalogDatasetManager().get_dataset("cd1", user),
+        ),
+        (
+            "CatalogDatasetManager.update_dataset",
+            lambda: CatalogDatasetManager().update_dataset("cd1", named("cd2"), user),
+        ),
+        (
+            "CatalogDatasetManager.delete_dataset",
+            lambda: CatalogDatasetManager().delete_dataset("cd1", user),
+        ),
+        # api keys
+        (
+            "APIKeyManager.create_key",
+            lambda: APIKeyManager().create_key(
+                APIKeyCreate(name="k1", scopes=[APIKeyScope.tasks]),
+                user,
+            ),
+        ),
+        ("APIKeyManager.get_keys", lambda: APIKeyManager().get_keys(user)),
+        ("APIKeyManager.get_key", lambda: APIKeyManager().get_key("k1", user)),
+        (
+            "APIKeyManager.authenticate",
+            lambda: APIKeyManager().authenticate("pipes_key", APIKeyScope.tasks),
+        ),
+        # jobs
+        (
+            "JobManager.run_job",
+            found(JobDocument, delete_job, lambda: JobManager().run_job(delete_job.id)),
+        ),
+        ("JobManager.resume_jobs", lambda: JobManager().resume_jobs()),
+        # imports
+        (
+            "ProjectImportManager.import_project",
+            lambda: ProjectImportManager().import_project(
+                named(
+                    "p1",
+                    owner=named("u1", email="u1@example.com"),
+                    leads=[],
+                    teams=[],
+                ),
+                user,
+            ),
+        ),
+    ]
+
+
+async def record_manager_queries() -> dict[str, list[Query]]:
+    """Drive each manager method once, return the queries sent by each one.
+
+    Calls stop at their first error, a document not found or an invalid input,
+    the queries sent until then are recorded. A call sending no query at all
+    fails, as its queries would not be checked.
+    """
+    docdb = RecordingDocumentDB()
+    await use_docdb(docdb)
+    apikey_cache.clear()
+
+    recorded: dict[str, list[Query]] = {}
+    for name, call in get_manager_calls(docdb):
+        start = len(docdb.queries)
+        try:
+            result = call()
+            if inspect.isasyncgen(result):
+                async for _ in result:
+                    pass
+            else:
+                await result
+        except Exception:
+            pass
+        finally:
+            docdb.documents.clear()
+
+        queries = docdb.queries[start:]
+        if not queries:
+            raise AssertionError(f"{name} sent no query")
+        recorded.setdefault(name, []).extend(queries)
+
+    return recorded
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from beanie import PydanticObjectId
+
+from pipes.apikeys.manager import (
+    APIKeyManager,
+    apikey_cache,
+    digest_api_key,
+    generate_api_key,
+    is_api_key,
+)
+from pipes.apikeys.schemas import APIKeyDocument, APIKeyScope
+from pipes.common.exceptions import APIKeyAuthError, UserPermissionDenied
+from pipes.db.document import DocumentDB
+from pipes.users.schemas import UserDocument
+
+
+@pytest.fixture
+def apikey(monkeypatch):
+    apikey_cache.clear()
+
+    prefix, key = generate_api_key()
+    u_doc = UserDocument.model_construct(
+        id=PydanticObjectId(),
+        email="service@example.com",
+        is_active=True,
+        is_superuser=False,
+    )
+    k_doc = APIKeyDocument.model_construct(
+        name="ingest",
+        scopes=[APIKeyScope.datasets, APIKeyScope.tasks],
+        expires_at=None,
+        prefix=prefix,
+        is_active=True,
+        created_at=datetime.now(),
+        user=u_doc.id,
+        digest=digest_api_key(key),
+    )
+    queries = []
+
+    async def find_one(self, collection, query):
+        queries.append(query)
+        if collection is APIKeyDocument and query["digest"] == k_doc.digest:
+            return k_doc
+        return None
+
+    async def get(self, collection, id):
+        return u_doc if id == u_doc.id else None
+
+    monkeypatch.setattr(DocumentDB, "find_one", find_one)
+    monkeypatch.setattr(DocumentDB, "get", get)
+
+    yield key, u_doc, queries, k_doc
+    apikey_cache.clear()
+
+
+def test_authenticate__cached_after_warm_up(apikey):
+    key, u_doc, queries, _ = apikey
+    assert is_api_key(key)
+
+    async def run():
+        manager = APIKeyManager()
+        return [await manager.authenticate(key, APIKeyScope.datasets) for _ in range(5)]
+
+    users = asyncio.run(run())
+    assert all(user is u_doc for user in users)
+    assert len(queries) == 1
+
+
+def test_authenticate__scope_and_invalid_key(apikey):
+    key, _, _, _ = apikey
+    manager = APIKeyManager()
+
+    with pytest.raises(UserPermissionDenied):
+        asyncio.run(manager.authenticate(key, APIKeyScope.modelruns))
+
+    _, other_key = generate_api_key()
+    with pytest.raises(APIKeyAuthError):
+        asyncio.run(manager.authenticate(other_key, APIKeyScope.datasets))
+
+
+def test_invalidate_user__keys_of_updated_user(apikey):
+    key, u_doc, queries, _ = apikey
+    manager = APIKeyManager()
+    asyncio.run(manager.authenticate(key, APIKeyScope.datasets))
+
+    # User deactivated, cached principal dropped
+    u_doc.is_active = False
+    apikey_cache.invalidate_user(PydanticObjectId())
+    apikey_cache.invalidate_user(u_doc.id)
+    with pytest.raises(APIKeyAuthError):
+        asyncio.run(manager.authenticate(key, APIKeyScope.datasets))
+    assert len(queries) == 2
+
+
+@pytest.fixture
+def local_timezone():
+    tz = os.environ.get("TZ")
+
+    def set_timezone(name):
+        os.environ["TZ"] = name
+        time.tzset()
+
+    yield set_timezone
+    if tz is None:
+        os.environ.pop("TZ", None)
+    else:
+        os.environ["TZ"] = tz
+    time.tzset()
+
+
+@pytest.mark.parametrize(
+    "tz, hours, valid",
+    [
+        # Valid in UTC, expired in local time ahead of UTC
+        ("Asia/Tokyo", 1, True),
+        # Expired in UTC, valid in local time behind UTC
+        ("America/Denver", -1, False),
+    ],
+)
+def test_authenticate__expires_at_in_utc(apikey, local_timezone, tz, hours, valid):
+    key, u_doc, _, k_doc = apikey
+    local_timezone(tz)
+
+    # Stored naive in UTC, as parsed by the create schema
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    k_doc.expires_at = now + timedelta(hours=hours)
+
+    manager = APIKeyManager()
+    if valid:
+        assert asyncio.run(manager.authenticate(key, APIKeyScope.datasets)) is u_doc
+        assert apikey_cache.get(k_doc.digest) is not None
+    else:
+        with pytest.raises(APIKeyAuthError):
+            asyncio.run(manager.authenticate(key, APIKeyScope.datasets))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from starlette.datastructures import Headers
+
+from pipes.common.compression import CompressionMiddleware, select_encoding
+
+
+def make_app(
+    chunks: list[bytes],
+    headers: list | None = None,
+    media_type: bytes = b"application/json",
+):
+    async def app(scope, receive, send):
+        raw = [(b"content-type", media_type)] + (headers or [])
+        if len(chunks) == 1:
+            raw.append((b"content-length", str(len(chunks[0])).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": raw})
+        for i, chunk in enumerate(chunks):
+            more_body = i < len(chunks) - 1
+            await send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body},
+            )
+
+    return app
+
+
+def call(app, accept_encoding: str = "gzip, deflate") -> tuple[Headers, list[bytes]]:
+    scope = {
+        "type": "http",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    headers = Headers(raw=messages[0]["headers"])
+    return headers, [message.get("body", b"") for message in messages[1:]]
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding",
+    [
+        ("gzip, deflate, br", "gzip"),
+        ("br;q=1.0, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_select_encoding(accept_encoding, encoding):
+    assert select_encoding(accept_encoding, ["zstd", "br", "gzip"]) == encoding
+
+
+def test_compression__large_response():
+    body = b'{"data": "' + b"x" * 5000 + b'"}'
+    middleware = CompressionMiddleware(make_app([body]), minimum_size=1024)
+    headers, bodies = call(middleware)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(bodies[0]) < len(body)
+    assert gzip.decompress(bodies[0]) == body
+
+
+def test_compression__small_response_untouched():
+    body = b'{"data": "x"}'
+    middleware = CompressionMiddleware(make_app([body]), minimum_size=1024)
+    headers, bodies = call(middleware)
+    assert "content-encoding" not in headers
+    assert bodies == [body]
+
+
+def test_compression__not_accepted_untouched():
+    body = b"x" * 5000
+    middleware = CompressionMiddleware(make_app([body]), minimum_size=10)
+    headers, bodies = call(middleware, accept_encoding="identity")
+    assert "content-encoding" not in headers
+    assert bodies == [body]
+
+
+def test_compression__already_encoded_untouched():
+    body = gzip.compress(b"x" * 5000)
+    app = make_app([body], headers=[(b"content-encoding", b"gzip")])
+    headers, bodies = call(CompressionMiddleware(app, minimum_size=10))
+    assert bodies == [body]
+
+
+def test_compression__compressed_media_type_untouched():
+    body = gzip.compress(b"x" * 5000)
+    app = make_app([body], media_type=b"application/gzip")
+    headers, bodies = call(CompressionMiddleware(app, minimum_size=10))
+    assert "content-encoding" not in headers
+    assert bodies == [body]
+
+
+def test_compression__streaming_flushed_per_chunk():
+    chunks = [b'{"name": "d%d"}\n' % i for i in range(3)]
+    middleware = CompressionMiddleware(make_app(chunks), minimum_size=1024)
+    headers, bodies = call(middleware)
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert len(bodies) == 3
+
+    # Each chunk is decodable as soon as received
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk, body in zip(chunks, bodies):
+        assert decompressor.decompress(body) == chunk
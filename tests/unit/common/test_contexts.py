@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+
+from beanie import PydanticObjectId
+
+from pipes.common.contexts import ContextCache
+from pipes.db.document import DocumentDB
+from tests.unit.common.test_validators import (
+    CONTEXT,
+    FakeModelRunContextValidator,
+    FakeProject,
+    make_raw,
+)
+
+
+class FakeVersions:
+    def __init__(self):
+        self.version = None
+        self.reads = 0
+
+    async def find_one(self, query):
+        self.reads += 1
+        return None if self.version is None else {"version": self.version}
+
+    async def find_one_and_update(self, query, update, upsert, return_document):
+        self.version = (self.version or 0) + update["$inc"]["version"]
+        return {"version": self.version}
+
+
+class FakeDocumentDB(DocumentDB):
+    def __init__(self, versions):
+        super().__init__()
+        self.versions = versions
+
+    @property
+    def database(self):
+        return {"versions": self.versions}
+
+
+def make_cache(versions, version_interval=0):
+    return ContextCache(
+        maxsize=10,
+        version_interval=version_interval,
+        docdb=FakeDocumentDB(versions),
+    )
+
+
+def make_docs():
+    p_doc = FakeProject.model_construct(id=PydanticObjectId(), name="p1", leads=[])
+    return {"project": p_doc}
+
+
+def test_get__deep_copies():
+    cache = make_cache(FakeVersions())
+    cache.put(("p1",), make_docs(), cache.generation)
+
+    first = cache.get(("p1",))
+    first["project"].name = "changed"
+    second = cache.get(("p1",))
+    assert second["project"].name == "p1"
+    assert second["project"].id == first["project"].id
+
+
+def test_put__skip_missing_and_cleared():
+    cache = make_cache(FakeVersions())
+
+    cache.put(("p1", "pr1"), {"project": make_docs()["project"], "projectrun": None}, 0)
+    assert cache.get(("p1", "pr1")) is None
+
+    # Cleared while resolving, the resolved documents may be outdated
+    generation = cache.generation
+    cache.clear()
+    cache.put(("p1",), make_docs(), generation)
+    assert cache.get(("p1",)) is None
+
+
+def test_sync_version__other_worker_invalidated():
+    versions = FakeVersions()
+    cache = make_cache(versions)
+    other_cache = make_cache(versions)
+
+    async def run():
+        await cache.sync_version()
+        cache.put(("p1",), make_docs(), cache.generation)
+        await cache.sync_version()
+        cached = cache.get(("p1",)) is not None
+
+        await other_cache.invalidate()
+        await cache.sync_version()
+        return cached, cache.get(("p1",))
+
+    cached, after = asyncio.run(run())
+    assert cached is True
+    assert after is None
+    assert cache.version == other_cache.version == 1
+
+
+def test_sync_version__once_per_interval():
+    versions = FakeVersions()
+    cache = make_cache(versions, version_interval=60)
+
+    async def run():
+        for _ in range(3):
+            await cache.sync_version()
+
+    asyncio.run(run())
+    assert versions.reads == 1
+
+
+def test_resolve_documents__cached_until_invalidated(monkeypatch):
+    aggregations = []
+
+    async def aggregate(self, collection, pipeline):
+        aggregations.append(pipeline)
+        return [make_raw()]
+
+    monkeypatch.setattr(DocumentDB, "aggregate", aggregate)
+    monkeypatch.setattr(
+        FakeModelRunContextValidator,
+        "cache",
+        make_cache(FakeVersions()),
+    )
+
+    async def run():
+        first = await FakeModelRunContextValidator().validate_document(CONTEXT)
+        second = await FakeModelRunContextValidator().validate_document(CONTEXT)
+        await FakeModelRunContextValidator.cache.invalidate()
+        await FakeModelRunContextValidator().validate_document(CONTEXT)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(aggregations) == 2
+    assert second.modelrun.id == first.modelrun.id
+    assert second.modelrun is not first.modelrun
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from beanie import PydanticObjectId
+from bson import ObjectId
+from pydantic import BaseModel, Field, field_validator
+
+from pipes.common.serialization import (
+    FastJSONResponse,
+    construct_read,
+    dump_json,
+    get_type_adapter,
+    json_response,
+)
+from pipes.config.settings import settings
+
+
+class FakeRead(BaseModel):
+    name: str
+    tags: list[str] = []
+    owner: str | None = Field(default=None, alias="owner_name")
+
+    @field_validator("name")
+    @classmethod
+    def validate_name(cls, value):
+        raise AssertionError("read object revalidated")
+
+
+class FakeDocument(FakeRead):
+    secret: str = "hidden"
+
+
+def test_construct_read__no_validation():
+    doc = FakeDocument.model_construct(name="d0", tags=["a"], secret="s")
+    read = construct_read(FakeRead, doc, owner="u0")
+    assert type(read) is FakeRead
+    assert (read.name, read.tags, read.owner) == ("d0", ["a"], "u0")
+    assert not hasattr(read, "secret")
+
+
+def test_dump_json__declared_type_fields_only():
+    doc = FakeDocument.model_construct(name="d0", owner="u0")
+    assert dump_json(doc, FakeRead) == b'{"name":"d0","tags":[],"owner_name":"u0"}'
+    assert (
+        dump_json([doc], list[FakeRead])
+        == b'[{"name":"d0","tags":[],"owner_name":"u0"}]'
+    )
+    assert b"secret" in dump_json(doc)
+
+
+def test_get_type_adapter__cached():
+    assert get_type_adapter(list[FakeRead]) is get_type_adapter(list[FakeRead])
+
+
+def test_json_response__status_code():
+    read = FakeRead.model_construct(name="d0")
+    response = json_response(read, FakeRead, status_code=201)
+    assert response.status_code == 201
+    assert response.media_type == "application/json"
+    assert response.body == b'{"name":"d0","tags":[],"owner_name":null}'
+
+
+def test_fast_json_response__object_ids_and_datetimes():
+    o_id, p_id = ObjectId(), PydanticObjectId()
+    content = {
+        "ids": [o_id, p_id],
+        "at": datetime(2024, 1, 2, 3, 4, 5),
+        "read": FakeRead.model_construct(name="d0"),
+    }
+    assert FastJSONResponse(content).body == (
+        f'{{"ids":["{o_id}","{p_id}"],"at":"2024-01-02T03:04:05",'
+        '"read":{"name":"d0","tags":[],"owner_name":null}}'
+    ).encode("utf-8")
+
+
+def test_fast_json__fallback(monkeypatch):
+    monkeypatch.setattr(settings, "PIPES_FAST_JSON", False)
+    read = FakeRead.model_construct(name="d0")
+    assert (
+        dump_json([read], list[FakeRead])
+        == b'[{"name":"d0","tags":[],"owner_name":null}]'
+    )
+    assert FastJSONResponse({"a": [1, 2]}).body == b'{"a":[1,2]}'
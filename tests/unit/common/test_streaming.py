@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field
+
+from pipes.common.serialization import json_response
+from pipes.common.streaming import (
+    GZIP_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    ndjson_archive_response,
+    ndjson_chunks,
+    ndjson_requested,
+    ndjson_response,
+    read_chunks,
+)
+
+
+class Item(BaseModel):
+    name: str
+
+
+class AliasedItem(BaseModel):
+    item_name: str = Field(alias="itemName")
+
+
+class CountingLoader:
+    def __init__(self):
+        self.clears = 0
+
+    def clear(self):
+        self.clears += 1
+
+
+async def agen(items):
+    for item in items:
+        yield item
+
+
+def test_read_chunks__concurrent_per_chunk():
+    running = []
+    max_running = []
+
+    async def read(doc):
+        running.append(doc)
+        max_running.append(len(running))
+        await asyncio.sleep(0)
+        running.remove(doc)
+        return Item(name=f"item{doc}")
+
+    async def run():
+        loader = CountingLoader()
+        items = [
+            item
+            async for item in read_chunks(agen(range(5)), read, loader, chunk_size=2)
+        ]
+        return items, loader
+
+    items, loader = asyncio.run(run())
+    assert [item.name for item in items] == [f"item{i}" for i in range(5)]
+    assert max(max_running) == 2
+    assert loader.clears == 3
+
+
+def test_read_chunks__without_read():
+    async def run():
+        return [item async for item in read_chunks(agen([Item(name="a")]))]
+
+    assert asyncio.run(run()) == [Item(name="a")]
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (NDJSON_MEDIA_TYPE, True),
+        ("application/json, application/x-ndjson;q=0.9", True),
+        ("application/json", False),
+        (None, False),
+    ],
+)
+def test_ndjson_requested(accept, expected):
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items(ndjson: bool = Depends(ndjson_requested)):
+        if ndjson:
+            return ndjson_response(agen([Item(name="a"), Item(name="b")]))
+        return [Item(name="a"), Item(name="b")]
+
+    client = TestClient(app)
+    headers = {"Accept": accept} if accept else {}
+    response = client.get("/items", headers=headers)
+
+    if expected:
+        assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+        lines = response.text.splitlines()
+        assert [json.loads(line) for line in lines] == [{"name": "a"}, {"name": "b"}]
+    else:
+        assert response.json() == [{"name": "a"}, {"name": "b"}]
+
+
+def test_ndjson_response__same_keys_as_json():
+    app = FastAPI()
+    item = AliasedItem(itemName="a")
+
+    @app.get("/items")
+    async def items(ndjson: bool = Depends(ndjson_requested)):
+        if ndjson:
+            return ndjson_response(agen([item]))
+        return json_response([item])
+
+    client = TestClient(app)
+    ndjson = client.get("/items", headers={"Accept": NDJSON_MEDIA_TYPE})
+    records = client.get("/items").json()
+
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == records
+    assert records == [{"itemName": "a"}]
+
+
+def test_ndjson_chunks__records_per_chunk():
+    async def run():
+        records = agen([{"name": f"r{i}"} for i in range(5)])
+        return [chunk async for chunk in ndjson_chunks(records, chunk_size=2)]
+
+    chunks = asyncio.run(run())
+    assert len(chunks) == 3
+    lines = b"".join(chunks).splitlines()
+    assert [json.loads(line) for line in lines] == [{"name": f"r{i}"} for i in range(5)]
+
+
+def test_ndjson_archive_response():
+    app = FastAPI()
+
+    @app.get("/export")
+    async def export():
+        return ndjson_archive_response(
+            agen([{"name": "a"}, Item(name="b")]), "p.ndjson.gz"
+        )
+
+    response = TestClient(app).get("/export", headers={"Accept-Encoding": "identity"})
+    assert response.headers["content-type"] == GZIP_MEDIA_TYPE
+    assert 'filename="p.ndjson.gz"' in response.headers["content-disposition"]
+    lines = gzip.decompress(response.content).splitlines()
+    assert [json.loads(line) for line in lines] == [{"name": "a"}, {"name": "b"}]
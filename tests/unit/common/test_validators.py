@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from beanie import Document, PydanticObjectId
+
+from pipes.common.contexts import ContextCache
+from pipes.common.exceptions import ContextValidationError, DomainValidationError
+from pipes.common.validators import DomainValidator
+from pipes.db.document import DocumentDB
+from pipes.handoffs.validators import HandoffDomainValidator
+from pipes.modelruns.contexts import ModelRunSimpleContext
+from pipes.modelruns.validators import ModelRunContextValidator
+
+
+class FakeDoc(Document):
+    """Document constructed without beanie initialization"""
+
+    name: str
+    context: dict = {}
+
+    @classmethod
+    def model_validate(cls, data):
+        return cls.model_construct(**data)
+
+
+class FakeProject(FakeDoc):
+    class Settings:
+        name = "projects"
+
+
+class FakeProjectRun(FakeDoc):
+    class Settings:
+        name = "projectruns"
+
+
+class FakeModel(FakeDoc):
+    class Settings:
+        name = "models"
+
+
+class FakeModelRun(FakeDoc):
+    class Settings:
+        name = "modelruns"
+
+
+class FakeModelRunContextValidator(ModelRunContextValidator):
+    cache = ContextCache(maxsize=0)
+    context_levels = [
+        ("project", FakeProject),
+        ("projectrun", FakeProjectRun),
+        ("model", FakeModel),
+        ("modelrun", FakeModelRun),
+    ]
+
+
+CONTEXT = ModelRunSimpleContext(
+    project="p1",
+    projectrun="pr1",
+    model="m1",
+    modelrun="mr1",
+)
+
+
+def make_raw(modelrun=True, model_parent=None):
+    p_id, pr_id, m_id = PydanticObjectId(), PydanticObjectId(), PydanticObjectId()
+    raw = {
+        "_id": p_id,
+        "name": "p1",
+        "projectrun": {"_id": pr_id, "name": "pr1", "context": {"project": p_id}},
+        "model": {
+            "_id": m_id,
+            "name": "m1",
+            "context": {"project": p_id, "projectrun": model_parent or pr_id},
+        },
+    }
+    if modelrun:
+        raw["modelrun"] = {
+            "_id": PydanticObjectId(),
+            "name": "mr1",
+            "context": {"project": p_id, "projectrun": pr_id, "model": m_id},
+        }
+    return raw
+
+
+@pytest.fixture
+def aggregations(monkeypatch):
+    """Serve the aggregation from the raw document put in result"""
+    calls = []
+    result = {}
+
+    async def aggregate(self, collection, pipeline):
+        calls.append((collection, pipeline))
+        return [result["raw"]] if "raw" in result else []
+
+    monkeypatch.setattr(DocumentDB, "aggregate", aggregate)
+    return calls, result
+
+
+def test_context_pipeline__lookup_per_level():
+    pipeline = FakeModelRunContextValidator().get_context_pipeline(CONTEXT)
+
+    assert pipeline[0] == {"$match": {"name": "p1"}}
+    lookups = [stage["$lookup"] for stage in pipeline if "$lookup" in stage]
+    assert [(lookup["from"], lookup["let"]["parent"]) for lookup in lookups] == [
+        ("projectruns", "$_id"),
+        ("models", "$projectrun._id"),
+        ("modelruns", "$model._id"),
+    ]
+
+    # Only the document of the level name is joined, matched by the index
+    [match, limit] = lookups[-1]["pipeline"]
+    assert match["$match"] == {
+        "name": "mr1",
+        "$expr": {"$eq": ["$context.model", "$$parent"]},
+    }
+    assert limit == {"$limit": 1}
+
+
+def test_validate_document__one_round_trip(aggregations):
+    calls, result = aggregations
+    result["raw"] = make_raw()
+
+    validator = FakeModelRunContextValidator()
+    mr_context = asyncio.run(validator.validate_document(CONTEXT))
+
+    assert len(calls) == 1
+    assert calls[0][0] is FakeProject
+    assert mr_context.project.name == "p1"
+    assert mr_context.modelrun.name == "mr1"
+    assert mr_context.modelrun.context["model"] == mr_context.model.id
+
+
+def test_validate_document__missing_level(aggregations):
+    _, result = aggregations
+    result["raw"] = make_raw(modelrun=False)
+
+    validator = FakeModelRunContextValidator()
+    with pytest.raises(ContextValidationError, match="model run 'mr1'"):
+        asyncio.run(validator.validate_document(CONTEXT))
+
+
+def test_validate_document__not_under_parent(aggregations):
+    _, result = aggregations
+    result["raw"] = make_raw(model_parent=PydanticObjectId())
+
+    validator = FakeModelRunContextValidator()
+    with pytest.raises(ContextValidationError, match="model 'm1'"):
+        asyncio.run(validator.validate_document(CONTEXT))
+
+
+def test_validate_document__missing_project(aggregations):
+    validator = FakeModelRunContextValidator()
+    with pytest.raises(ContextValidationError, match="project 'p1'"):
+        asyncio.run(validator.validate_document(CONTEXT))
+
+
+class FakeDomainValidator(DomainValidator):
+    """Validation methods recording their start and end"""
+
+    validator_dependencies = {
+        "validate_c": ["validate_a"],
+        "validate_d": ["validate_c", "validate_b"],
+    }
+
+    def __init__(self, fail=()):
+        self.fail = fail
+        self.calls = []
+
+    async def check(self, name):
+        self.calls.append(f"{name} start")
+        await asyncio.sleep(0)
+        self.calls.append(f"{name} end")
+        if name in self.fail:
+            raise DomainValidationError(f"{name} failed")
+
+    async def validate_a(self, instance):
+        await self.check("a")
+        return instance
+
+    async def validate_b(self, instance):
+        await self.check("b")
+        return instance
+
+    async def validate_c(self, instance):
+        await self.check("c")
+        return instance
+
+    async def validate_d(self, instance):
+        await self.check("d")
+        return instance
+
+
+def test_validator_stages__registered_by_dependencies():
+    stages = [
+        [method.__name__ for method in stage]
+        for stage in FakeDomainValidator.validator_stages
+    ]
+    assert stages == [["validate_a", "validate_b"], ["validate_c"], ["validate_d"]]
+
+    stages = [
+        [method.__name__ for method in stage]
+        for stage in HandoffDomainValidator.validator_stages
+    ]
+    assert stages == [
+        ["validate_from_model", "validate_to_model"],
+        [
+            "validate_from_modelrun",
+            "validate_scheduled_end",
+            "validate_scheduled_start",
+        ],
+    ]
+
+
+def test_validator_stages__missing_dependency():
+    with pytest.raises(TypeError, match="missing validator 'validate_x'"):
+
+        class MissingDomainValidator(DomainValidator):
+            validator_dependencies = {"validate_a": ["validate_x"]}
+
+            async def validate_a(self, instance):
+                return instance
+
+
+def test_validate__independent_validators_concurrent():
+    validator = FakeDomainValidator()
+    instance = object()
+
+    assert asyncio.run(validator.validate(instance)) is instance
+    assert validator.calls == [
+        "a start",
+        "b start",
+        "a end",
+        "b end",
+        "c start",
+        "c end",
+        "d start",
+        "d end",
+    ]
+
+
+def test_validate__first_error_in_name_order():
+    validator = FakeDomainValidator(fail=("a", "b"))
+
+    with pytest.raises(DomainValidationError, match="a failed"):
+        asyncio.run(validator.validate(object()))
+
+    # Later stages do not run after an error
+    assert "c start" not in validator.calls
+
+
+def test_validate__transformed_instance_rejected():
+    class CopyDomainValidator(FakeDomainValidator):
+        async def validate_b(self, instance):
+            return dict(instance)
+
+    with pytest.raises(TypeError, match="'validate_b' of CopyDomainValidator"):
+        asyncio.run(CopyDomainValidator().validate({"name": "m1"}))
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+
+from beanie.odm.utils.projection import get_projection
+from bson import ObjectId
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from pipes.db.document import DocumentDB, current_docdb, get_docdb, use_docdb
+from pipes.db.manager import AbstractObjectManager
+from pipes.db.pagination import PageParams, decode_cursor
+from pipes.projects.schemas import ProjectBasicProjection
+from pipes.users.schemas import UserEmailProjection, UserRead
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = list(docs)
+        self.sorts = []
+        self.limits = []
+
+    def sort(self, key, direction):
+        self.sorts.append((key, direction))
+        self.docs.sort(key=lambda doc: doc[key], reverse=direction < 0)
+        return self
+
+    def limit(self, limit):
+        self.limits.append(limit)
+        self.docs = self.docs[:limit]
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs[:length]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.docs:
+            raise StopAsyncIteration
+        return self.docs.pop(0)
+
+
+class FakeMotorCollection:
+    """Record raw queries sent to the collection"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    async def find_one(self, query, projection=None):
+        self.calls.append(("find_one", query, projection))
+        return {"_id": 1} if self.docs else None
+
+    def find(self, query, projection=None):
+        self.calls.append(("find", query, projection))
+        docs = self.docs
+        if "$and" in query or "_id" in query:
+            after = (query["$and"][1] if "$and" in query else query)["_id"]["$gt"]
+            docs = [doc for doc in docs if doc["_id"] > after]
+        return FakeCursor(docs)
+
+
+class FakeQuery:
+    def __init__(self, result):
+        self.result = result
+
+    def __await__(self):
+        async def _result():
+            return self.result
+
+        return _result().__await__()
+
+    async def to_list(self):
+        return self.result
+
+    async def __aiter__(self):
+        for doc in self.result:
+            yield doc
+
+
+class FakeDocument:
+    motor_collection = None
+    calls: list = []
+    docs: list = []
+
+    @classmethod
+    def get_motor_collection(cls):
+        return cls.motor_collection
+
+    @classmethod
+    def find(cls, *args, projection_model=None):
+        cls.calls.append(("find", args, projection_model))
+        return FakeQuery(list(cls.docs))
+
+    @classmethod
+    def find_one(cls, *args, projection_model=None):
+        cls.calls.append(("find_one", args, projection_model))
+        return FakeQuery(None)
+
+
+def test_exists__id_projection():
+    FakeDocument.motor_collection = FakeMotorCollection([{"_id": 1}])
+    docdb = DocumentDB()
+
+    assert asyncio.run(docdb.exists(FakeDocument, {"name": "p1"}))
+    assert FakeDocument.motor_collection.calls == [
+        ("find_one", {"name": "p1"}, {"_id": 1}),
+    ]
+
+
+def test_exists_many__single_query():
+    docs = [{"context": {"name": "m1"}}, {"context": {"name": "m3"}}]
+    FakeDocument.motor_collection = FakeMotorCollection(docs)
+    docdb = DocumentDB()
+
+    existing = asyncio.run(
+        docdb.exists_many(
+            FakeDocument,
+            field="context.name",
+            values=["m1", "m2", "m3"],
+            query={"project": "p1"},
+        ),
+    )
+    assert existing == {"m1", "m3"}
+    assert FakeDocument.motor_collection.calls == [
+        (
+            "find",
+            {"project": "p1", "context.name": {"$in": ["m1", "m2", "m3"]}},
+            {"_id": 0, "context.name": 1},
+        ),
+    ]
+
+
+def test_find__projection_model():
+    FakeDocument.calls = []
+    docdb = DocumentDB()
+
+    async def run():
+        await docdb.find_all(FakeDocument, projection=ProjectBasicProjection)
+        await docdb.find_all(FakeDocument, {"name": "p1"}, projection=UserRead)
+        await docdb.find_one(FakeDocument, {"name": "p1"}, projection=UserRead)
+        await docdb.find_all(FakeDocument, {"name": "p1"})
+
+    asyncio.run(run())
+    assert FakeDocument.calls == [
+        ("find", (), ProjectBasicProjection),
+        ("find", ({"name": "p1"},), UserRead),
+        ("find_one", ({"name": "p1"},), UserRead),
+        ("find", ({"name": "p1"},), None),
+    ]
+
+
+def test_project_basic_projection__fields():
+    assert get_projection(ProjectBasicProjection) == {
+        "_id": 1,
+        "name": 1,
+        "title": 1,
+        "description": 1,
+        "owner": 1,
+        "milestones": 1,
+        "created_at": 1,
+    }
+
+
+def test_find_page__keyset():
+    ids = [ObjectId() for _ in range(5)]
+    docs = [{"_id": _id, "email": f"u{i}@pipes.org"} for i, _id in enumerate(ids)]
+    FakeDocument.motor_collection = FakeMotorCollection(docs)
+    docdb = DocumentDB()
+
+    async def run():
+        page1 = await docdb.find_page(
+            FakeDocument,
+            {"is_active": True},
+            page=PageParams(limit=2),
+            projection=UserEmailProjection,
+        )
+        after = decode_cursor(page1.next_cursor)
+        page2 = await docdb.find_page(
+            FakeDocument,
+            {"is_active": True},
+            page=PageParams(limit=3, after=after),
+            projection=UserEmailProjection,
+        )
+        return page1, page2
+
+    page1, page2 = asyncio.run(run())
+    assert [u.id for u in page1.data] == ids[:2]
+    assert decode_cursor(page1.next_cursor) == ids[1]
+    assert [u.id for u in page2.data] == ids[2:]
+    assert page2.next_cursor is None
+    assert FakeDocument.motor_collection.calls == [
+        ("find", {"is_active": True}, {"_id": 1, "email": 1}),
+        (
+            "find",
+            {"$and": [{"is_active": True}, {"_id": {"$gt": ids[1]}}]},
+            {"_id": 1, "email": 1},
+        ),
+    ]
+
+
+def test_find_page__unpaginated():
+    FakeDocument.calls = []
+    docdb = DocumentDB()
+
+    page = asyncio.run(
+        docdb.find_page(FakeDocument, {"name": "p1"}, page=PageParams(paginate=False)),
+    )
+    assert page.data == []
+    assert page.next_cursor is None
+    assert FakeDocument.calls == [("find", ({"name": "p1"},), None)]
+
+
+def test_iter_all__cursor_iteration():
+    FakeDocument.calls = []
+    FakeDocument.docs = [1, 2, 3]
+    docdb = DocumentDB()
+
+    async def run():
+        return [doc async for doc in docdb.iter_all(FakeDocument, projection=UserRead)]
+
+    try:
+        assert asyncio.run(run()) == [1, 2, 3]
+    finally:
+        FakeDocument.docs = []
+    assert FakeDocument.calls == [("find", ({},), UserRead)]
+
+
+def test_use_docdb__injected_into_managers():
+    request_docdb = DocumentDB()
+    app = FastAPI(dependencies=[Depends(use_docdb)])
+
+    @app.get("/docdb")
+    async def docdb_route():
+        manager = AbstractObjectManager()
+        return {"injected": manager.d is request_docdb}
+
+    app.dependency_overrides[get_docdb] = lambda: request_docdb
+    response = TestClient(app).get("/docdb")
+
+    assert response.json() == {"injected": True}
+    # Out of request, the application instance
+    assert current_docdb() is get_docdb()
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from pipes.db.indexes import (
+    MODEL,
+    PROJECT,
+    PROJECTRUN,
+    QUERY_INDEXES,
+    QUERY_SHAPES,
+    Query,
+    QueryShape,
+    compound,
+    covers,
+    find_covering_index,
+    get_indexes,
+    pipeline_queries,
+    query_shapes,
+    sync_indexes,
+)
+from pipes.jobs.schemas import JobDocument
+from pipes.modelruns.schemas import ModelRunDocument
+from pipes.models.schemas import ModelDocument
+from pipes.projectruns.schemas import ProjectRunDocument
+from pipes.projects.schemas import ProjectDocument
+from tests.recorder import record_manager_queries
+
+
+class FakeCollection:
+    def __init__(self, indexes):
+        self.indexes = {"_id_": {"key": [("_id", 1)]}}
+        self.indexes.update(indexes)
+
+    async def index_information(self):
+        return dict(self.indexes)
+
+    async def create_indexes(self, indexes):
+        for index in indexes:
+            self.indexes[index.document["name"]] = dict(index.document)
+
+    async def drop_index(self, name):
+        del self.indexes[name]
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection({})
+        return self[name]
+
+
+def test_query_shapes__covered_by_index():
+    uncovered = [shape for shape in QUERY_SHAPES if find_covering_index(shape) is None]
+    assert uncovered == []
+
+
+def test_query_shapes__all_collections():
+    assert {shape.collection for shape in QUERY_SHAPES} == set(QUERY_INDEXES)
+
+
+def shape_key(shape: QueryShape) -> tuple:
+    """Shapes match whatever the order of their fields"""
+    return shape.collection, frozenset(shape.fields), shape.sort
+
+
+@pytest.fixture(scope="module")
+def recorded_shapes() -> dict[tuple, set[str]]:
+    """Shapes of the queries recorded from the managers, with the methods sending them"""
+    recorded = asyncio.run(record_manager_queries())
+
+    shapes = {}
+    for method, queries in recorded.items():
+        for query in queries:
+            for shape in query_shapes(query):
+                shapes.setdefault(shape_key(shape), set()).add(method)
+    return shapes
+
+
+def test_query_shapes__recorded_queries_declared(recorded_shapes):
+    declared = {shape_key(shape) for shape in QUERY_SHAPES}
+    undeclared = {
+        shape: methods
+        for shape, methods in recorded_shapes.items()
+        if shape not in declared
+    }
+    assert undeclared == {}
+
+
+def test_query_shapes__declared_used_by_managers(recorded_shapes):
+    unused = [
+        shape for shape in QUERY_SHAPES if shape_key(shape) not in recorded_shapes
+    ]
+    assert unused == []
+
+
+def test_query_shapes__context_lookups_recorded(recorded_shapes):
+    # find_one of the managers on the context fields and name
+    shape = QueryShape(ModelDocument, (PROJECT, PROJECTRUN, "name"))
+    assert "ModelManager.get_model" in recorded_shapes[shape_key(shape)]
+
+    # $lookup of the context pipeline, on the parent field and name
+    shape = QueryShape(ModelRunDocument, (MODEL, "name"))
+    assert recorded_shapes[shape_key(shape)] == {
+        "ModelRunContextValidator.aggregate_documents",
+    }
+
+
+def test_query_shapes__or_branches_and_id_lookups():
+    query = Query(JobDocument, {"_id": ObjectId(), "$or": [{"status": "pending"}]})
+    assert query_shapes(query) == []
+    assert query_shapes(Query(ProjectDocument, {})) == []
+
+    query = Query(
+        ModelDocument,
+        {PROJECT: ObjectId(), "$or": [{"a": 1}, {"b": 2}]},
+        sort="_id",
+    )
+    assert query_shapes(query) == [
+        QueryShape(ModelDocument, (PROJECT, "a"), sort="_id"),
+        QueryShape(ModelDocument, (PROJECT, "b"), sort="_id"),
+    ]
+
+
+def test_pipeline_queries__lookup_sub_pipelines():
+    pipeline = [
+        {"$match": {"name": "p1"}},
+        {"$limit": 1},
+        {
+            "$lookup": {
+                "from": "projectruns",
+                "let": {"parent": "$_id"},
+                "pipeline": [
+                    {
+                        "$match": {
+                            "name": "pr1",
+                            "$expr": {"$eq": [f"${PROJECT}", "$$parent"]},
+                        },
+                    },
+                    {"$limit": 1},
+                ],
+                "as": "projectrun",
+            },
+        },
+    ]
+    p_query, pr_query = pipeline_queries(ProjectDocument, pipeline)
+    assert p_query == Query(ProjectDocument, {"name": "p1"})
+
+    # the parent variable is bound to an id, as sent by the lookup
+    assert pr_query.collection is ProjectRunDocument
+    assert isinstance(pr_query.filter["$expr"]["$eq"][1], ObjectId)
+    assert query_shapes(pr_query) == [
+        QueryShape(ProjectRunDocument, ("name", PROJECT)),
+    ]
+
+
+def test_covers__prefix_and_sort():
+    index = compound("context.project", "context.projectrun", "_id")
+
+    assert covers(index, QueryShape(ModelDocument, ("context.project",)))
+    assert covers(index, QueryShape(ModelDocument, ("context.project", "name")))
+    assert covers(
+        index,
+        QueryShape(
+            ModelDocument,
+            ("context.projectrun", "context.project"),
+            sort="_id",
+        ),
+    )
+    assert not covers(index, QueryShape(ModelDocument, ("name",)))
+    assert not covers(
+        index,
+        QueryShape(ModelDocument, ("context.project", "name"), sort="_id"),
+    )
+
+
+def test_get_indexes__constraints_first():
+    indexes = get_indexes(ModelDocument)
+    assert indexes[0].document.get("unique") is True
+    assert indexes[1:] == QUERY_INDEXES[ModelDocument]
+
+
+def test_sync_indexes__create_and_report_stale():
+    database = FakeDatabase()
+    database["models"] = FakeCollection({"legacy_1": {"key": [("legacy", 1)]}})
+
+    report = asyncio.run(sync_indexes(database))
+    declared = {index.document["name"] for index in get_indexes(ModelDocument)}
+    assert set(report["models"]["created"]) == declared
+    assert report["models"]["stale"] == ["legacy_1"]
+    assert report["models"]["dropped"] == []
+    assert set(database["models"].indexes) == declared | {"_id_", "legacy_1"}
+
+    # second run has nothing to create
+    report = asyncio.run(sync_indexes(database, drop=True))
+    assert report["models"]["created"] == []
+    assert report["models"]["dropped"] == ["legacy_1"]
+    assert "legacy_1" not in database["models"].indexes
+
+
+def test_sync_indexes__dry_run():
+    database = FakeDatabase()
+    report = asyncio.run(sync_indexes(database, drop=True, dry_run=True))
+    assert report["users"]["created"] == ["email_1", "username_1"]
+    assert set(database["users"].indexes) == {"_id_"}
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from pipes.db.document import DocumentDB
+from pipes.db.loader import DocumentLoader, DocumentLoaderMiddleware, get_loader
+
+
+class FakeDoc:
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+class OtherFakeDoc(FakeDoc):
+    pass
+
+
+class FakeDocumentDB(DocumentDB):
+    """Serve $in queries from memory, record them"""
+
+    def __init__(self, docs):
+        super().__init__()
+        self.docs = docs
+        self.queries = []
+
+    async def find_all(self, collection, query=None, projection=None):
+        ids = query["_id"]["$in"]
+        self.queries.append((collection, list(ids)))
+        await asyncio.sleep(0)
+        return [doc for doc in self.docs if type(doc) is collection and doc.id in ids]
+
+
+def test_get__batched_per_collection():
+    ids = [ObjectId() for _ in range(3)]
+    other_id = ObjectId()
+    docs = [FakeDoc(id, f"d{i}") for i, id in enumerate(ids)]
+    docs.append(OtherFakeDoc(other_id, "o1"))
+    docdb = FakeDocumentDB(docs)
+    loader = DocumentLoader(docdb)
+
+    async def run():
+        return await asyncio.gather(
+            loader.get(FakeDoc, ids[0]),
+            loader.get(FakeDoc, str(ids[1])),
+            loader.get(OtherFakeDoc, other_id),
+            loader.get(FakeDoc, ids[2]),
+        )
+
+    results = asyncio.run(run())
+    assert [doc.name for doc in results] == ["d0", "d1", "o1", "d2"]
+    assert docdb.queries == [(FakeDoc, ids), (OtherFakeDoc, [other_id])]
+    assert loader.queries == 2
+
+
+def test_get__identity_map():
+    doc_id = ObjectId()
+    docdb = FakeDocumentDB([FakeDoc(doc_id, "d0")])
+    loader = DocumentLoader(docdb)
+
+    async def run():
+        first = await loader.get(FakeDoc, doc_id)
+        second, third = await asyncio.gather(
+            loader.get(FakeDoc, doc_id),
+            loader.get(FakeDoc, doc_id),
+        )
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first is second is third
+    assert docdb.queries == [(FakeDoc, [doc_id])]
+
+
+def test_get_many__order_and_missing():
+    ids = [ObjectId() for _ in range(3)]
+    docdb = FakeDocumentDB([FakeDoc(ids[2], "d2"), FakeDoc(ids[0], "d0")])
+    loader = DocumentLoader(docdb)
+
+    results = asyncio.run(loader.get_many(FakeDoc, ids + [ids[0]]))
+    assert [doc.name if doc else None for doc in results] == ["d0", None, "d2", "d0"]
+    assert len(docdb.queries) == 1
+
+
+def test_get__none_id():
+    loader = DocumentLoader(FakeDocumentDB([]))
+    assert asyncio.run(loader.get(FakeDoc, None)) is None
+    assert loader.queries == 0
+
+
+def test_prime_and_clear():
+    doc_id = ObjectId()
+    docdb = FakeDocumentDB([FakeDoc(doc_id, "stored")])
+    loader = DocumentLoader(docdb)
+
+    async def run():
+        loader.prime(FakeDoc(doc_id, "primed"))
+        primed = await loader.get(FakeDoc, doc_id)
+        loader.clear(FakeDoc, doc_id)
+        stored = await loader.get(FakeDoc, doc_id)
+        return primed, stored
+
+    primed, stored = asyncio.run(run())
+    assert primed.name == "primed"
+    assert stored.name == "stored"
+    assert len(docdb.queries) == 1
+
+
+def test_get__error_propagated_and_not_cached():
+    doc_id = ObjectId()
+
+    class FailingDocumentDB(FakeDocumentDB):
+        async def find_all(self, collection, query=None, projection=None):
+            self.queries.append((collection, query["_id"]["$in"]))
+            if len(self.queries) == 1:
+                raise ConnectionError("docdb unavailable")
+            return await super().find_all(collection, query, projection)
+
+    docdb = FailingDocumentDB([FakeDoc(doc_id, "d0")])
+    loader = DocumentLoader(docdb)
+
+    async def run():
+        with pytest.raises(ConnectionError):
+            await loader.get(FakeDoc, doc_id)
+        return await loader.get(FakeDoc, doc_id)
+
+    assert asyncio.run(run()).name == "d0"
+
+
+def test_middleware__loader_per_request():
+    loaders = []
+
+    async def app(scope, receive, send):
+        loaders.append(get_loader())
+
+    middleware = DocumentLoaderMiddleware(app)
+
+    async def run():
+        await middleware({"type": "http"}, None, None)
+        await middleware({"type": "http"}, None, None)
+        await middleware({"type": "lifespan"}, None, None)
+
+    asyncio.run(run())
+    assert isinstance(loaders[0], DocumentLoader)
+    assert isinstance(loaders[1], DocumentLoader)
+    assert loaders[0] is not loaders[1]
+    assert loaders[2] is None
+    assert get_loader() is None
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+
+from bson import ObjectId
+from pydantic import BaseModel, field_validator
+
+from pipes.db.loader import DocumentLoader
+from pipes.db.manager import AbstractObjectManager
+from tests.unit.db.test_loader import FakeDoc, FakeDocumentDB, OtherFakeDoc
+
+
+class FakeManager(AbstractObjectManager):
+    pass
+
+
+class FakeRead(BaseModel):
+    name: str
+    tags: list[str] = []
+    owner: str | None = None
+    other: str | None = None
+
+    @field_validator("name")
+    @classmethod
+    def validate_name(cls, value):
+        raise AssertionError("read object revalidated")
+
+
+class FakeReadDocument(BaseModel):
+    name: str
+    tags: list[str] = []
+    owner: ObjectId
+    created_by: ObjectId
+
+    model_config = {"arbitrary_types_allowed": True}
+
+
+def test_assemble__fields_awaited_concurrently():
+    owner_id, other_id = ObjectId(), ObjectId()
+    docdb = FakeDocumentDB(
+        [FakeDoc(owner_id, "owner"), OtherFakeDoc(other_id, "other")]
+    )
+    manager = FakeManager()
+    manager._loader = DocumentLoader(docdb)
+    doc = FakeReadDocument.model_construct(
+        name="d0",
+        tags=["a"],
+        owner=owner_id,
+        created_by=owner_id,
+    )
+
+    read = asyncio.run(
+        manager.assemble(
+            FakeRead,
+            doc,
+            owner=manager.get_name(FakeDoc, owner_id),
+            other=manager.get_name(OtherFakeDoc, other_id),
+        ),
+    )
+    assert read == FakeRead.model_construct(
+        name="d0", tags=["a"], owner="owner", other="other"
+    )
+    assert not hasattr(read, "created_by")
+    # Both gets dispatched in the same tick
+    assert docdb.queries == [(FakeDoc, [owner_id]), (OtherFakeDoc, [other_id])]
+
+
+def test_assemble__nested_and_plain_values():
+    manager = FakeManager()
+    manager._loader = DocumentLoader(FakeDocumentDB([]))
+
+    async def run():
+        return await manager.assemble(
+            FakeRead,
+            name="d0",
+            owner=manager.get_name(FakeDoc, None),
+            other=manager.assemble(FakeRead, name="nested"),
+        )
+
+    read = asyncio.run(run())
+    assert read.name == "d0"
+    assert read.owner is None
+    assert read.other.name == "nested"
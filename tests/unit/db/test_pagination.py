@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from pipes.db.pagination import (
+    Page,
+    PageParams,
+    decode_cursor,
+    encode_cursor,
+    page_params,
+    page_response,
+)
+
+
+def test_cursor__roundtrip():
+    last_id = ObjectId()
+    cursor = encode_cursor(last_id)
+    assert str(last_id) not in cursor
+    assert decode_cursor(cursor) == last_id
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "YWJj", "!!"])
+def test_cursor__invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_page_params__invalid_cursor():
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(page_params(limit=10, cursor="YWJj", paginate=True))
+    assert e.value.status_code == 400
+
+
+def test_page_response__opt_out():
+    page = Page[int](data=[1, 2], next_cursor="abc")
+    assert (
+        page_response(page, PageParams()).body == b'{"data":[1,2],"next_cursor":"abc"}'
+    )
+    assert page_response(page, PageParams(paginate=False)).body == b"[1,2]"
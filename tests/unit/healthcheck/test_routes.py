@@ -1,7 +1,44 @@
 from __future__ import annotations
 
+import pytest
+from beanie import PydanticObjectId
+
+from pipes.app import app
+from pipes.users.auth import auth_required
+from pipes.users.schemas import UserDocument
+
+
+@pytest.fixture
+def as_user():
+    def login(is_superuser):
+        user = UserDocument.model_construct(
+            id=PydanticObjectId(),
+            is_superuser=is_superuser,
+        )
+        app.dependency_overrides[auth_required] = lambda: user
+
+    yield login
+    app.dependency_overrides.pop(auth_required, None)
+
 
 def test_ping(test_client):
     response = test_client.get("/api/ping")
     assert response.status_code == 200
     assert response.json() == {"message": "pong"}
+
+
+def test_docdb_pool_stats(test_client, as_user):
+    as_user(True)
+    response = test_client.get("/api/health/docdb")
+    assert response.status_code == 200
+    assert "maxPoolSize" in response.json()["options"]
+    assert response.json()["stats"]["checked_out"] == 0
+
+
+def test_docdb_pool_stats__admin_only(test_client, as_user):
+    response = test_client.get("/api/health/docdb")
+    assert response.status_code in (401, 403)
+
+    as_user(False)
+    response = test_client.get("/api/health/docdb")
+    assert response.status_code == 403
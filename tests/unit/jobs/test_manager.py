@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from beanie import Document, PydanticObjectId
+
+from pipes.db.document import DocumentDB
+from pipes.jobs import manager as jobs_manager
+from pipes.jobs.manager import JobManager, JobRunner
+from pipes.jobs.schemas import JobDocument, JobStatus, JobStep, JobType
+from pipes.projectruns.schemas import ProjectRunDocument
+from pipes.projects.schemas import ProjectDocument
+from pipes.users.schemas import UserDocument
+
+
+class FakeDocumentDB:
+    def __init__(self, job=None, raws=None):
+        self.job = job
+        self.raws = raws or {}
+        self.worker = None
+        self.inserted = []
+        self.deletes = []
+        self.updates = []
+        self.on_delete = None
+
+    async def insert(self, instance):
+        instance.id = PydanticObjectId()
+        self.inserted.append(instance)
+        return instance
+
+    async def find_one_and_update(self, collection, find, update):
+        if self.job is None or self.job.status == JobStatus.running:
+            return None
+        self.job.status = JobStatus.running
+        self.job.worker = self.worker = update["$set"]["worker"]
+        return self.job
+
+    async def delete_many(self, collection, query):
+        self.deletes.append((collection.Settings.name, query))
+        if self.on_delete:
+            self.on_delete()
+        return 2
+
+    async def update_one(self, collection, find, update):
+        if find["worker"] != self.worker:
+            return SimpleNamespace(matched_count=0)
+        self.updates.append(update["$set"])
+        return SimpleNamespace(matched_count=1)
+
+    async def distinct(self, collection, field, query=None):
+        level = field.split(".")[1]
+        raws = self.raws.get(collection.Settings.name, [])
+        return list(dict.fromkeys(raw["context"][level] for raw in raws))
+
+    async def exists_many(self, collection, field, values, query=None):
+        ids = {raw["_id"] for raw in self.raws.get(collection.Settings.name, [])}
+        return {value for value in values if value in ids}
+
+
+@pytest.fixture
+def docdb(monkeypatch):
+    # Construct documents without beanie initialization
+    monkeypatch.setattr(Document, "get_motor_collection", classmethod(lambda cls: None))
+
+    async def invalidate():
+        pass
+
+    monkeypatch.setattr(jobs_manager.context_cache, "invalidate", invalidate)
+
+    docdb = FakeDocumentDB()
+    for method in [
+        "insert",
+        "find_one_and_update",
+        "delete_many",
+        "update_one",
+        "distinct",
+        "exists_many",
+    ]:
+        monkeypatch.setattr(
+            DocumentDB,
+            method,
+            lambda self, *a, _method=method, **kw: getattr(docdb, _method)(*a, **kw),
+        )
+    return docdb
+
+
+def make_job(steps, status=JobStatus.pending):
+    return JobDocument(
+        id=PydanticObjectId(),
+        type=JobType.delete_projectrun,
+        status=status,
+        steps=steps,
+        created_at=datetime.now(),
+    )
+
+
+def test_create_delete_projectrun_job__level_document_first(docdb):
+    user = UserDocument.model_construct(id=PydanticObjectId())
+    p_doc = ProjectDocument.model_construct(id=PydanticObjectId(), name="p1")
+    pr_doc = ProjectRunDocument.model_construct(id=PydanticObjectId(), name="pr1")
+
+    job = asyncio.run(JobManager().create_delete_projectrun_job(p_doc, pr_doc, user))
+
+    assert job.status == JobStatus.pending
+    assert job.created_by == user.id
+    assert job.target == {"project": "p1", "projectrun": "pr1"}
+    assert [step.collection for step in job.steps] == [
+        "projectruns",
+        "models",
+        "modelruns",
+        "handoffs",
+        "datasets",
+        "tasks",
+    ]
+    assert job.steps[0].document == pr_doc.id
+    assert job.steps[1].context == {"project": p_doc.id, "projectrun": pr_doc.id}
+
+
+def test_run_job__resumed_from_first_unfinished_step(docdb):
+    p_id, pr_id = PydanticObjectId(), PydanticObjectId()
+    context = {"project": p_id, "projectrun": pr_id}
+    docdb.job = make_job(
+        [
+            JobStep(collection="projectruns", document=pr_id, deleted=1),
+            JobStep(collection="models", context=context, deleted=3),
+            JobStep(collection="modelruns", context=context),
+            JobStep(collection="datasets", context=context),
+        ],
+        status=JobStatus.running,
+    )
+    # Running job still within its lease, claimed by another worker
+    assert asyncio.run(JobManager().run_job(docdb.job.id)) is None
+    assert not docdb.deletes
+
+    docdb.job.status = JobStatus.pending
+    job = asyncio.run(JobManager().run_job(docdb.job.id))
+
+    assert job.status == JobStatus.completed
+    assert docdb.deletes == [
+        ("modelruns", {"context.project": p_id, "context.projectrun": pr_id}),
+        ("datasets", {"context.project": p_id, "context.projectrun": pr_id}),
+    ]
+    progress = [list(update)[0] for update in docdb.updates]
+    assert [field for field in progress if field.startswith("steps.")] == [
+        "steps.2.deleted",
+        "steps.3.deleted",
+    ]
+    assert docdb.updates[-1]["status"] == "completed"
+
+
+def test_run_job__orphans_of_context_created_meanwhile_kept(docdb):
+    p_id, p_gone, p_new = PydanticObjectId(), PydanticObjectId(), PydanticObjectId()
+    docdb.raws = {
+        "projects": [{"_id": p_id}],
+        "teams": [{"context": {"project": p_id}}, {"context": {"project": p_gone}}],
+        "models": [{"context": {"project": p_gone}}],
+    }
+    docdb.job = make_job(
+        [
+            JobStep(collection="teams", orphans_of="project"),
+            JobStep(collection="models", orphans_of="project"),
+        ],
+    )
+
+    # A project and its models created while the job runs
+    def create_project():
+        if docdb.raws["projects"][-1]["_id"] != p_new:
+            docdb.raws["projects"].append({"_id": p_new})
+            docdb.raws["models"].append({"context": {"project": p_new}})
+
+    docdb.on_delete = create_project
+    job = asyncio.run(JobManager().run_job(docdb.job.id))
+
+    assert job.status == JobStatus.completed
+    query = {"context.project": {"$in": [p_gone]}}
+    assert docdb.deletes == [("teams", query), ("models", query)]
+
+
+def test_run_job__stopped_when_claimed_by_another_worker(docdb):
+    docdb.job = make_job(
+        [
+            JobStep(collection="projects", document=PydanticObjectId()),
+            JobStep(collection="teams", context={"project": PydanticObjectId()}),
+        ],
+    )
+
+    # Lease expired during the first step, and the job claimed again
+    def reclaim():
+        docdb.worker = "other"
+
+    docdb.on_delete = reclaim
+    assert asyncio.run(JobManager().run_job(docdb.job.id)) is None
+
+    assert len(docdb.deletes) == 1
+    assert not docdb.updates
+
+
+def test_run_job__failed_step_marks_job_failed(docdb):
+    async def delete_many(collection, query):
+        raise RuntimeError("connection lost")
+
+    docdb.delete_many = delete_many
+    docdb.job = make_job(
+        [JobStep(collection="projects", document=PydanticObjectId())],
+    )
+
+    job = asyncio.run(JobManager().run_job(docdb.job.id))
+
+    assert job.status == JobStatus.failed
+    assert job.error == "connection lost"
+    assert job.steps[0].deleted is None
+
+
+def test_resume_periodically__until_cancelled(monkeypatch):
+    calls = []
+
+    async def resume_jobs(self):
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError("connection lost")
+        return 0
+
+    monkeypatch.setattr(JobManager, "resume_jobs", resume_jobs)
+
+    async def run():
+        task = asyncio.ensure_future(JobRunner().resume_periodically(interval=0.01))
+        while len(calls) < 3:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # Resumed again after a failure, stopped on shutdown
+    asyncio.run(run())
+    assert len(calls) >= 3
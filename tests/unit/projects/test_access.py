@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+
+from beanie import PydanticObjectId
+
+from pipes.db.document import DocumentDB
+from pipes.projects.access import ProjectAccessManager, get_project_access
+from pipes.projects.manager import ProjectManager
+from pipes.projects.schemas import ProjectAccessProjection, ProjectDocument
+from pipes.teams.schemas import TeamMembersProjection
+from pipes.users.schemas import UserDocument
+
+
+class FakeMotorCollection:
+    def __init__(self):
+        self.updates = []
+
+    async def update_one(self, find, update):
+        self.updates.append((find, update))
+
+    async def bulk_write(self, requests, ordered=True):
+        self.updates.extend((r._filter, r._doc) for r in requests)
+
+
+def make_project(**kwargs):
+    data = {
+        "_id": PydanticObjectId(),
+        "owner": PydanticObjectId(),
+        "created_by": PydanticObjectId(),
+        "leads": [],
+    }
+    data.update(kwargs)
+    return ProjectAccessProjection.model_validate(data)
+
+
+def make_team(p_id, members):
+    return TeamMembersProjection(context={"project": p_id}, members=members)
+
+
+def test_get_project_access__union_of_grants():
+    user_ids = [PydanticObjectId() for _ in range(4)]
+    p_doc = make_project(owner=user_ids[0], created_by=user_ids[0], leads=[user_ids[1]])
+    t_docs = [
+        make_team(p_doc.id, [user_ids[2], user_ids[1]]),
+        make_team(p_doc.id, [user_ids[3]]),
+    ]
+    assert get_project_access(p_doc, t_docs) == sorted(user_ids)
+
+
+def test_update_access__set_from_project_and_teams(monkeypatch):
+    member_id = PydanticObjectId()
+    p_doc = make_project()
+    motor_collection = FakeMotorCollection()
+
+    async def find_one(self, collection, query, projection=None):
+        assert projection is ProjectAccessProjection
+        return p_doc
+
+    async def find_all(self, collection, query=None, projection=None):
+        assert query == {"context.project": p_doc.id}
+        return [make_team(p_doc.id, [member_id])]
+
+    monkeypatch.setattr(DocumentDB, "find_one", find_one)
+    monkeypatch.setattr(DocumentDB, "find_all", find_all)
+    monkeypatch.setattr(
+        ProjectDocument,
+        "get_motor_collection",
+        classmethod(lambda cls: motor_collection),
+    )
+
+    access = asyncio.run(ProjectAccessManager().update_access(p_doc.id))
+    assert set(access) == {p_doc.owner, p_doc.created_by, member_id}
+    assert motor_collection.updates == [
+        ({"_id": p_doc.id}, {"$set": {"access": access}}),
+    ]
+
+
+def test_rebuild_access__teams_grouped_by_project(monkeypatch):
+    p_docs = [make_project(), make_project()]
+    member_id = PydanticObjectId()
+    motor_collection = FakeMotorCollection()
+    queries = []
+
+    async def iter_all(self, collection, query=None, projection=None):
+        queries.append(query)
+        if projection is TeamMembersProjection:
+            yield make_team(p_docs[1].id, [member_id])
+        else:
+            for p_doc in p_docs:
+                yield p_doc
+
+    monkeypatch.setattr(DocumentDB, "iter_all", iter_all)
+    monkeypatch.setattr(
+        ProjectDocument,
+        "get_motor_collection",
+        classmethod(lambda cls: motor_collection),
+    )
+
+    count = asyncio.run(ProjectAccessManager().rebuild_access(missing_only=True))
+    assert count == 2
+    assert queries[1] == {"access": {"$exists": False}}
+    accesses = {
+        find["_id"]: update["$set"]["access"]
+        for find, update in motor_collection.updates
+    }
+    assert member_id not in accesses[p_docs[0].id]
+    assert member_id in accesses[p_docs[1].id]
+
+
+def test_basic_projects_query__access_index():
+    user = UserDocument.model_construct(id=PydanticObjectId(), is_superuser=False)
+    query = ProjectManager()._get_basic_projects_query(user)
+    assert query["$or"][0] == {"access": user.id}
+
+    superuser = UserDocument.model_construct(id=PydanticObjectId(), is_superuser=True)
+    assert ProjectManager()._get_basic_projects_query(superuser) == {}
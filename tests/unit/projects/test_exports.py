@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+from bson import ObjectId
+
+from pipes.db.document import DocumentDB
+from pipes.projects.exports import ProjectExportManager
+from pipes.projects.schemas import ProjectDocument
+
+
+class FakeDocumentDB:
+    def __init__(self, raws):
+        self.raws = raws
+        self.queries = []
+
+    async def iter_raw(self, collection, query, projection=None, batch_size=None):
+        c_name = collection.Settings.name
+        self.queries.append((c_name, query))
+        for raw in self.raws.get(c_name, []):
+            if "_id" in query and raw["_id"] not in query["_id"]["$in"]:
+                continue
+            yield raw
+
+
+def make_raws(p_id, u_id, n_datasets):
+    t_id, pr_id, m_id, mr_id = ObjectId(), ObjectId(), ObjectId(), ObjectId()
+    d_ids = [ObjectId() for _ in range(n_datasets)]
+    audit = {"created_by": u_id, "modified_by": u_id}
+    mr_context = {
+        "project": p_id,
+        "projectrun": pr_id,
+        "model": m_id,
+        "modelrun": mr_id,
+    }
+    return {
+        "users": [{"_id": u_id, "email": "user@example.com"}],
+        "teams": [
+            {
+                "_id": t_id,
+                "name": "t1",
+                "context": {"project": p_id},
+                "members": [u_id],
+            },
+        ],
+        "projectruns": [
+            {"_id": pr_id, "name": "pr1", "context": {"project": p_id}, **audit},
+        ],
+        "models": [
+            {
+                "_id": m_id,
+                "name": "m1",
+                "context": {"project": p_id, "projectrun": pr_id},
+                "modeling_team": t_id,
+                **audit,
+            },
+        ],
+        "modelruns": [
+            {
+                "_id": mr_id,
+                "name": "mr1",
+                "context": {"project": p_id, "projectrun": pr_id, "model": m_id},
+                **audit,
+            },
+        ],
+        "handoffs": [
+            {
+                "_id": ObjectId(),
+                "name": "h1",
+                "context": {"project": p_id, "projectrun": pr_id},
+                "from_model": m_id,
+                "to_model": m_id,
+                "from_modelrun": mr_id,
+                **audit,
+            },
+        ],
+        "datasets": [
+            {
+                "_id": d_id,
+                "name": f"d{i}",
+                "context": mr_context,
+                "registration_author": u_id,
+            }
+            for i, d_id in enumerate(d_ids)
+        ],
+        "tasks": [
+            {
+                "_id": ObjectId(),
+                "name": "task1",
+                "context": mr_context,
+                "assignee": None,
+                "input_datasets": d_ids[:2],
+                "output_datasets": d_ids[-1:],
+                **audit,
+            },
+        ],
+    }
+
+
+def test_iter_records__ids_resolved_to_names(monkeypatch):
+    u_id = ObjectId()
+    p_doc = ProjectDocument.model_construct(
+        id=ObjectId(),
+        name="p1",
+        owner=u_id,
+        leads=[],
+        teams=[],
+        access=[u_id],
+        created_at=datetime(2024, 1, 1),
+        created_by=u_id,
+        modified_by=u_id,
+    )
+    docdb = FakeDocumentDB(make_raws(p_doc.id, u_id, n_datasets=5))
+    monkeypatch.setattr(
+        DocumentDB,
+        "iter_raw",
+        lambda self, *a, **kw: docdb.iter_raw(*a, **kw),
+    )
+
+    async def run():
+        manager = ProjectExportManager(p_doc, chunk_size=2)
+        return [record async for record in manager.iter_records()]
+
+    records = asyncio.run(run())
+    collections = [record["collection"] for record in records]
+    assert collections == [
+        "projects",
+        "teams",
+        "projectruns",
+        "models",
+        "modelruns",
+        "handoffs",
+        "datasets",
+        "datasets",
+        "datasets",
+        "datasets",
+        "datasets",
+        "tasks",
+    ]
+
+    project = records[0]["document"]
+    assert project["owner"] == "user@example.com"
+    assert "access" not in project and "_id" not in project
+
+    model = records[3]["document"]
+    assert model["context"] == {"project": "p1", "projectrun": "pr1"}
+    assert model["modeling_team"] == "t1"
+
+    handoff = records[5]["document"]
+    assert handoff["from_modelrun"] == "mr1"
+
+    task = records[-1]["document"]
+    assert task["context"]["modelrun"] == "mr1"
+    assert task["input_datasets"] == ["d0", "d1"]
+    assert task["output_datasets"] == ["d4"]
+    assert task["assignee"] is None
+
+    # One cursor per collection, the user is fetched once for the whole export
+    project_queries = [c_name for c_name, query in docdb.queries if "_id" not in query]
+    assert project_queries == [
+        "teams",
+        "projectruns",
+        "models",
+        "modelruns",
+        "handoffs",
+        "datasets",
+        "tasks",
+    ]
+    assert [c_name for c_name, _ in docdb.queries].count("users") == 1
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from beanie import Document, PydanticObjectId
+from pymongo.errors import BulkWriteError
+
+from pipes.common.exceptions import DocumentAlreadyExists, ImportValidationError
+from pipes.db.document import DocumentDB
+from pipes.models.schemas import ModelDocument
+from pipes.projects.imports import ProjectImportManager
+from pipes.projects.schemas import ProjectDocument, ProjectImport
+from pipes.users.schemas import UserDocument
+
+
+class FakeDocumentDB:
+    def __init__(self, users=(), fail_on=None):
+        self.users = list(users)
+        self.fail_on = fail_on
+        self.transactions = True
+        self.sessions = []
+        self.committed = {}
+        self.inserted = {}
+        self.deleted = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        if not self.transactions:
+            yield None
+            return
+
+        session = object()
+        self.sessions.append(session)
+        yield session
+        # Committed on exit only, nothing written if an insert failed
+        self.committed = dict(self.inserted)
+
+    async def exists(self, collection, query):
+        return False
+
+    async def find_all(self, collection, query=None, projection=None):
+        emails = query["email"]["$in"]
+        return [u_doc for u_doc in self.users if u_doc.email in emails]
+
+    async def insert_many(self, collection, instances, session=None):
+        if self.transactions:
+            assert session is self.sessions[-1]
+        if collection is self.fail_on:
+            raise BulkWriteError({"writeErrors": [{"code": 11000}]})
+        self.inserted[collection] = instances
+        return [doc.id for doc in instances]
+
+    async def delete_many(self, collection, query):
+        self.deleted.append((collection, query["_id"]["$in"]))
+        return len(query["_id"]["$in"])
+
+
+@pytest.fixture
+def docdb(monkeypatch):
+    # Construct documents without beanie initialization
+    monkeypatch.setattr(Document, "get_motor_collection", classmethod(lambda cls: None))
+
+    owner = UserDocument.model_construct(
+        id=PydanticObjectId(), email="owner@example.com"
+    )
+    docdb = FakeDocumentDB(users=[owner])
+    monkeypatch.setattr(
+        DocumentDB, "exists", lambda self, *a, **kw: docdb.exists(*a, **kw)
+    )
+    monkeypatch.setattr(
+        DocumentDB, "find_all", lambda self, *a, **kw: docdb.find_all(*a, **kw)
+    )
+    monkeypatch.setattr(
+        DocumentDB, "insert_many", lambda self, *a, **kw: docdb.insert_many(*a, **kw)
+    )
+    monkeypatch.setattr(
+        DocumentDB, "transaction", lambda self, *a, **kw: docdb.transaction(*a, **kw)
+    )
+    monkeypatch.setattr(
+        DocumentDB, "delete_many", lambda self, *a, **kw: docdb.delete_many(*a, **kw)
+    )
+    return docdb
+
+
+def make_model(name, team="team1", **kwargs):
+    data = {
+        "name": name,
+        "type": "Capacity Expansion",
+        "description": "",
+        "modeling_team": team,
+        "scheduled_start": "2024-02-01",
+        "scheduled_end": "2024-03-01",
+    }
+    data.update(kwargs)
+    return data
+
+
+def make_project_import(**kwargs):
+    data = {
+        "name": "p1",
+        "scenarios": [{"name": "s1"}],
+        "scheduled_start": "2024-01-01",
+        "scheduled_end": "2024-12-31",
+        "owner": {"email": "owner@example.com"},
+        "teams": [
+            {"name": "team1", "members": [{"email": "member@example.com"}]},
+        ],
+        "projectruns": [
+            {
+                "name": "pr1",
+                "scenarios": ["s1"],
+                "scheduled_start": "2024-01-01",
+                "scheduled_end": "2024-06-30",
+                "models": [make_model("m1"), make_model("m2")],
+                "handoffs": [
+                    {
+                        "name": "h1",
+                        "from_model": "m1",
+                        "to_model": "m2",
+                        "description": "",
+                    },
+                ],
+            },
+        ],
+    }
+    data.update(kwargs)
+    return ProjectImport.model_validate(data)
+
+
+def run_import(p_import):
+    user = UserDocument.model_construct(id=PydanticObjectId())
+    return asyncio.run(ProjectImportManager().import_project(p_import, user))
+
+
+def test_import_project__one_insert_per_collection(docdb):
+    p_import_read = run_import(make_project_import())
+
+    assert p_import_read.created == {
+        "users": 1,
+        "projects": 1,
+        "teams": 1,
+        "projectruns": 1,
+        "models": 2,
+        "handoffs": 1,
+    }
+
+    # Existing owner is reused, missing team member created
+    [member] = docdb.inserted[UserDocument]
+    assert member.email == "member@example.com"
+
+    [p_doc] = docdb.inserted[ProjectDocument]
+    [owner] = docdb.users
+    assert p_doc.owner == owner.id
+    assert member.id in p_doc.access
+
+    m_docs = docdb.inserted[ModelDocument]
+    assert {m_doc.modeling_team for m_doc in m_docs} == set(p_doc.teams)
+    assert len(docdb.sessions) == 1
+    assert docdb.committed == docdb.inserted
+    assert not docdb.deleted
+
+
+def test_import_project__errors_of_all_items(docdb):
+    pr_import = make_project_import().projectruns[0].model_dump()
+    pr_import["models"] = [
+        make_model("m1"),
+        make_model("m2", team="missing"),
+        make_model("m3", scheduled_end="2025-01-01"),
+    ]
+    pr_import["handoffs"][0]["to_model"] = "m9"
+
+    with pytest.raises(ImportValidationError) as e:
+        run_import(make_project_import(projectruns=[pr_import, pr_import]))
+
+    paths = [error.path for error in e.value.errors]
+    assert paths == [
+        "projectruns[0].models[1]",
+        "projectruns[0].models[2]",
+        "projectruns[0].handoffs[0]",
+        "projectruns[1]",
+        "projectruns[1].models[1]",
+        "projectruns[1].models[2]",
+        "projectruns[1].handoffs[0]",
+    ]
+    assert "Duplicate project run 'pr1'" in e.value.errors[3].message
+    assert not docdb.inserted
+
+
+def test_import_project__duplicate_scenario_of_new_model_only(docdb):
+    def mapping(m_scenario):
+        return {"model_scenario": m_scenario, "project_scenarios": ["s1"]}
+
+    pr_import = make_project_import().projectruns[0].model_dump()
+    pr_import["models"] = [
+        make_model("m1", scenario_mappings=[mapping("a")]),
+        make_model("m2", scenario_mappings=[mapping("a")]),
+        make_model("m3", scenario_mappings=[mapping("b")]),
+        make_model("m4", scenario_mappings=[mapping("c"), mapping("b")]),
+    ]
+    pr_import["handoffs"] = []
+
+    with pytest.raises(ImportValidationError) as e:
+        run_import(make_project_import(projectruns=[pr_import]))
+
+    errors = {error.path: error.message for error in e.value.errors}
+    assert list(errors) == ["projectruns[0].models[1]", "projectruns[0].models[3]"]
+    assert "'a' already defined in model 'm1'" in errors["projectruns[0].models[1]"]
+    assert "'b' already defined in model 'm3'" in errors["projectruns[0].models[3]"]
+
+
+def test_import_project__transaction_aborted_on_failure(docdb):
+    docdb.fail_on = ModelDocument
+
+    with pytest.raises(DocumentAlreadyExists):
+        run_import(make_project_import())
+
+    assert ProjectDocument in docdb.inserted
+    assert not docdb.committed
+    assert not docdb.deleted
+
+
+def test_import_project__inserted_documents_deleted_without_transactions(docdb):
+    docdb.fail_on = ModelDocument
+    docdb.transactions = False
+
+    with pytest.raises(DocumentAlreadyExists):
+        run_import(make_project_import())
+
+    deleted = [collection for collection, _ in docdb.deleted]
+    assert deleted[0] is ModelDocument
+    assert deleted[-1] is UserDocument
+    assert len(deleted) == 5
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from beanie import PydanticObjectId
+
+from pipes.common.exceptions import DomainValidationError
+from pipes.db.document import DocumentDB
+from pipes.projects.schemas import ProjectDocument, ProjectUpdate
+from pipes.projects.validators import ProjectUpdateDomainValidator
+
+
+def make_project_update(**kwargs):
+    data = {
+        "name": "p1",
+        "scenarios": [{"name": "s1"}, {"name": "s2"}],
+        "scheduled_start": "2024-01-01",
+        "scheduled_end": "2024-12-31",
+        "owner": {"email": "owner@example.com"},
+    }
+    data.update(kwargs)
+    return ProjectUpdate.model_validate(data)
+
+
+def get_dependency_data(monkeypatch, raws):
+    pipelines = []
+
+    async def aggregate(self, collection, pipeline):
+        pipelines.append(pipeline)
+        return raws
+
+    monkeypatch.setattr(DocumentDB, "aggregate", aggregate)
+    p_doc = ProjectDocument.model_construct(id=PydanticObjectId())
+    validator = ProjectUpdateDomainValidator()
+    dependency_data = asyncio.run(validator.get_dependency_data(p_doc))
+
+    [pipeline] = pipelines
+    assert pipeline[0] == {"$match": {"context.project": p_doc.id}}
+    return dependency_data
+
+
+def test_get_dependency_data__grouped_values(monkeypatch):
+    raws = [
+        {
+            "_id": None,
+            "scheduled_start": datetime(2024, 2, 1),
+            "scheduled_end": datetime(2024, 11, 30),
+            "scenarios": ["s1", None],
+        },
+    ]
+    dependency_data = get_dependency_data(monkeypatch, raws)
+
+    assert dependency_data == {
+        "scenarios": ["s1"],
+        "scheduled_start": datetime(2024, 2, 1),
+        "scheduled_end": datetime(2024, 11, 30),
+    }
+
+    p_update = make_project_update(scheduled_start="2024-03-01")
+    with pytest.raises(DomainValidationError):
+        asyncio.run(
+            ProjectUpdateDomainValidator().project_validate(p_update, dependency_data),
+        )
+
+
+def test_get_dependency_data__without_projectruns(monkeypatch):
+    dependency_data = get_dependency_data(monkeypatch, [])
+
+    assert dependency_data == {
+        "scenarios": [],
+        "scheduled_start": datetime.max,
+        "scheduled_end": datetime.min,
+    }
+
+    p_update = make_project_update(scenarios=[])
+    validator = ProjectUpdateDomainValidator()
+    assert (
+        asyncio.run(validator.project_validate(p_update, dependency_data)) is p_update
+    )
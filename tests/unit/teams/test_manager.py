@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+
+from beanie import Document, PydanticObjectId
+
+from pipes.db.document import DocumentDB
+from pipes.projects.access import ProjectAccessManager
+from pipes.projects.contexts import ProjectDocumentContext
+from pipes.projects.schemas import ProjectDocument
+from pipes.teams import manager as teams_manager
+from pipes.teams.manager import TeamManager
+from pipes.teams.schemas import TeamCreate
+
+
+def test_create_team__project_teams_updated_in_place(monkeypatch):
+    # Construct documents without beanie initialization
+    monkeypatch.setattr(Document, "get_motor_collection", classmethod(lambda cls: None))
+
+    updates = []
+
+    async def exists(self, collection, query):
+        return False
+
+    async def insert(self, instance):
+        instance.id = PydanticObjectId()
+        return instance
+
+    async def update_one(self, collection, find, update):
+        updates.append((collection, find, update))
+
+    async def noop(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(DocumentDB, "exists", exists)
+    monkeypatch.setattr(DocumentDB, "insert", insert)
+    monkeypatch.setattr(DocumentDB, "update_one", update_one)
+    monkeypatch.setattr(teams_manager.context_cache, "invalidate", noop)
+    monkeypatch.setattr(ProjectAccessManager, "update_access", noop)
+
+    # Cached project copy, saving it would overwrite newer project updates
+    p_doc = ProjectDocument.model_construct(id=PydanticObjectId(), name="p1", teams=[])
+    manager = TeamManager(context=ProjectDocumentContext(project=p_doc))
+    t_doc = asyncio.run(manager.create_team(TeamCreate(name="t1", members=[])))
+
+    assert updates == [
+        (ProjectDocument, {"_id": p_doc.id}, {"$addToSet": {"teams": t_doc.id}}),
+    ]
+    assert p_doc.teams == []
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from pipes.common.exceptions import CognitoAuthError
+from pipes.config.settings import settings
+from pipes.users.auth import CognitoJWKsVerifier
+from pipes.users.backends import get_verification_backend
+from pipes.users.cache import PrincipalCache, VerifiedTokenCache
+from pipes.users.jwks import CognitoJWKsProvider
+from pipes.users.schemas import UserDocument
+
+KID = "test-kid"
+
+
+class StaticJWKsProvider(CognitoJWKsProvider):
+    """JWKs provider serving a fixed key set"""
+
+    def __init__(self, keys: list[dict], backend: str) -> None:
+        super().__init__(
+            url="http://127.0.0.1/.well-known/jwks.json",
+            backend=get_verification_backend(backend),
+        )
+        self.key_set = {"keys": keys}
+        self.requests = 0
+
+    def _request(self):
+        self.requests += 1
+        return self.key_set
+
+
+@pytest.fixture(scope="module")
+def rsa_private_pem():
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode("utf-8")
+
+
+@pytest.fixture(params=["cryptography", "jose"])
+def jwks_provider(request, rsa_private_pem):
+    public_jwk = jwk.construct(rsa_private_pem, "RS256").public_key().to_dict()
+    public_jwk["kid"] = KID
+    return StaticJWKsProvider([public_jwk], backend=request.param)
+
+
+def make_access_token(private_pem: str, **claims) -> str:
+    now = int(time.time())
+    payload = {
+        "sub": "00000000-0000-0000-0000-000000000000",
+        "username": "00000000-0000-0000-0000-000000000000",
+        "client_id": settings.PIPES_COGNITO_CLIENT_ID,
+        "token_use": "access",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    payload.update(claims)
+    return jwt.encode(payload, private_pem, algorithm="RS256", headers={"kid": KID})
+
+
+def test_verify_token__cached(rsa_private_pem, jwks_provider):
+    cache = VerifiedTokenCache(maxsize=10)
+    access_token = make_access_token(rsa_private_pem)
+
+    async def run():
+        for _ in range(5):
+            verifier = CognitoJWKsVerifier(provider=jwks_provider, cache=cache)
+            assert await verifier.verify_token(access_token)
+            assert verifier._claims["token_use"] == "access"
+
+    asyncio.run(run())
+    assert jwks_provider.requests == 1
+    assert cache.stats()["hits"] == 4
+    assert cache.stats()["misses"] == 1
+
+
+def test_verify_token__invalid_signature_not_cached(rsa_private_pem, jwks_provider):
+    cache = VerifiedTokenCache(maxsize=10)
+    access_token = make_access_token(rsa_private_pem)
+    message, _ = access_token.rsplit(".", 1)
+    forged_token = f"{message}.{'A' * 342}"
+
+    verifier = CognitoJWKsVerifier(provider=jwks_provider, cache=cache)
+    with pytest.raises(CognitoAuthError):
+        asyncio.run(verifier.verify_token(forged_token))
+    assert len(cache) == 0
+
+
+def test_verify_token__unknown_kid(rsa_private_pem, jwks_provider):
+    access_token = make_access_token(rsa_private_pem)
+    jwks_provider.key_set["keys"][0]["kid"] = "rotated-kid"
+
+    verifier = CognitoJWKsVerifier(
+        provider=jwks_provider,
+        cache=VerifiedTokenCache(maxsize=10),
+    )
+    with pytest.raises(CognitoAuthError):
+        asyncio.run(verifier.verify_token(access_token))
+
+
+def test_token_cache__expiry_and_lru():
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.put("expired", {"exp": time.time() - 1})
+    assert cache.get("expired") is None
+
+    exp = time.time() + 3600
+    cache.put("a", {"exp": exp})
+    cache.put("b", {"exp": exp})
+    cache.get("a")
+    cache.put("c", {"exp": exp})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"exp": exp}
+    assert cache.get("c") == {"exp": exp}
+
+
+def test_principal_cache__ttl_and_invalidate():
+    username = "00000000-0000-0000-0000-000000000000"
+    u_doc = UserDocument.model_construct(
+        email="user1@example.com",
+        username=username,
+        is_active=True,
+        is_superuser=False,
+    )
+
+    cache = PrincipalCache(maxsize=10, ttl=3600)
+    cache.put(u_doc)
+    principal = cache.get(username)
+    assert principal.user is u_doc
+    assert principal.is_active and not principal.is_superuser
+
+    cache.invalidate(username)
+    assert cache.get(username) is None
+
+    expired_cache = PrincipalCache(maxsize=10, ttl=0)
+    expired_cache.put(u_doc)
+    assert expired_cache.get(username) is None
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from pipes.common.exceptions import CognitoAuthError
+from pipes.users.cognito import CognitoUserProvisioner
+from pipes.users.manager import UserManager
+from pipes.users.schemas import UserDocument
+
+USERNAME = "00000000-0000-0000-0000-000000000000"
+
+
+class CognitoStandIn:
+    """Local stand-in of the cognito-idp client"""
+
+    def __init__(self, valid_tokens: set[str]) -> None:
+        self.valid_tokens = valid_tokens
+        self.calls = 0
+        self.threads = set()
+
+    def get_user(self, AccessToken: str) -> dict:
+        self.calls += 1
+        self.threads.add(threading.get_ident())
+        time.sleep(0.05)
+        if AccessToken not in self.valid_tokens:
+            raise ClientError({"Error": {"Code": "NotAuthorizedException"}}, "GetUser")
+        return {
+            "Username": USERNAME,
+            "UserAttributes": [
+                {"Name": "email", "Value": "User1@NREL.gov"},
+                {"Name": "first_name", "Value": "User"},
+            ],
+        }
+
+
+@pytest.fixture
+def upserts(monkeypatch):
+    calls = []
+
+    async def upsert_cognito_user(self, u_create):
+        calls.append(u_create)
+        return UserDocument.model_construct(
+            username=u_create.username,
+            email=u_create.email,
+            organization=u_create.organization,
+            is_active=True,
+            is_superuser=False,
+        )
+
+    monkeypatch.setattr(UserManager, "upsert_cognito_user", upsert_cognito_user)
+    return calls
+
+
+def test_provision__coalesced(upserts):
+    client = CognitoStandIn(valid_tokens={"token"})
+    provisioner = CognitoUserProvisioner(client=client)
+
+    async def run():
+        return await asyncio.gather(
+            *[provisioner.provision("token", USERNAME) for _ in range(10)],
+        )
+
+    u_docs = asyncio.run(run())
+    assert client.calls == 1
+    assert threading.get_ident() not in client.threads
+    assert len(upserts) == 1
+    assert upserts[0].email == "user1@nrel.gov"
+    assert all(u_doc is u_docs[0] for u_doc in u_docs)
+
+
+def test_provision__invalid_token(upserts):
+    provisioner = CognitoUserProvisioner(client=CognitoStandIn(valid_tokens=set()))
+
+    with pytest.raises(CognitoAuthError):
+        asyncio.run(provisioner.provision("token", USERNAME))
+    assert not upserts
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pipes.common.exceptions import CognitoAuthError
+from pipes.users.jwks import CognitoJWKsProvider
+
+
+class JWKsStub:
+    """Local JWKs HTTP endpoint standing in for Cognito"""
+
+    def __init__(self):
+        self.kids = ["kid1"]
+        self.requests = 0
+        self.available = True
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                if not stub.available:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = json.dumps({"keys": [{"kid": kid} for kid in stub.kids]})
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body.encode("utf-8"))
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/.well-known/jwks.json"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def jwks_stub():
+    stub = JWKsStub()
+    yield stub
+    stub.close()
+
+
+def test_get_keys__single_flight(jwks_stub):
+    provider = CognitoJWKsProvider(url=jwks_stub.url)
+
+    async def run():
+        return await asyncio.gather(*[provider.get_keys() for _ in range(20)])
+
+    results = asyncio.run(run())
+    assert all(keys == {"kid1": {"kid": "kid1"}} for keys in results)
+    assert jwks_stub.requests == 1
+
+
+def test_get_keys__stale_while_unreachable(jwks_stub):
+    provider = CognitoJWKsProvider(url=jwks_stub.url, ttl=0, max_stale=3600)
+
+    async def run():
+        await provider.get_keys()
+        jwks_stub.available = False
+        return await provider.get_keys()
+
+    keys = asyncio.run(run())
+    assert "kid1" in keys
+    assert jwks_stub.requests == 2
+
+
+def test_get_keys__refresh_ahead(jwks_stub):
+    provider = CognitoJWKsProvider(url=jwks_stub.url, ttl=60, refresh_ahead=60)
+
+    async def run():
+        await provider.get_keys()
+        jwks_stub.kids = ["kid2"]
+        stale_keys = await provider.get_keys()
+        await provider._refresh_task
+        return stale_keys, provider.keys
+
+    stale_keys, keys = asyncio.run(run())
+    assert "kid1" in stale_keys
+    assert "kid2" in keys
+
+
+def test_get_key__unknown_kid_refetch(jwks_stub):
+    provider = CognitoJWKsProvider(url=jwks_stub.url, refetch_interval=0)
+
+    async def run():
+        await provider.get_keys()
+        jwks_stub.kids = ["kid1", "kid2"]
+        return await provider.get_key("kid2")
+
+    assert asyncio.run(run()) == {"kid": "kid2"}
+    assert jwks_stub.requests == 2
+
+
+def test_get_key__unknown_kid_rate_limited(jwks_stub):
+    provider = CognitoJWKsProvider(url=jwks_stub.url, refetch_interval=3600)
+
+    async def run():
+        await provider.get_keys()
+        await provider.get_key("kid2")
+
+    with pytest.raises(CognitoAuthError):
+        asyncio.run(run())
+    assert jwks_stub.requests == 1